@@ -11,17 +11,27 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 import traceback
+import json
+import time
+
+# Load environment variables - before the services below build their
+# singletons from them at import
+load_dotenv()
 
 from services.url_extractor import URLExtractorService
 from services.model_service import model_service
 from services.ai_service import ai_service
-
-# Load environment variables
-load_dotenv()
+from services.recommendation_jobs import recommendation_jobs
+from services.fallback_recommendations import fallback_recommendations
+from services.http_client import http_client, async_http_client
+from services.async_engine import async_engine
+from services.extraction_race import method_racer
+from services.rate_limits import rate_limits
+from utils.validators import URLValidator
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -38,46 +48,142 @@ CORS(app, resources={
 # Initialize services
 url_extractor = URLExtractorService()
 
-# Load AI model on startup
-print("\n" + "="*70)
-print("INITIALIZING MINDTRACK AI BACKEND")
-print("="*70)
-model_service.load_model()
+
+def startup():
+    """
+    Load the DistilBERT model, retrieval index and Gemini client up front
+    
+    Importing this module stays cheap: each is otherwise created on the first
+    request that needs them. Runs when the server is started directly, or at
+    import time under a WSGI server when PRELOAD_MODELS=true.
+    """
+    print("\n" + "="*70)
+    print("INITIALIZING MINDTRACK AI BACKEND")
+    print("="*70)
+    model_service.ensure_loaded()
+    ai_service.index.build()
+    if ai_service.configured:
+        ai_service.model  # creates the Gemini client
+
+
+if __name__ == '__main__' or os.getenv('PRELOAD_MODELS', 'false').lower() == 'true':
+    startup()
+
+
+# Mental health keyword validation (to reduce false positives)
+MENTAL_HEALTH_KEYWORDS = [
+    # Depression
+    'depressed', 'hopeless', 'worthless', 'empty', 'numb', 'lonely', 'isolated', 
+    'giving up', 'no point', 'meaningless', 'sad', 'unhappy', 'miserable',
+    # Anxiety
+    'anxious', 'worried', 'panic', 'nervous', 'scared', 'terrified', 'fear', 
+    'cant breathe', 'overwhelming', 'anxiety', 'nervous breakdown',
+    # Stress
+    'stressed', 'overwhelmed', 'pressure', 'burden', 'exhausted', 'tired', 
+    'cant cope', 'too much', 'breaking down', 'burnout',
+    # Crisis
+    'suicide', 'suicidal', 'kill myself', 'end it', 'dont want to live', 
+    'better off dead', 'cant do this anymore', 'want to die',
+    # Emotions
+    'crying', 'tears', 'sobbing', 'hurt', 'pain', 'suffering', 'anguish',
+    'despair', 'desperate', 'helpless', 'broken'
+]
+
+# Emotion detection patterns (enhanced context analysis)
+EMOTION_PATTERNS = {
+    'depression': ['depressed', 'hopeless', 'worthless', 'empty', 'numb', 'lonely', 'isolated', 'giving up', 'no point', 'meaningless'],
+    'anxiety': ['anxious', 'worried', 'panic', 'nervous', 'scared', 'terrified', 'fear', 'cant breathe', 'overwhelming'],
+    'stress': ['stressed', 'overwhelmed', 'pressure', 'burden', 'exhausted', 'tired', 'cant cope', 'too much'],
+    'suicidal': ['suicide', 'suicidal', 'kill myself', 'end it', 'dont want to live', 'better off dead', 'cant do this anymore'],
+    'anger': ['angry', 'furious', 'hate', 'rage', 'frustrated', 'pissed'],
+    'grief': ['loss', 'died', 'death', 'grief', 'mourning', 'miss them', 'gone'],
+    'trauma': ['traumatic', 'ptsd', 'flashback', 'nightmare', 'haunted', 'triggered']
+}
+
+# Tone analysis
+TONE_INDICATORS = {
+    'urgent': ['help', 'please', 'now', 'cant', 'urgent', 'emergency'],
+    'desperate': ['desperate', 'hopeless', 'helpless', 'lost', 'broken'],
+    'seeking_help': ['need help', 'what should i do', 'how do i', 'advice', 'suggestions'],
+    'isolated': ['alone', 'nobody', 'no one', 'isolated', 'lonely'],
+    'overwhelmed': ['too much', 'cant handle', 'overwhelming', 'drowning']
+}
+
+# Key concern patterns - only checked when there are stress/mental health indicators
+CONCERN_PATTERNS = {
+    'work_stress': ['work stress', 'job stress', 'boss', 'workload', 'deadline pressure', 'workplace', 'burnout', 'overworked'],
+    'relationships': ['relationship', 'partner', 'spouse', 'breakup', 'divorce', 'lonely', 'alone'],
+    'health': ['sick', 'ill', 'pain', 'disease', 'medical'],
+    'financial': ['money stress', 'debt', 'bills', 'financial stress', 'broke', 'cant afford'],
+    'academic': ['exam stress', 'grades stress', 'study pressure', 'assignment stress', 'academic pressure'],
+    'sleep': ['sleep', 'insomnia', 'cant sleep', 'nightmares'],
+    'eating': ['eating disorder', 'appetite', 'weight', 'not eating']
+}
+
+# Every keyword above, deduplicated, so each text is scanned once per keyword
+ALL_KEYWORDS = tuple(dict.fromkeys(
+    MENTAL_HEALTH_KEYWORDS
+    + [keyword for keywords in EMOTION_PATTERNS.values() for keyword in keywords]
+    + [keyword for keywords in TONE_INDICATORS.values() for keyword in keywords]
+    + [keyword for keywords in CONCERN_PATTERNS.values() for keyword in keywords]
+))
+
+# Total time a synchronous /api/analyze/text request may spend waiting on Gemini
+REQUEST_BUDGET_SECONDS = float(os.getenv('REQUEST_BUDGET_SECONDS', '20'))
+
+# Maximum number of texts accepted by /api/analyze/batch
+BATCH_MAX_TEXTS = int(os.getenv('BATCH_MAX_TEXTS', '500'))
+BATCH_BUDGET_SECONDS = float(os.getenv('BATCH_BUDGET_SECONDS', '60'))
+
+# /api/analyze/stream processes this many records per model forward pass
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '32'))
+STREAM_MAX_LINE_BYTES = int(os.getenv('STREAM_MAX_LINE_BYTES', '65536'))
+
+# Maximum number of URLs accepted by /api/analyze/urls
+URLS_MAX_PER_REQUEST = int(os.getenv('URLS_MAX_PER_REQUEST', '100'))
 
 
-def analyze_text_context(text):
+def find_keyword_hits(text_lower):
+    """Return the set of known keywords that appear in already-lowercased text"""
+    return frozenset(keyword for keyword in ALL_KEYWORDS if keyword in text_lower)
+
+
+def analyze_text_context(text, defer_recommendations=False, deadline=None):
     """
     Analyze text for emotional context, tone, and provide AI-generated suggestions
     Uses trained DistilBERT model for accurate sentiment classification
-    """
-    import re
-    
-    text_lower = text.lower()
     
+    When defer_recommendations is True, the Gemini call runs as a background job and
+    the result carries a 'recommendation_job' ID instead of suggestions
+    """
     # Get AI prediction from DistilBERT model
     bert_prediction = model_service.predict(text)
     
-    # Mental health keyword validation (to reduce false positives)
-    mental_health_keywords = [
-        # Depression
-        'depressed', 'hopeless', 'worthless', 'empty', 'numb', 'lonely', 'isolated', 
-        'giving up', 'no point', 'meaningless', 'sad', 'unhappy', 'miserable',
-        # Anxiety
-        'anxious', 'worried', 'panic', 'nervous', 'scared', 'terrified', 'fear', 
-        'cant breathe', 'overwhelming', 'anxiety', 'nervous breakdown',
-        # Stress
-        'stressed', 'overwhelmed', 'pressure', 'burden', 'exhausted', 'tired', 
-        'cant cope', 'too much', 'breaking down', 'burnout',
-        # Crisis
-        'suicide', 'suicidal', 'kill myself', 'end it', 'dont want to live', 
-        'better off dead', 'cant do this anymore', 'want to die',
-        # Emotions
-        'crying', 'tears', 'sobbing', 'hurt', 'pain', 'suffering', 'anguish',
-        'despair', 'desperate', 'helpless', 'broken'
-    ]
+    return analyze_prediction_context(
+        text,
+        bert_prediction,
+        defer_recommendations=defer_recommendations,
+        deadline=deadline
+    )
+
+
+def analyze_prediction_context(text, bert_prediction, defer_recommendations=False,
+                               use_ai_recommendations=True, deadline=None):
+    """
+    Build the contextual analysis for text whose DistilBERT prediction is already known
+    
+    Args:
+        text: Text to analyze
+        bert_prediction: Result of model_service.predict / predict_batch, or None
+        defer_recommendations: Run the Gemini call as a background job
+        use_ai_recommendations: When False, skip Gemini and use fallback recommendations
+        deadline: Absolute time.monotonic() by which Gemini must answer
+    """
+    text_lower = text.lower()
+    keyword_hits = find_keyword_hits(text_lower)
     
     # Check if text contains mental health indicators
-    has_mental_health_keywords = any(keyword in text_lower for keyword in mental_health_keywords)
+    has_mental_health_keywords = any(keyword in keyword_hits for keyword in MENTAL_HEALTH_KEYWORDS)
     
     if bert_prediction:
         # Use BERT model prediction
@@ -109,23 +215,12 @@ def analyze_text_context(text):
             confidence = 0.80
         prediction_source = 'Keyword Analysis'
     
-    # Emotion detection patterns (enhanced context analysis)
-    emotion_patterns = {
-        'depression': ['depressed', 'hopeless', 'worthless', 'empty', 'numb', 'lonely', 'isolated', 'giving up', 'no point', 'meaningless'],
-        'anxiety': ['anxious', 'worried', 'panic', 'nervous', 'scared', 'terrified', 'fear', 'cant breathe', 'overwhelming'],
-        'stress': ['stressed', 'overwhelmed', 'pressure', 'burden', 'exhausted', 'tired', 'cant cope', 'too much'],
-        'suicidal': ['suicide', 'suicidal', 'kill myself', 'end it', 'dont want to live', 'better off dead', 'cant do this anymore'],
-        'anger': ['angry', 'furious', 'hate', 'rage', 'frustrated', 'pissed'],
-        'grief': ['loss', 'died', 'death', 'grief', 'mourning', 'miss them', 'gone'],
-        'trauma': ['traumatic', 'ptsd', 'flashback', 'nightmare', 'haunted', 'triggered']
-    }
-    
     # Detect emotions
     detected_emotions = []
     emotion_scores = {}
     
-    for emotion, keywords in emotion_patterns.items():
-        matches = sum(1 for keyword in keywords if keyword in text_lower)
+    for emotion, keywords in EMOTION_PATTERNS.items():
+        matches = sum(1 for keyword in keywords if keyword in keyword_hits)
         if matches > 0:
             detected_emotions.append(emotion)
             emotion_scores[emotion] = matches
@@ -143,18 +238,9 @@ def analyze_text_context(text):
         else:
             detected_emotions = ["stress"]
     
-    # Tone analysis
-    tone_indicators = {
-        'urgent': ['help', 'please', 'now', 'cant', 'urgent', 'emergency'],
-        'desperate': ['desperate', 'hopeless', 'helpless', 'lost', 'broken'],
-        'seeking_help': ['need help', 'what should i do', 'how do i', 'advice', 'suggestions'],
-        'isolated': ['alone', 'nobody', 'no one', 'isolated', 'lonely'],
-        'overwhelmed': ['too much', 'cant handle', 'overwhelming', 'drowning']
-    }
-    
     tone_analysis = []
-    for tone, indicators in tone_indicators.items():
-        if any(indicator in text_lower for indicator in indicators):
+    for tone, indicators in TONE_INDICATORS.items():
+        if any(indicator in keyword_hits for indicator in indicators):
             tone_analysis.append(tone)
     
     # Extract key concerns from text
@@ -163,40 +249,59 @@ def analyze_text_context(text):
     
     # Only analyze concerns if person is actually stressed/depressed
     if sentiment == "Stressed" or has_mental_health_keywords:
-        concern_patterns = {
-            'work_stress': ['work stress', 'job stress', 'boss', 'workload', 'deadline pressure', 'workplace', 'burnout', 'overworked'],
-            'relationships': ['relationship', 'partner', 'spouse', 'breakup', 'divorce', 'lonely', 'alone'],
-            'health': ['sick', 'ill', 'pain', 'disease', 'medical'],
-            'financial': ['money stress', 'debt', 'bills', 'financial stress', 'broke', 'cant afford'],
-            'academic': ['exam stress', 'grades stress', 'study pressure', 'assignment stress', 'academic pressure'],
-            'sleep': ['sleep', 'insomnia', 'cant sleep', 'nightmares'],
-            'eating': ['eating disorder', 'appetite', 'weight', 'not eating']
-        }
-        
-        for concern, keywords in concern_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for concern, keywords in CONCERN_PATTERNS.items():
+            if any(keyword in keyword_hits for keyword in keywords):
                 concerns.append(concern.replace('_', ' ').title())
     
-    # Generate AI-powered recommendations via Google Gemini
-    ai_result = ai_service.generate_recommendations(
-        text=text,
-        sentiment=sentiment,
-        confidence=confidence,
-        emotions=detected_emotions,
-        concerns=concerns,
-        tone=tone_analysis
-    )
+    # Inputs for the Gemini prompt (before display defaults are applied)
+    recommendation_request = {
+        'text': text,
+        'sentiment': sentiment,
+        'confidence': confidence,
+        'emotions': detected_emotions,
+        'concerns': concerns,
+        'tone': tone_analysis,
+        'salient_keywords': sorted(keyword_hits)
+    }
     
-    # Use AI results if available, otherwise fallback to hardcoded
-    if ai_result:
-        suggestions = ai_result.get('suggestions', [])
-        immediate_actions = ai_result.get('immediate_actions', [])
-        ai_generated = ai_result.get('ai_generated', True)
-    else:
+    def generate_ai_recommendations():
+        # Generate AI-powered recommendations via Google Gemini
+        return ai_service.generate_recommendations(**recommendation_request, deadline=deadline)
+    
+    def generate_fallback_recommendations():
         # Fallback to hardcoded recommendations if Gemini fails
-        suggestions = generate_contextual_suggestions(primary_emotion, tone_analysis, concerns, text_lower)
-        immediate_actions = generate_immediate_actions(primary_emotion, tone_analysis)
+        return {
+            'suggestions': generate_contextual_suggestions(primary_emotion, tone_analysis, concerns, text_lower),
+            'immediate_actions': generate_immediate_actions(primary_emotion, tone_analysis),
+            'ai_generated': False
+        }
+    
+    recommendation_job = None
+    
+    if defer_recommendations:
+        # Return the classification now - suggestions are delivered by the job
+        if deadline is None:
+            deadline = time.monotonic() + recommendation_jobs.timeout
+        recommendation_job = recommendation_jobs.submit(
+            generate_ai_recommendations,
+            generate_fallback_recommendations
+        )
+        suggestions = []
+        immediate_actions = []
         ai_generated = False
+    else:
+        ai_result = generate_ai_recommendations() if use_ai_recommendations else None
+        
+        # Use AI results if available, otherwise fallback to hardcoded
+        if ai_result:
+            suggestions = ai_result.get('suggestions', [])
+            immediate_actions = ai_result.get('immediate_actions', [])
+            ai_generated = ai_result.get('ai_generated', True)
+        else:
+            fallback = generate_fallback_recommendations()
+            suggestions = fallback['suggestions']
+            immediate_actions = fallback['immediate_actions']
+            ai_generated = False
     
     result = {
         'sentiment': sentiment,
@@ -208,264 +313,202 @@ def analyze_text_context(text):
         'suggestions': suggestions,
         'immediate_actions': immediate_actions,
         'ai_generated': ai_generated,
-        'prediction_source': prediction_source
+        'prediction_source': prediction_source,
+        'recommendation_request': recommendation_request
     }
     
     # Add BERT probabilities if available
     if bert_prediction and 'probabilities' in bert_prediction:
         result['probabilities'] = bert_prediction['probabilities']
     
+    if recommendation_job:
+        result['recommendation_job'] = recommendation_job
+    
     return result
 
 
+def analyze_text_batch(texts, use_ai_recommendations=False):
+    """
+    Analyze many texts with a single batched DistilBERT forward pass
+    
+    Args:
+        texts: List of texts (invalid entries produce per-item errors)
+        use_ai_recommendations: Request Gemini recommendations for each item
+        
+    Returns:
+        List of per-item dicts, each either {'index', 'analysis'} or {'index', 'error'}
+    """
+    items = []
+    valid = []
+    
+    for index, text in enumerate(texts):
+        if not isinstance(text, str) or not text.strip():
+            items.append({'index': index, 'error': 'Text is required'})
+        else:
+            items.append({'index': index})
+            valid.append((index, text.strip()))
+    
+    predictions = model_service.predict_batch([text for _, text in valid]) if valid else []
+    
+    analyzed = []
+    for (index, text), bert_prediction in zip(valid, predictions):
+        try:
+            # Fallback recommendations first - replaced below where Gemini succeeds
+            items[index]['analysis'] = analyze_prediction_context(
+                text,
+                bert_prediction,
+                use_ai_recommendations=False
+            )
+            analyzed.append(index)
+        except Exception as e:
+            print(f"❌ Error analyzing batch item {index}: {e}")
+            items[index]['error'] = f'Analysis failed: {str(e)}'
+    
+    if use_ai_recommendations and analyzed:
+        # Several texts share each Gemini prompt
+        ai_results = ai_service.generate_batch_recommendations(
+            [items[index]['analysis']['recommendation_request'] for index in analyzed],
+            deadline=time.monotonic() + BATCH_BUDGET_SECONDS
+        )
+        
+        for index, ai_result in zip(analyzed, ai_results):
+            if ai_result:
+                analysis = items[index]['analysis']
+                analysis['suggestions'] = ai_result.get('suggestions', [])
+                analysis['immediate_actions'] = ai_result.get('immediate_actions', [])
+                analysis['ai_generated'] = ai_result.get('ai_generated', True)
+    
+    return items
+
+
+def iter_ndjson_records(stream, max_line_bytes=STREAM_MAX_LINE_BYTES):
+    """
+    Parse a newline-delimited JSON stream one line at a time
+    
+    Each line is either {"text": "...", "id": optional} or a bare JSON string.
+    Only one line is held in memory at a time; over-long lines are skipped.
+    
+    Yields:
+        Dicts with 'line' and 'id', plus either 'text' or 'error'
+    """
+    line_number = 0
+    
+    while True:
+        raw = stream.readline(max_line_bytes + 1)
+        if not raw:
+            return
+        
+        line_number += 1
+        
+        if len(raw) > max_line_bytes and not raw.endswith(b'\n'):
+            # Drain the rest of the over-long line without buffering it
+            while True:
+                rest = stream.readline(max_line_bytes)
+                if not rest or rest.endswith(b'\n'):
+                    break
+            yield {'line': line_number, 'id': None, 'error': f'Line exceeds {max_line_bytes} bytes'}
+            continue
+        
+        raw = raw.strip()
+        if not raw:
+            continue
+        
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield {'line': line_number, 'id': None, 'error': f'Invalid JSON: {str(e)}'}
+            continue
+        
+        if isinstance(record, str):
+            yield {'line': line_number, 'id': None, 'text': record}
+        elif isinstance(record, dict):
+            yield {'line': line_number, 'id': record.get('id'), 'text': record.get('text')}
+        else:
+            yield {'line': line_number, 'id': None, 'error': 'Each line must be a JSON object or string'}
+
+
+def analyze_record_chunk(records, use_ai_recommendations=False):
+    """Analyze a chunk of parsed NDJSON records and return one NDJSON line per record"""
+    pending = [record for record in records if 'error' not in record]
+    items = analyze_text_batch(
+        [record['text'] for record in pending],
+        use_ai_recommendations=use_ai_recommendations
+    )
+    
+    for record, item in zip(pending, items):
+        if 'error' in item:
+            record['error'] = item['error']
+        else:
+            record['analysis'] = item['analysis']
+    
+    lines = []
+    for record in records:
+        output = {"line": record['line'], "id": record['id']}
+        
+        if 'error' in record:
+            output.update({"success": False, "error": record['error']})
+        else:
+            output.update({"success": True, **format_analysis_response(record['analysis'])})
+        
+        lines.append(json.dumps(output) + '\n')
+    
+    return ''.join(lines)
+
+
+def format_extraction_data(result, url):
+    """Shape a successful URL extraction for the API response"""
+    data = {
+        "content": result.get('content', ''),
+        "author": result.get('author', 'Unknown'),
+        "date": result.get('date', ''),
+        "url": url,
+        "extraction_method": result.get('method', 'unknown')
+    }
+    # Comment threads only (Reddit with include_comments) - counts stay out of this field
+    if isinstance(result.get('comments'), list):
+        data['comments'] = result['comments']
+    return data
+
+
+def format_url_job(job):
+    """Shape a background extraction job snapshot like /api/analyze/url"""
+    job = dict(job)
+    if 'data' in job:
+        job['platform'] = job['data'].get('platform', 'Instagram')
+        job['data'] = format_extraction_data(job['data'], job['url'])
+    return job
+
+
+def format_analysis_response(analysis_result):
+    """Shape an analysis result into the /api/analyze/text response schema"""
+    return {
+        "sentiment": analysis_result['sentiment'],
+        "confidence": analysis_result['confidence'],
+        "timestamp": int(time.time() * 1000),
+        "categories": analysis_result['categories'],
+        "detected_emotions": analysis_result['emotions'],
+        "key_concerns": analysis_result['concerns'],
+        "tone_analysis": analysis_result['tone'],
+        "ai_suggestions": analysis_result['suggestions'],
+        "immediate_actions": analysis_result['immediate_actions'],
+        "ai_generated": analysis_result.get('ai_generated', False),
+        "message": "AI-powered contextual analysis complete"
+    }
+
+
 def generate_contextual_suggestions(emotion, tone, concerns, text):
     """Generate personalized AI suggestions based on emotional context"""
-    suggestions = []
-    
-    # Crisis-level suggestions
-    if emotion == 'suicidal' or 'desperate' in tone:
-        suggestions.extend([
-            {
-                'priority': 'critical',
-                'title': 'Reach Out for Immediate Help',
-                'description': 'Your safety is the top priority. Please contact a crisis helpline immediately (988 in USA).',
-                'rationale': 'Professional crisis counselors are trained to help in situations like yours and are available 24/7.'
-            },
-            {
-                'priority': 'critical',
-                'title': 'Don\'t Stay Alone Right Now',
-                'description': 'Call a trusted friend, family member, or go to a public place. Physical presence of others can provide immediate safety.',
-                'rationale': 'Social connection during crisis moments has been shown to significantly reduce risk and provide emotional grounding.'
-            }
-        ])
-    
-    # Depression-specific suggestions
-    if emotion == 'depression':
-        suggestions.extend([
-            {
-                'priority': 'high',
-                'title': 'Start with One Small Action',
-                'description': 'Choose just one small task today - make your bed, take a 5-minute walk, or drink a glass of water.',
-                'rationale': 'Depression makes everything feel impossible. Small wins create momentum and prove you can still take action.'
-            },
-            {
-                'priority': 'high',
-                'title': 'Schedule a Therapy Session',
-                'description': 'Consider reaching out to a mental health professional. Cognitive Behavioral Therapy (CBT) has strong evidence for treating depression.',
-                'rationale': 'Professional support provides structured approaches to address underlying patterns and develop coping strategies.'
-            },
-            {
-                'priority': 'medium',
-                'title': 'Get Sunlight Exposure',
-                'description': 'Spend 15-30 minutes outdoors in natural sunlight, especially in the morning.',
-                'rationale': 'Sunlight helps regulate circadian rhythm and boosts serotonin production, which is often low in depression.'
-            }
-        ])
-    
-    # Anxiety-specific suggestions
-    if emotion == 'anxiety':
-        suggestions.extend([
-            {
-                'priority': 'high',
-                'title': 'Practice Grounding Techniques',
-                'description': 'Use the 5-4-3-2-1 method: Name 5 things you see, 4 you feel, 3 you hear, 2 you smell, 1 you taste.',
-                'rationale': 'Grounding techniques interrupt anxiety spirals by bringing your focus back to the present moment.'
-            },
-            {
-                'priority': 'high',
-                'title': 'Box Breathing Exercise',
-                'description': 'Breathe in for 4 counts, hold for 4, out for 4, hold for 4. Repeat for 5 minutes.',
-                'rationale': 'This technique activates your parasympathetic nervous system, physically calming your anxiety response.'
-            },
-            {
-                'priority': 'medium',
-                'title': 'Write Down Your Worries',
-                'description': 'Set aside 15 minutes to write all your anxious thoughts. Then schedule a time tomorrow to address them.',
-                'rationale': 'Externalizing worries reduces mental load and helps distinguish between productive and unproductive anxiety.'
-            }
-        ])
-    
-    # Stress-specific suggestions
-    if emotion == 'stress':
-        suggestions.extend([
-            {
-                'priority': 'high',
-                'title': 'Prioritize and Delegate',
-                'description': 'List everything overwhelming you. Identify top 3 priorities and see what can be delegated, delayed, or dropped.',
-                'rationale': 'Stress often comes from feeling everything is urgent. Prioritization reduces cognitive load and creates clarity.'
-            },
-            {
-                'priority': 'medium',
-                'title': 'Take Strategic Breaks',
-                'description': 'Use the Pomodoro technique: 25 minutes focused work, then 5-minute break. Every 4 cycles, take 15-30 minutes.',
-                'rationale': 'Regular breaks prevent burnout and actually improve productivity by maintaining mental freshness.'
-            }
-        ])
-    
-    # Work-related concerns
-    if 'Work Stress' in concerns:
-        suggestions.append({
-            'priority': 'medium',
-            'title': 'Set Clear Work Boundaries',
-            'description': 'Establish specific work hours and communicate them. Turn off notifications outside these hours.',
-            'rationale': 'Boundary-setting reduces work-life conflict and prevents chronic stress from constant availability.'
-        })
-    
-    # Relationship concerns
-    if 'Relationships' in concerns:
-        suggestions.append({
-            'priority': 'medium',
-            'title': 'Practice "I Feel" Communication',
-            'description': 'Express concerns using "I feel [emotion] when [situation]" instead of blaming language.',
-            'rationale': 'This communication style reduces defensiveness and opens pathways for genuine understanding and resolution.'
-        })
-    
-    # Sleep concerns
-    if 'Sleep' in concerns:
-        suggestions.append({
-            'priority': 'high',
-            'title': 'Create a Sleep Routine',
-            'description': 'Go to bed and wake at consistent times. Avoid screens 1 hour before bed. Keep bedroom cool and dark.',
-            'rationale': 'Sleep hygiene directly impacts mental health. Poor sleep amplifies depression and anxiety by 40-60%.'
-        })
-    
-    # General wellness if no specific emotion detected
-    # Only show for neutral content that might benefit from general advice
-    # Don't show for clearly positive/normal content
-    if emotion == 'neutral' and ('seeking_help' in tone or 'overwhelmed' in tone):
-        suggestions.extend([
-            {
-                'priority': 'medium',
-                'title': 'Maintain Mental Fitness',
-                'description': 'Continue daily practices like journaling, exercise, and social connection to build resilience.',
-                'rationale': 'Preventive mental health care is as important as physical fitness for long-term wellbeing.'
-            }
-        ])
-    
-    # If no suggestions (truly normal/positive content), return empty list
-    return suggestions[:5] if suggestions else []
+    return fallback_recommendations.lookup(emotion, tone, concerns).suggestions
 
 
 def generate_immediate_actions(emotion, tone):
     """Generate immediate action steps based on emotional state"""
-    actions = []
-    
-    if emotion == 'suicidal' or 'desperate' in tone:
-        actions = [
-            "Call 988 (Suicide Prevention Lifeline) immediately",
-            "Text 'HOME' to 741741 (Crisis Text Line)",
-            "Go to nearest emergency room if in immediate danger",
-            "Call a trusted friend or family member right now",
-            "Remove any means of self-harm from your environment"
-        ]
-    elif emotion == 'depression':
-        actions = [
-            "Take a 5-minute walk outside",
-            "Drink a glass of water and eat something nutritious",
-            "Call or text one person you trust",
-            "Write down one thing you're grateful for",
-            "Take a warm shower"
-        ]
-    elif emotion == 'anxiety':
-        actions = [
-            "Practice deep breathing for 2 minutes",
-            "Name 5 things you can see around you",
-            "Splash cold water on your face",
-            "Listen to calming music for 10 minutes",
-            "Step away from the stressful situation if possible"
-        ]
-    elif emotion == 'stress':
-        actions = [
-            "Write down everything on your mind",
-            "Identify your top 3 priorities for today",
-            "Take a 15-minute break from work/tasks",
-            "Do 10 jumping jacks to release tension",
-            "Drink water and check if you're hungry"
-        ]
-    elif emotion == 'neutral' and any(t in tone for t in ['seeking_help', 'overwhelmed']):
-        # Only show for neutral content that seems like user is asking for help
-        actions = [
-            "Continue your current wellness practices",
-            "Take a moment to check in with yourself",
-            "Maintain your sleep and exercise routines"
-        ]
-    else:
-        # Truly normal/positive content - no actions needed
-        actions = []
-    
-    return actions
+    return fallback_recommendations.lookup(emotion, tone).immediate_actions
 
 
 def generate_support_resources(emotion, concerns):
     """Generate relevant support resources based on context"""
-    resources = []
-    
-    if emotion == 'suicidal':
-        resources.extend([
-            {
-                'name': '988 Suicide & Crisis Lifeline',
-                'type': 'crisis',
-                'contact': '988 (USA)',
-                'description': '24/7 crisis support by trained counselors',
-                'availability': 'Immediate'
-            },
-            {
-                'name': 'Crisis Text Line',
-                'type': 'crisis',
-                'contact': 'Text HOME to 741741',
-                'description': 'Text-based crisis counseling',
-                'availability': 'Immediate'
-            }
-        ])
-    
-    if emotion in ['depression', 'anxiety']:
-        resources.extend([
-            {
-                'name': 'BetterHelp',
-                'type': 'therapy',
-                'contact': 'betterhelp.com',
-                'description': 'Online therapy with licensed therapists',
-                'availability': 'Within 48 hours'
-            },
-            {
-                'name': 'Psychology Today Therapist Finder',
-                'type': 'therapy',
-                'contact': 'psychologytoday.com/us/therapists',
-                'description': 'Find local therapists by specialty',
-                'availability': 'Varies'
-            }
-        ])
-    
-    if 'Work Stress' in concerns:
-        resources.append({
-            'name': 'Employee Assistance Program (EAP)',
-            'type': 'workplace',
-            'contact': 'Check with your HR department',
-            'description': 'Free confidential counseling through employer',
-            'availability': 'Varies by employer'
-        })
-    
-    if 'Financial' in concerns:
-        resources.append({
-            'name': 'National Foundation for Credit Counseling',
-            'type': 'financial',
-            'contact': 'nfcc.org',
-            'description': 'Free financial counseling and debt management',
-            'availability': 'Within days'
-        })
-    
-    # Only include general NAMI resource if there are mental health concerns
-    # Don't show for truly normal/positive content
-    if emotion != 'neutral' or resources:
-        resources.append({
-            'name': 'NAMI Helpline',
-            'type': 'support',
-            'contact': '1-800-950-NAMI (6264)',
-            'description': 'Mental health information and support',
-            'availability': 'Mon-Fri 10am-10pm ET'
-        })
-    
-    return resources[:5] if resources else []
+    return fallback_recommendations.lookup(emotion, concerns=concerns).support_resources
 
 
 @app.route('/api/health', methods=['GET'])
@@ -474,7 +517,33 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "service": "MindTrack AI Backend",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "recommendation_service": {
+            "configured": ai_service.configured,
+            "circuit": ai_service.breaker.state
+        }
+    }), 200
+
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Runtime metrics for caches and upstream services"""
+    return jsonify({
+        "success": True,
+        "recommendation_cache": ai_service.cache.stats(),
+        "recommendation_single_flight": ai_service.in_flight.stats(),
+        "gemini_calls": ai_service.hedger.stats(),
+        "gemini_circuit": ai_service.breaker.stats(),
+        "gemini_tokens": ai_service.accounting.stats(),
+        "gemini_quota": ai_service.quota.stats(),
+        "recommendation_retrieval": ai_service.index.stats(),
+        "http_pools": http_client.stats(),
+        "http_pools_async": async_http_client.stats(),
+        "async_engine": async_engine.stats(),
+        "extraction_cache": url_extractor.cache.stats(),
+        "extraction_races": method_racer.stats(),
+        "apify_jobs": url_extractor.apify_jobs.stats(),
+        "rate_limits": rate_limits.stats()
     }), 200
 
 
@@ -539,13 +608,7 @@ def analyze_url():
         return jsonify({
             "success": True,
             "platform": result.get('platform', 'Unknown'),
-            "data": {
-                "content": result.get('content', ''),
-                "author": result.get('author', 'Unknown'),
-                "date": result.get('date', ''),
-                "url": url,
-                "extraction_method": result.get('method', 'unknown')
-            }
+            "data": format_extraction_data(result, url)
         }), 200
     
     except Exception as e:
@@ -560,6 +623,218 @@ def analyze_url():
         }), 500
 
 
+@app.route('/api/analyze/url/jobs', methods=['POST'])
+def submit_url_job():
+    """
+    Start a background Apify scrape for an Instagram URL and return immediately
+    
+    Request body:
+    {
+        "url": "https://www.instagram.com/p/..."
+    }
+    
+    Response (202, or 200 when served from the extraction cache):
+    {
+        "success": true,
+        "job_id": "...",
+        "status": "running|complete|failed|timeout",
+        "run_status": "READY|RUNNING|SUCCEEDED|...",
+        "elapsed_ms": 12,
+        "cost_usd": null,
+        "compute_units": null,
+        "data": {...}              // once complete, same as /api/analyze/url
+    }
+    
+    Poll GET /api/analyze/url/jobs/<job_id> or stream .../stream for the outcome
+    """
+    data = request.get_json(silent=True)
+    
+    if not data or 'url' not in data:
+        return jsonify({
+            "success": False,
+            "error": "No URL provided"
+        }), 400
+    
+    url = data['url'].strip() if isinstance(data['url'], str) else ''
+    
+    if URLValidator.detect_platform(url) != 'instagram':
+        return jsonify({
+            "success": False,
+            "error": "Background extraction jobs are only available for Instagram URLs"
+        }), 400
+    
+    if not url_extractor.apify_jobs.enabled:
+        return jsonify({
+            "success": False,
+            "error": "Background Instagram extraction requires APIFY_API_TOKEN"
+        }), 503
+    
+    job = format_url_job(url_extractor.apify_jobs.submit(url))
+    status = 202 if job['status'] == 'running' else 200
+    
+    return jsonify({"success": job['status'] in ('running', 'complete'), **job}), status
+
+
+@app.route('/api/analyze/url/jobs/<job_id>', methods=['GET'])
+def get_url_job(job_id):
+    """
+    Poll a background URL extraction job (see POST /api/analyze/url/jobs)
+    """
+    job = url_extractor.apify_jobs.get(job_id)
+    
+    if not job:
+        return jsonify({
+            "success": False,
+            "error": "Extraction job not found or expired"
+        }), 404
+    
+    return jsonify({"success": True, **format_url_job(job)}), 200
+
+
+@app.route('/api/analyze/url/jobs/<job_id>/stream', methods=['GET'])
+def stream_url_job(job_id):
+    """
+    Stream a background URL extraction job as Server-Sent Events
+    
+    Emits keep-alive comments while running and a single "extraction"
+    event with the job once it completes, fails or times out
+    """
+    if not url_extractor.apify_jobs.get(job_id):
+        return jsonify({
+            "success": False,
+            "error": "Extraction job not found or expired"
+        }), 404
+    
+    def generate():
+        while True:
+            job = url_extractor.apify_jobs.wait(job_id, timeout=5)
+            
+            if not job:
+                yield "event: error\ndata: {\"error\": \"Extraction job expired\"}\n\n"
+                return
+            
+            if job['status'] != 'running':
+                yield f"event: extraction\ndata: {json.dumps(format_url_job(job))}\n\n"
+                return
+            
+            yield ": keep-alive\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/api/analyze/urls', methods=['POST'])
+def analyze_urls():
+    """
+    Extract content from many social media URLs concurrently
+    
+    Request body:
+    {
+        "urls": ["https://twitter.com/...", "https://www.reddit.com/r/...", ...],
+        "concurrency": 20,  // optional - overall cap, per-platform caps still apply
+        "include_comments": false  // optional - also fetch Reddit comment threads
+    }
+    
+    Response (application/x-ndjson, chunked), one line per URL in completion order:
+        {"index": 1, "url": "...", "success": true, "platform": "Reddit", "method": "info_api",
+         "elapsed_ms": 412.5, "data": {...same as /api/analyze/url}}
+        {"index": 0, "url": "...", "success": false, "platform": "twitter", "method": null,
+         "elapsed_ms": 88.1, "error": "..."}
+    followed by a summary line:
+        {"summary": true, "count": 2, "succeeded": 1, "failed": 1, "elapsed_ms": 415.0}
+    
+    Extractions run on the async engine with EXTRACTION_CONCURRENCY_<PLATFORM>
+    caps so a long list of Reddit links can't trip Reddit's rate limits.
+    Reddit posts are looked up 100 per request through /api/info.json; with
+    include_comments each Reddit thread is fetched on its own instead
+    """
+    data = request.get_json(silent=True)
+    
+    if not data:
+        return jsonify({
+            "success": False,
+            "error": "No data provided"
+        }), 400
+    
+    urls = data.get('urls')
+    
+    if not isinstance(urls, list) or not urls:
+        return jsonify({
+            "success": False,
+            "error": "urls must be a non-empty array"
+        }), 400
+    
+    if len(urls) > URLS_MAX_PER_REQUEST:
+        return jsonify({
+            "success": False,
+            "error": f"Too many URLs - maximum is {URLS_MAX_PER_REQUEST} per request"
+        }), 400
+    
+    concurrency = data.get('concurrency')
+    if concurrency is not None and (not isinstance(concurrency, int) or concurrency < 1):
+        return jsonify({
+            "success": False,
+            "error": "concurrency must be a positive integer"
+        }), 400
+    
+    include_comments = data.get('include_comments', False)
+    if not isinstance(include_comments, bool):
+        return jsonify({
+            "success": False,
+            "error": "include_comments must be a boolean"
+        }), 400
+    
+    urls = [url.strip() if isinstance(url, str) else url for url in urls]
+    
+    def generate():
+        start = time.monotonic()
+        succeeded = 0
+        
+        try:
+            for item in url_extractor.iter_extract_many(urls, concurrency, include_comments):
+                result = item['result']
+                line = {
+                    "index": item['index'],
+                    "url": item['url'],
+                    "success": 'error' not in result,
+                    "platform": result.get('platform') or item['platform'],
+                    "method": result.get('method'),
+                    "elapsed_ms": item['elapsed_ms']
+                }
+                
+                if line['success']:
+                    succeeded += 1
+                    line['data'] = format_extraction_data(result, item['url'])
+                else:
+                    line['error'] = result['error']
+                
+                yield json.dumps(line) + '\n'
+            
+            yield json.dumps({
+                "summary": True,
+                "count": len(urls),
+                "succeeded": succeeded,
+                "failed": len(urls) - succeeded,
+                "elapsed_ms": round((time.monotonic() - start) * 1000, 1)
+            }) + '\n'
+        
+        except Exception as e:
+            # Headers are already sent - report the failure in-band
+            print(f"Error in /api/analyze/urls: {str(e)}")
+            print(traceback.format_exc())
+            yield json.dumps({
+                "success": False,
+                "error": "Internal server error occurred while extracting URLs",
+                "details": str(e)
+            }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/analyze/text', methods=['POST'])
 def analyze_text():
     """
@@ -568,9 +843,14 @@ def analyze_text():
     
     Request body:
     {
-        "text": "Text content to analyze"
+        "text": "Text content to analyze",
+        "mode": "deferred"  // optional - return classification now, suggestions via job
     }
     
+    In deferred mode the response has empty suggestions and a "recommendation_job"
+    object; poll GET /api/analyze/recommendations/<job_id> or subscribe to
+    GET /api/analyze/recommendations/<job_id>/stream (Server-Sent Events)
+    
     Response:
     {
         "success": true,
@@ -584,6 +864,7 @@ def analyze_text():
     }
     """
     try:
+        deadline = time.monotonic() + REQUEST_BUDGET_SECONDS
         data = request.get_json()
         
         if not data:
@@ -602,25 +883,28 @@ def analyze_text():
         
         # TODO: Replace with actual DistilBERT model inference
         # For now, return enhanced analysis with AI suggestions
-        import time
-        import re
+        deferred = data.get('mode') == 'deferred'
         
         # Analyze text context and tone
-        analysis_result = analyze_text_context(text)
+        analysis_result = analyze_text_context(
+            text,
+            defer_recommendations=deferred,
+            deadline=None if deferred else deadline
+        )
         
-        return jsonify({
-            "sentiment": analysis_result['sentiment'],
-            "confidence": analysis_result['confidence'],
-            "timestamp": int(time.time() * 1000),
-            "categories": analysis_result['categories'],
-            "detected_emotions": analysis_result['emotions'],
-            "key_concerns": analysis_result['concerns'],
-            "tone_analysis": analysis_result['tone'],
-            "ai_suggestions": analysis_result['suggestions'],
-            "immediate_actions": analysis_result['immediate_actions'],
-            "ai_generated": analysis_result.get('ai_generated', False),
-            "message": "AI-powered contextual analysis complete"
-        }), 200
+        response = format_analysis_response(analysis_result)
+        
+        if deferred:
+            job_id = analysis_result['recommendation_job']
+            response["message"] = "Classification complete - recommendations pending"
+            response["recommendation_job"] = {
+                "job_id": job_id,
+                "status": "pending",
+                "poll_url": f"/api/analyze/recommendations/{job_id}",
+                "stream_url": f"/api/analyze/recommendations/{job_id}/stream"
+            }
+        
+        return jsonify(response), 200
     
     except Exception as e:
         print(f"Error in /api/analyze/text: {str(e)}")
@@ -633,6 +917,288 @@ def analyze_text():
         }), 500
 
 
+@app.route('/api/analyze/text/stream', methods=['POST'])
+def analyze_text_stream():
+    """
+    Analyze text and stream Gemini recommendations as Server-Sent Events
+    
+    Request body:
+    {
+        "text": "Text content to analyze"
+    }
+    
+    Events (text/event-stream):
+        event: analysis     - classification in the /api/analyze/text schema, without suggestions
+        event: suggestion   - one AI suggestion, sent as soon as Gemini finishes writing it
+        event: complete     - final ai_suggestions, immediate_actions and ai_generated
+                              (hardcoded fallback if Gemini fails mid-stream)
+    """
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({
+            "success": False,
+            "error": "No data provided"
+        }), 400
+    
+    text = data.get('text', '').strip()
+    
+    if not text:
+        return jsonify({
+            "success": False,
+            "error": "Text is required"
+        }), 400
+    
+    deadline = time.monotonic() + REQUEST_BUDGET_SECONDS
+    
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def generate():
+        try:
+            # Fallback recommendations come from the constant-time table, so this is fast
+            analysis_result = analyze_prediction_context(
+                text,
+                model_service.predict(text),
+                use_ai_recommendations=False
+            )
+            
+            analysis = format_analysis_response(analysis_result)
+            analysis.update({"ai_suggestions": [], "immediate_actions": []})
+            yield sse('analysis', analysis)
+            
+            ai_result = None
+            stream = ai_service.stream_recommendations(
+                **analysis_result['recommendation_request'],
+                deadline=deadline
+            )
+            try:
+                for event, payload in stream:
+                    if event == 'suggestion':
+                        yield sse('suggestion', payload)
+                    else:
+                        ai_result = payload
+            finally:
+                # Client disconnected mid-stream - let the Gemini stream settle its quota now
+                stream.close()
+            
+            final = ai_result or {
+                'suggestions': analysis_result['suggestions'],
+                'immediate_actions': analysis_result['immediate_actions'],
+                'ai_generated': False
+            }
+            
+            yield sse('complete', {
+                "ai_suggestions": final['suggestions'],
+                "immediate_actions": final['immediate_actions'],
+                "ai_generated": final.get('ai_generated', False)
+            })
+        
+        except Exception as e:
+            print(f"Error in /api/analyze/text/stream: {str(e)}")
+            print(traceback.format_exc())
+            yield sse('error', {
+                "success": False,
+                "error": "Internal server error occurred while streaming analysis",
+                "details": str(e)
+            })
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many texts in one request using batched model inference
+    
+    Request body:
+    {
+        "texts": ["first post", "second post", ...],
+        "include_ai_recommendations": false  // optional - Gemini per item (slow)
+    }
+    
+    Response:
+    {
+        "success": true,
+        "count": 2,
+        "results": [
+            {"index": 0, "success": true, ...same fields as /api/analyze/text},
+            {"index": 1, "success": false, "error": "Text is required"}
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                "success": False,
+                "error": "No data provided"
+            }), 400
+        
+        texts = data.get('texts')
+        
+        if not isinstance(texts, list) or not texts:
+            return jsonify({
+                "success": False,
+                "error": "texts must be a non-empty array"
+            }), 400
+        
+        if len(texts) > BATCH_MAX_TEXTS:
+            return jsonify({
+                "success": False,
+                "error": f"Too many texts - maximum is {BATCH_MAX_TEXTS} per request"
+            }), 400
+        
+        # Same parsing as the query parameter on /api/analyze/stream - "false" is False
+        use_ai = data.get('include_ai_recommendations', False)
+        use_ai = use_ai is True or (isinstance(use_ai, str) and use_ai.lower() == 'true')
+        
+        results = []
+        for item in analyze_text_batch(texts, use_ai_recommendations=use_ai):
+            if 'error' in item:
+                results.append({
+                    "index": item['index'],
+                    "success": False,
+                    "error": item['error']
+                })
+            else:
+                results.append({
+                    "index": item['index'],
+                    "success": True,
+                    **format_analysis_response(item['analysis'])
+                })
+        
+        return jsonify({
+            "success": True,
+            "count": len(results),
+            "results": results
+        }), 200
+    
+    except Exception as e:
+        print(f"Error in /api/analyze/batch: {str(e)}")
+        print(traceback.format_exc())
+        
+        return jsonify({
+            "success": False,
+            "error": "Internal server error occurred while analyzing batch",
+            "details": str(e)
+        }), 500
+
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_stream():
+    """
+    Stream-analyze a newline-delimited JSON upload
+    
+    Request body (application/x-ndjson), one record per line:
+        {"id": "post-1", "text": "First post"}
+        "Second post as a bare string"
+    
+    Query parameters:
+        include_ai_recommendations=true  // optional - Gemini per item (slow)
+    
+    Response (application/x-ndjson, chunked), one result per input line:
+        {"line": 1, "id": "post-1", "success": true, ...same fields as /api/analyze/text}
+        {"line": 2, "id": null, "success": false, "error": "Invalid JSON: ..."}
+    
+    Input is read and analyzed in STREAM_CHUNK_SIZE batches and results are
+    written as each batch completes, so memory stays flat for any upload size
+    """
+    use_ai = request.args.get('include_ai_recommendations', 'false').lower() == 'true'
+    
+    def generate():
+        chunk = []
+        
+        try:
+            for record in iter_ndjson_records(request.stream):
+                chunk.append(record)
+                
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    yield analyze_record_chunk(chunk, use_ai_recommendations=use_ai)
+                    chunk = []
+            
+            if chunk:
+                yield analyze_record_chunk(chunk, use_ai_recommendations=use_ai)
+        
+        except Exception as e:
+            # Headers are already sent - report the failure in-band
+            print(f"Error in /api/analyze/stream: {str(e)}")
+            print(traceback.format_exc())
+            yield json.dumps({
+                "success": False,
+                "error": "Internal server error occurred while streaming analysis",
+                "details": str(e)
+            }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@app.route('/api/analyze/recommendations/<job_id>', methods=['GET'])
+def get_recommendations(job_id):
+    """
+    Poll a deferred recommendation job
+    
+    Response:
+    {
+        "success": true,
+        "job_id": "...",
+        "status": "pending|complete|fallback|timeout",
+        "ai_suggestions": [...],      // once resolved
+        "immediate_actions": [...],   // once resolved
+        "ai_generated": true
+    }
+    """
+    job = recommendation_jobs.get(job_id)
+    
+    if not job:
+        return jsonify({
+            "success": False,
+            "error": "Recommendation job not found or expired"
+        }), 404
+    
+    return jsonify({"success": True, **job}), 200
+
+
+@app.route('/api/analyze/recommendations/<job_id>/stream', methods=['GET'])
+def stream_recommendations(job_id):
+    """
+    Stream a deferred recommendation job as Server-Sent Events
+    
+    Emits keep-alive comments while pending and a single "recommendations"
+    event with the resolved job once it completes or times out
+    """
+    if not recommendation_jobs.get(job_id):
+        return jsonify({
+            "success": False,
+            "error": "Recommendation job not found or expired"
+        }), 404
+    
+    def generate():
+        while True:
+            job = recommendation_jobs.wait(job_id, timeout=5)
+            
+            if not job:
+                yield "event: error\ndata: {\"error\": \"Recommendation job expired\"}\n\n"
+                return
+            
+            if job['status'] != 'pending':
+                yield f"event: recommendations\ndata: {json.dumps(job)}\n\n"
+                return
+            
+            yield ": keep-alive\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/platforms', methods=['GET'])
 def get_supported_platforms():
     """
@@ -715,9 +1281,17 @@ if __name__ == '__main__':
     print("📍 Server starting on http://localhost:5000")
     print("📍 API endpoints:")
     print("   - POST /api/analyze/url")
+    print("   - POST /api/analyze/urls (NDJSON)")
+    print("   - POST /api/analyze/url/jobs (Instagram via Apify)")
+    print("   - GET  /api/analyze/url/jobs/<job_id>[/stream]")
     print("   - POST /api/analyze/text")
+    print("   - POST /api/analyze/text/stream (SSE)")
+    print("   - POST /api/analyze/batch")
+    print("   - POST /api/analyze/stream (NDJSON)")
+    print("   - GET  /api/analyze/recommendations/<job_id>[/stream]")
     print("   - GET  /api/platforms")
     print("   - GET  /api/health")
+    print("   - GET  /api/metrics")
     print("=" * 60)
     
     app.run(debug=True, host='0.0.0.0', port=5000)
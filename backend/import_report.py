@@ -0,0 +1,100 @@
+"""
+Import-time report for the backend
+Imports app.py in a fresh interpreter under `python -X importtime`, prints the
+most expensive modules and fails if startup regresses past the budget or pulls
+in a heavy dependency that should only load on first use
+
+Usage:
+    python import_report.py --top 20 --budget-ms 1500
+
+tests/test_import_time.py enforces the same budget under pytest
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+# Only loaded on first use (see ModelService.ensure_loaded, AIRecommendationService.model)
+LAZY_MODULES = ['torch', 'transformers', 'google.generativeai', 'bs4', 'apify_client', 'aiohttp']
+
+BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '1500'))
+
+
+def measure(module):
+    """
+    Import `module` in a subprocess and parse the -X importtime output
+
+    Returns:
+        (total_us, {module: (self_us, cumulative_us)})
+    """
+    env = dict(os.environ, PRELOAD_MODELS='false', PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=Path(__file__).parent, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        modules[name] = (int(self_us), int(cumulative_us))
+        if depth == 0:
+            total += int(cumulative_us)
+
+    return total, modules
+
+
+def by_package(modules):
+    """Sum self time per top-level package"""
+    totals = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        totals[name.split('.')[0]] += self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report backend import time and enforce a budget')
+    parser.add_argument('--module', default='app')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    args = parser.parse_args()
+
+    total, modules = measure(args.module)
+
+    print("=" * 60)
+    print(f"Import of '{args.module}': {total / 1000:.0f} ms ({len(modules)} modules)")
+    print("=" * 60)
+    print("Top packages (self time):")
+    for package, self_us in sorted(by_package(modules).items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+    print("Top modules (cumulative):")
+    for name, (_, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][1])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print("=" * 60)
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if total / 1000 > args.budget_ms:
+        failures.append(f"import time {total / 1000:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+
+    print(f"✅ Within budget ({total / 1000:.0f} / {args.budget_ms:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
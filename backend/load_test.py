@@ -0,0 +1,98 @@
+"""
+Offline load test for POST /api/analyze/text
+Runs the full Flask request path against the Gemini stub backend and reports
+latency percentiles and how often responses fell back to hardcoded recommendations
+
+Usage:
+    python load_test.py --requests 200 --concurrency 16 --error-rate 0.2 --latency-ms 1500
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+SAMPLE_TEXTS = [
+    "I feel hopeless and alone, nothing I do matters anymore",
+    "Had a great day at the beach with friends!",
+    "My boss keeps piling on work and I cant cope with the deadline pressure",
+    "I'm so anxious about my exams, I can't sleep at night",
+    "Just finished a new painting, really happy with how it turned out",
+]
+
+# Must queue for Gemini at QuotaScheduler.CRISIS priority
+CRISIS_TEXT = "I feel suicidal and I dont want to live anymore"
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test /api/analyze/text against the Gemini stub')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=None)
+    parser.add_argument('--error-rate', type=float, default=None)
+    parser.add_argument('--malformed-rate', type=float, default=None)
+    parser.add_argument('--rpm', type=float, default=None, help='Local Gemini request quota (GEMINI_RPM)')
+    parser.add_argument('--deferred', action='store_true', help='Use "mode": "deferred"')
+    args = parser.parse_args()
+
+    # Configure the stub before the app (and ai_service) is imported
+    os.environ['GEMINI_BACKEND'] = 'stub'
+    if args.latency_ms is not None:
+        os.environ['GEMINI_STUB_LATENCY_MS'] = str(args.latency_ms)
+    if args.error_rate is not None:
+        os.environ['GEMINI_STUB_ERROR_RATE'] = str(args.error_rate)
+    if args.malformed_rate is not None:
+        os.environ['GEMINI_STUB_MALFORMED_RATE'] = str(args.malformed_rate)
+    if args.rpm is not None:
+        os.environ['GEMINI_RPM'] = str(args.rpm)
+
+    from app import app
+
+    client = app.test_client()
+    body_mode = {'mode': 'deferred'} if args.deferred else {}
+
+    def send(i):
+        start = time.perf_counter()
+        response = client.post('/api/analyze/text', json={'text': SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)], **body_mode})
+        elapsed = time.perf_counter() - start
+        data = response.get_json() or {}
+        return response.status_code, elapsed, data.get('ai_generated', False)
+
+    print(f"Sending {args.requests} requests with concurrency {args.concurrency}...")
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, range(args.requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [elapsed for _, elapsed, _ in results]
+    errors = sum(1 for status, _, _ in results if status != 200)
+    ai_generated = sum(1 for _, _, generated in results if generated)
+
+    print("=" * 60)
+    print(f"Throughput:   {args.requests / wall:.1f} req/s")
+    print(f"Latency p50:  {percentile(latencies, 50) * 1000:.0f} ms")
+    print(f"Latency p95:  {percentile(latencies, 95) * 1000:.0f} ms")
+    print(f"Latency p99:  {percentile(latencies, 99) * 1000:.0f} ms")
+    print(f"Latency max:  {max(latencies) * 1000:.0f} ms")
+    print(f"HTTP errors:  {errors}")
+    print(f"AI generated: {ai_generated}/{args.requests} (rest used fallback)")
+    print("=" * 60)
+    print(client.get('/api/metrics').get_json())
+
+    crisis_before = client.get('/api/metrics').get_json()['gemini_quota']['crisis_admitted']
+    client.post('/api/analyze/text', json={'text': CRISIS_TEXT})
+    crisis_after = client.get('/api/metrics').get_json()['gemini_quota']['crisis_admitted']
+    if crisis_after <= crisis_before:
+        print("❌ Suicidal text was not admitted at crisis priority")
+        sys.exit(1)
+    print("✅ Suicidal text admitted at crisis priority")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+oEmbed parser benchmark
+Checks that the streaming tokenizer in ContentParser returns exactly what the
+BeautifulSoup path returns for saved oEmbed payloads, then times both
+(tests/test_parsers.py runs the same golden checks under pytest)
+
+Usage:
+    python parser_benchmark.py --iterations 2000
+"""
+
+import sys
+import time
+import argparse
+
+from utils.parsers import ContentParser
+
+# Representative oEmbed `html` fields, plus markup BeautifulSoup has to repair
+PAYLOADS = {
+    'twitter': (
+        '<blockquote class="twitter-tweet"><p lang="en" dir="ltr">Some days are harder than others. '
+        'Reminder to check in on your friends 💙 <a href="https://twitter.com/hashtag/MentalHealth?src=hash'
+        '&amp;ref_src=twsrc%5Etfw">#MentalHealth</a> <a href="https://t.co/abc123">pic.twitter.com/abc123</a>'
+        '</p>&mdash; Jane Doe (@janedoe) <a href="https://twitter.com/janedoe/status/1234567890123456789'
+        '?ref_src=twsrc%5Etfw">March 3, 2024</a></blockquote>\n'
+        '<script async src="https://platform.twitter.com/widgets.js" charset="utf-8"></script>\n'
+    ),
+    'twitter_entities': (
+        '<blockquote class="twitter-tweet" data-dnt="true"><p lang="en" dir="ltr">Q&amp;A tonight:<br>'
+        '&quot;What helps when you can&#39;t sleep?&quot;<br><br>Reply below ⬇️ &lt;3</p>&mdash; '
+        'Wellness Hub (@wellnesshub) <a href="https://twitter.com/wellnesshub/status/1">May 1, 2024</a>'
+        '</blockquote>\n<script async src="https://platform.twitter.com/widgets.js" charset="utf-8"></script>\n'
+    ),
+    'instagram': (
+        '<blockquote class="instagram-media" data-instgrm-captioned data-instgrm-permalink='
+        '"https://www.instagram.com/p/CxY_1abc/?utm_source=ig_embed" data-instgrm-version="14" style=" '
+        'background:#FFF; border:0; margin: 1px;"><div style="padding:16px;"> <a href="https://www.instagram.com'
+        '/p/CxY_1abc/" style=" background:#FFFFFF; line-height:0;" target="_blank"> <div style=" display: flex;">'
+        ' <div style="background-color: #F4F4F4; border-radius: 50%;"></div></div><div style="padding: 19% 0;">'
+        '</div> <div style="display:block; height:50px;"><svg width="50px" height="50px" viewBox="0 0 60 60" '
+        'version="1.1"><g stroke="none" fill="none"><path d="M556.869,30.41"></path></g></svg></div>'
+        '<div style="padding-top: 8px;"> <div style=" color:#3897f0;"> View this post on Instagram</div></div>'
+        '</a><p style=" color:#c9c8cd; margin:8px 0 0 0;"><a href="https://www.instagram.com/p/CxY_1abc/" '
+        'style=" color:#c9c8cd;" target="_blank">A post shared by Sam (@sam.draws)</a></p></div></blockquote>\n'
+        '<script async src="//www.instagram.com/embed.js"></script>'
+    ),
+    'facebook': (
+        '<div id="fb-root"></div>\n<script async="1" defer="1" crossorigin="anonymous" '
+        'src="https://connect.facebook.net/en_US/sdk.js#xfbml=1&amp;version=v18.0"></script>'
+        '<div class="fb-post" data-href="https://www.facebook.com/page.name/posts/123" data-width="552">'
+        '<blockquote cite="https://www.facebook.com/page.name/posts/123" class="fb-xfbml-parse-ignore">'
+        '<p>Taking a break from social media this week.\nBack soon &#x2764;&#xfe0f;</p>Posted by '
+        '<a href="https://www.facebook.com/page.name">Page Name</a> on&nbsp;<a href="https://www.facebook.com'
+        '/page.name/posts/123">Tuesday, April 2, 2024</a></blockquote></div>'
+    ),
+    'div_only': (
+        '<div class="embed"><span>Caption without a blockquote</span><!-- tracking --> <em>still text</em>'
+        '<style>.x{color:red}</style></div><div>second div</div>'
+    ),
+    'stray_lt': '<blockquote><p>1<2 and 3 > 2 &amp; a<b</p></blockquote>',
+    'unclosed_p': '<blockquote><p>first<p>second</blockquote><script>var x = "<p>";</script>',
+    'stray_end_tag': '<div><blockquote>quote</div> trailing</blockquote>',
+    'unclosed_blockquote': '<div>outer<blockquote>never closed',
+    'plain_text': 'just text, no markup',
+    'empty_elements': '<blockquote></blockquote><div> </div>',
+    'cdata': '<![CDATA[x]]><p>y</p><blockquote>a<![CDATA[b]]>c<![if !IE]>d</blockquote>',
+    'unknown_entity': '&unknown;',
+    'entities': '<blockquote>&amp b &copy &notit; &lang; &#60;&#x3C; &#0; &#150; &#xD800; &#xZZ;</blockquote>',
+}
+
+CHECKS = {
+    'twitter_text': (ContentParser.parse_twitter_oembed_html,
+                     lambda html: ' '.join(ContentParser._soup_document_text(html).split())),
+    'embed_text': (ContentParser.parse_oembed_embed_text, ContentParser._soup_embed_text),
+}
+
+
+def timed(fn, html, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(html)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the oEmbed tokenizer against BeautifulSoup')
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    mismatches = []
+    for check, (fast, soup) in CHECKS.items():
+        for name, html in PAYLOADS.items():
+            expected, actual = soup(html), fast(html)
+            if expected != actual:
+                mismatches.append(f"{check}/{name}: expected {expected!r}, got {actual!r}")
+
+    print("=" * 60)
+    print(f"{'payload':<22}{'check':<14}{'soup us':>10}{'fast us':>10}{'speedup':>9}")
+    print("=" * 60)
+    for name in ('twitter', 'twitter_entities', 'instagram', 'facebook'):
+        check = 'twitter_text' if name.startswith('twitter') else 'embed_text'
+        fast, soup = CHECKS[check]
+        soup_us = timed(soup, PAYLOADS[name], args.iterations)
+        fast_us = timed(fast, PAYLOADS[name], args.iterations)
+        print(f"{name:<22}{check:<14}{soup_us:>10.1f}{fast_us:>10.1f}{soup_us / fast_us:>8.1f}x")
+    print("=" * 60)
+
+    for mismatch in mismatches:
+        print(f"❌ {mismatch}")
+    if mismatches:
+        sys.exit(1)
+
+    print(f"✅ Tokenizer matches BeautifulSoup on {len(PAYLOADS) * len(CHECKS)} payload checks")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,23 +4,80 @@ Uses Gemini 1.5 Flash for fast, FREE, personalized suggestions
 """
 import os
 import json
-import google.generativeai as genai
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from services.recommendation_cache import RecommendationCache
+from services.single_flight import SingleFlight
+from services.hedging import HedgedExecutor
+from services.circuit_breaker import CircuitBreaker
+from services.quota_scheduler import QuotaScheduler
+from services.recommendation_index import RecommendationIndex
+from services.incremental_json import IncrementalRecommendationParser
+from services.prompt_budget import PromptBudget, TokenAccounting, estimate_tokens
+
 load_dotenv()
 
 class AIRecommendationService:
     def __init__(self):
         self.api_key = os.getenv('GOOGLE_API_KEY')
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
-            print("✓ Google Gemini AI service initialized")
-        else:
+        self.backend = os.getenv('GEMINI_BACKEND', 'google').lower()
+        self.model_name = 'gemini-2.5-flash'
+        self.temperature = 0.7
+        self.budget = PromptBudget()
+        self.max_output_tokens = self.budget.max_output_tokens
+        self.accounting = TokenAccounting()
+        self.in_flight = SingleFlight()
+        self.hedger = HedgedExecutor()
+        self.breaker = CircuitBreaker('gemini')
+        self.quota = QuotaScheduler()
+        self.timeout = float(os.getenv('GEMINI_TIMEOUT', '15'))
+        self.batch_concurrency = int(os.getenv('GEMINI_BATCH_CONCURRENCY', '4'))
+        self._model = None
+        self._model_lock = threading.Lock()
+        
+        if self.backend == 'stub':
+            # Offline stand-in for load/fault testing - never touches the persistent cache
+            from services.gemini_stub import StubGenerativeModel
+            self.model_name = 'gemini-stub'
+            self._model = StubGenerativeModel(self.model_name)
+            self.cache = RecommendationCache(path=':memory:')
+            self.index = RecommendationIndex()
+            print("✓ Gemini stub backend initialized (GEMINI_BACKEND=stub)")
+            return
+        
+        self.cache = RecommendationCache()
+        self.index = RecommendationIndex()
+        
+        if not self.api_key:
             print("⚠️  GOOGLE_API_KEY not configured - using fallback recommendations")
-            self.model = None
+    
+    @property
+    def configured(self):
+        """True if recommendations can be generated (without creating the Gemini client)"""
+        return self._model is not None or bool(self.api_key)
+    
+    @property
+    def model(self):
+        """
+        Gemini client, created on first use
         
-    def generate_recommendations(self, text, sentiment, confidence, emotions, concerns, tone):
+        google.generativeai takes longer to import than the rest of the backend
+        combined, so it is only loaded once a recommendation is actually requested
+        """
+        if self._model is None and self.api_key:
+            with self._model_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model_name)
+                    print("✓ Google Gemini AI service initialized")
+        return self._model
+        
+    def generate_recommendations(self, text, sentiment, confidence, emotions, concerns, tone,
+                                 salient_keywords=None, deadline=None):
         """
         Generate personalized mental health recommendations using Google Gemini AI
         
@@ -31,6 +88,9 @@ class AIRecommendationService:
             emotions: List of detected emotions
             concerns: List of specific concerns
             tone: Detected tone
+            salient_keywords: Keyword hits used to pick sentences when text exceeds the input budget
+            deadline: Absolute time.monotonic() by which the call must finish
+                      (defaults to GEMINI_TIMEOUT seconds from now)
             
         Returns:
             {
@@ -39,80 +99,515 @@ class AIRecommendationService:
                 'ai_generated': True/False
             }
         """
-        if not self.api_key or not self.model:
+        if not self.model:
             print("⚠️  GOOGLE_API_KEY not configured")
             return None
         
         # Generate AI recommendations for ALL content
         # AI reads the actual TEXT, not just the labels, so it can detect nuances
+        prompt, cache_key, trimmed = self._prepare(
+            text, sentiment, confidence, emotions, concerns, tone, salient_keywords
+        )
+        
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
+        
+        request = {
+            'text': text, 'sentiment': sentiment, 'confidence': confidence, 'emotions': emotions,
+            'concerns': concerns, 'tone': tone, 'salient_keywords': salient_keywords
+        }
+        
+        # Close matches to an earlier answer are served from the local index
+        retrieved = self._retrieve(request)
+        if retrieved:
+            return retrieved
+        
+        # Concurrent identical requests (e.g. a viral post) share one Gemini call
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+        
+        priority = QuotaScheduler.CRISIS if self.is_crisis(sentiment, emotions, tone) else QuotaScheduler.ROUTINE
+        
+        def generate():
+            result = self._generate_uncached(prompt, cache_key, deadline, trimmed, priority)
+            self._index_result(result, request)
+            return result
+        
+        return self.in_flight.do(cache_key, generate)
+    
+    def stream_recommendations(self, text, sentiment, confidence, emotions, concerns, tone,
+                               salient_keywords=None, deadline=None):
+        """
+        Stream recommendations from Gemini, yielding each suggestion as soon as it is complete
+        
+        Args:
+            Same as generate_recommendations
+            
+        Yields:
+            ('suggestion', dict) for each suggestion object as it closes, then
+            ('complete', result) with the full generate_recommendations result,
+            or ('complete', None) if Gemini is unavailable or the output is unusable
+        """
+        if not self.model:
+            yield 'complete', None
+            return
+        
+        prompt, cache_key, trimmed = self._prepare(
+            text, sentiment, confidence, emotions, concerns, tone, salient_keywords
+        )
+        
+        request = {
+            'text': text, 'sentiment': sentiment, 'confidence': confidence, 'emotions': emotions,
+            'concerns': concerns, 'tone': tone, 'salient_keywords': salient_keywords
+        }
         
-        # Create AI prompt with full text for better analysis
-        prompt = self._create_prompt(text, sentiment, confidence, emotions, concerns, tone)
+        cached = self.cache.get(cache_key) or self._retrieve(request)
+        if cached:
+            for suggestion in cached.get('suggestions', []):
+                yield 'suggestion', suggestion
+            yield 'complete', cached
+            return
+        
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+        
+        priority = QuotaScheduler.CRISIS if self.is_crisis(sentiment, emotions, tone) else QuotaScheduler.ROUTINE
+        reserved = self._acquire_quota(prompt, self.max_output_tokens, deadline, priority)
+        if reserved is None:
+            yield 'complete', None
+            return
+        
+        parser = IncrementalRecommendationParser()
+        start = time.monotonic()
+        last_chunk = None
+        blocked = False
+        settled = False
+        recorded = False
         
         try:
-            from google.generativeai.types import HarmCategory, HarmBlockThreshold
-            
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=2000
-                ),
-                safety_settings={
-                    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE
-                }
-            )
+            try:
+                chunks = self.model.generate_content(
+                    prompt,
+                    stream=True,
+                    **self._request_kwargs(max(0.1, deadline - time.monotonic()))
+                )
+                
+                for chunk in chunks:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError('Gemini stream exceeded its deadline')
+                    
+                    last_chunk = chunk
+                    if not chunk.parts:
+                        if self._safety_blocked(chunk):
+                            blocked = True
+                            break
+                        continue
+                    
+                    for key, item in parser.feed(chunk.text):
+                        if key == 'suggestions':
+                            yield 'suggestion', item
             
-            # Extract text from response
-            if not response or not response.parts:
-                print(f"⚠️  Gemini blocked response. Finish reason: {response.candidates[0].finish_reason if response.candidates else 'unknown'}")
-                return None
+            except Exception as e:
+                if not self._safety_blocked(error=e):
+                    self.breaker.record_failure()
+                    recorded = True
+                    self._check_rate_limited(e)
+                    print(f"❌ Gemini streaming request failed: {e}")
+                    yield 'complete', None
+                    return
+                blocked = True
+            
+            # A safety block is a normal answer from a healthy upstream, not a breaker failure
+            latency = time.monotonic() - start
+            self.breaker.record_success(latency)
+            recorded = True
+            
+            # The final streamed chunk carries usage metadata for the whole response
+            prompt_tokens, output_tokens, estimated = TokenAccounting.usage_from_response(last_chunk, prompt, parser.text)
+            self.accounting.record(prompt_tokens, output_tokens, latency, trimmed=trimmed, estimated=estimated,
+                                   truncated=TokenAccounting.truncated(last_chunk))
+            self.quota.settle(reserved, prompt_tokens + output_tokens)
+            settled = True
+            
+            if blocked:
+                print("⚠️  Gemini blocked streamed response (safety filter)")
+                yield 'complete', None
+                return
             
-            # Parse JSON response - remove markdown code blocks if present
-            text = response.text.strip()
+            content = self._parse_response_text(parser.text)
+            if content is None:
+                yield 'complete', None
+                return
             
-            # Remove ```json and ``` markers
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                # Generic code block
-                parts = text.split('```')
-                if len(parts) >= 3:
-                    text = parts[1].strip()
+            result = {
+                'suggestions': content.get('suggestions', [])[:self.budget.suggestion_count],
+                'immediate_actions': content.get('immediate_actions', []),
+                'ai_generated': True
+            }
+            self.cache.set(cache_key, result)
+            self._index_result(result, request)
+            
+            yield 'complete', result
+        
+        finally:
+            if not recorded:
+                # Client disconnected mid-stream - free the half-open trial this call may hold
+                self.breaker.release_trial()
+            if not settled:
+                # Failed call, or the client disconnected mid-stream - settle on what was produced so far
+                self.quota.settle(reserved, estimate_tokens(prompt) + estimate_tokens(parser.text))
+    
+    def generate_batch_recommendations(self, items, deadline=None):
+        """
+        Generate recommendations for many analyzed texts using multi-item prompts
+        
+        Cached items are served directly. The rest are packed into batched prompts
+        sized to the prompt/output token budgets, and each Gemini response is split
+        back into per-item results.
+        
+        Args:
+            items: List of dicts with the generate_recommendations arguments
+                   (text, sentiment, confidence, emotions, concerns, tone, salient_keywords)
+            deadline: Absolute time.monotonic() by which all batches must finish
+            
+        Returns:
+            List aligned with items - each a generate_recommendations result, or None
+            where the item was missing or malformed so the caller can fall back
+        """
+        results = [None] * len(items)
+        
+        if not self.model or not items:
+            return results
+        
+        if deadline is None:
+            deadline = time.monotonic() + self.timeout
+        
+        pending = []
+        for index, item in enumerate(items):
+            _, cache_key, _ = self._prepare(**item)
+            cached = self.cache.get(cache_key)
+            
+            if cached:
+                results[index] = cached
+            elif self.is_crisis(item.get('sentiment'), item.get('emotions'), item.get('tone')):
+                # Crisis items get their own call so they queue at crisis priority
+                results[index] = self.generate_recommendations(**item, deadline=deadline)
+            else:
+                results[index] = self._retrieve(item)
+                if results[index] is None:
+                    pending.append((index, item, cache_key))
+        
+        batches = self._pack_batches(pending)
+        if not batches:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(self.batch_concurrency, len(batches))) as pool:
+            futures = [pool.submit(self._generate_batch_uncached, batch, deadline) for batch in batches]
+            for batch, future in zip(batches, futures):
+                for (index, _, _), result in zip(batch, future.result()):
+                    results[index] = result
+        
+        return results
+    
+    def _pack_batches(self, pending):
+        """Group pending items into batches that fit the prompt and output token limits"""
+        batches = []
+        current = []
+        current_tokens = estimate_tokens(self._create_batch_prompt([]))
+        
+        for entry in pending:
+            _, item, _ = entry
+            item_tokens = estimate_tokens(self._format_batch_item(0, item))
+            
+            fits = (
+                len(current) < self.budget.batch_max_items
+                and current_tokens + item_tokens <= self.budget.batch_max_prompt_tokens
+                and self.budget.batch_output_tokens(len(current) + 1) <= self.budget.batch_max_output_tokens
+            )
             
-            # Parse JSON with better error handling
+            if current and not fits:
+                batches.append(current)
+                current = []
+                current_tokens = estimate_tokens(self._create_batch_prompt([]))
+            
+            current.append(entry)
+            current_tokens += item_tokens
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _generate_batch_uncached(self, batch, deadline):
+        """Run one multi-item prompt and split its output back into per-item results"""
+        results = [None] * len(batch)
+        
+        prompt = self._create_batch_prompt([item for _, item, _ in batch])
+        max_output_tokens = self.budget.batch_output_tokens(len(batch))
+        
+        reserved = self._acquire_quota(prompt, max_output_tokens, deadline, QuotaScheduler.ROUTINE)
+        if reserved is None:
+            return results
+        
+        try:
+            def attempt(timeout):
+                return self.model.generate_content(prompt, **self._request_kwargs(timeout, max_output_tokens))
+            
+            start = time.monotonic()
             try:
-                content = json.loads(text)
-            except json.JSONDecodeError as je:
-                print(f"❌ Gemini API request failed: {str(je)}")
-                print(f"⚠️  Raw response (first 800 chars):\n{text[:800]}")
+                # A hedge is a second upstream request, so it needs its own quota reservation
+                # (kept in full - the losing call's usage is never reported)
+                response = self.hedger.call(attempt, deadline, admit_hedge=lambda: self.quota.try_acquire(reserved, QuotaScheduler.ROUTINE))
+            except Exception as e:
+                self.breaker.record_failure()
+                self._check_rate_limited(e)
+                raise
+            latency = time.monotonic() - start
+            self.breaker.record_success(latency)
+            
+            output_text = response.text if response and response.parts else ''
+            prompt_tokens, output_tokens, estimated = TokenAccounting.usage_from_response(response, prompt, output_text)
+            self.accounting.record(prompt_tokens, output_tokens, latency, estimated=estimated,
+                                   truncated=TokenAccounting.truncated(response))
+            self.quota.settle(reserved, prompt_tokens + output_tokens)
+            
+            content = self._parse_response_text(output_text) if output_text else None
+            if not isinstance(content, dict):
+                return results
+            
+            by_index = {}
+            for entry in content.get('items', []):
+                if isinstance(entry, dict) and isinstance(entry.get('index'), int):
+                    by_index[entry['index']] = entry
+            
+            for position, (_, item, cache_key) in enumerate(batch):
+                entry = by_index.get(position)
+                suggestions = entry.get('suggestions') if entry else None
+                
+                if not isinstance(suggestions, list) or not suggestions:
+                    # Missing or malformed item - caller uses its fallback
+                    continue
                 
-                # Try to fix common JSON issues
-                try:
-                    # Attempt to fix unescaped quotes and newlines
-                    import re
-                    # Replace unescaped newlines in strings
-                    fixed_text = text.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                    content = json.loads(fixed_text)
-                    print("✓ JSON fixed and parsed successfully")
-                except:
-                    # If still fails, return fallback
-                    print("⚠️  Using fallback recommendations due to JSON parse error")
-                    return None
+                results[position] = {
+                    'suggestions': suggestions[:self.budget.suggestion_count],
+                    'immediate_actions': entry.get('immediate_actions', []) if isinstance(entry.get('immediate_actions'), list) else [],
+                    'ai_generated': True
+                }
+                self.cache.set(cache_key, results[position])
+                self._index_result(results[position], item)
+            
+            missing = sum(1 for result in results if result is None)
+            if missing:
+                print(f"⚠️  Gemini batch returned {len(batch) - missing}/{len(batch)} usable items")
             
+            return results
+        
+        except Exception as e:
+            print(f"❌ Gemini batch request failed: {e}")
+            return results
+    
+    def _prepare(self, text, sentiment, confidence, emotions, concerns, tone, salient_keywords=None):
+        """Build the prompt and its cache key, trimming text that exceeds the input budget"""
+        trimmed_text = self.budget.trim_input(text, salient_keywords)
+        trimmed = trimmed_text != text
+        
+        # Create AI prompt with the (salient part of the) text for better analysis
+        prompt = self._create_prompt(trimmed_text, sentiment, confidence, emotions, concerns, tone)
+        
+        # Identical prompts (e.g. every crisis prompt with the same labels) are served from disk
+        cache_key = RecommendationCache.make_key(
+            self.model_name,
+            prompt,
+            temperature=self.temperature,
+            max_output_tokens=self.max_output_tokens
+        )
+        
+        return prompt, cache_key, trimmed
+    
+    def _request_kwargs(self, timeout, max_output_tokens=None):
+        """Generation settings shared by every Gemini call"""
+        max_output_tokens = max_output_tokens or self.max_output_tokens
+        
+        if self.backend == 'stub':
+            # Plain dicts so the stub runs without google.generativeai installed
             return {
-                'suggestions': content.get('suggestions', []),
+                'generation_config': {
+                    'temperature': self.temperature,
+                    'max_output_tokens': max_output_tokens
+                },
+                'safety_settings': {
+                    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+                    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+                    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+                    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE'
+                },
+                'request_options': {'timeout': timeout}
+            }
+        
+        import google.generativeai as genai
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+        
+        return {
+            'generation_config': genai.GenerationConfig(
+                temperature=self.temperature,
+                max_output_tokens=max_output_tokens
+            ),
+            'safety_settings': {
+                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE
+            },
+            'request_options': {'timeout': timeout}
+        }
+    
+    def _retrieve(self, request):
+        """Top suggestions from the local index, or None if the match is not confident"""
+        if self.is_crisis(request.get('sentiment'), request.get('emotions'), request.get('tone')):
+            # Crisis texts always get an answer written for them
+            return None
+        return self.index.search(**request, k=self.budget.suggestion_count)
+    
+    def _index_result(self, result, request):
+        """Make a fresh Gemini result retrievable - except crisis answers, which are never reused"""
+        if not self.is_crisis(request.get('sentiment'), request.get('emotions'), request.get('tone')):
+            self.index.add(result, **request)
+    
+    def _acquire_quota(self, prompt, max_output_tokens, deadline, priority):
+        """
+        Wait for request/token quota, then check the circuit breaker
+        
+        Returns:
+            Reserved token count, or None if the caller should fall back
+        """
+        reserved = estimate_tokens(prompt) + max_output_tokens
+        
+        if not self.quota.acquire(reserved, deadline, priority):
+            # Queue wait would outlast the deadline
+            return None
+        
+        if not self.breaker.allow_request():
+            # Gemini is degraded - skip the call so the caller falls back immediately
+            self.quota.release(reserved)
+            return None
+        
+        return reserved
+    
+    @staticmethod
+    def is_crisis(sentiment, emotions, tone):
+        """
+        True if the analysis flags a crisis
+        
+        The classifier only returns Normal or Stressed, so this relies on the
+        keyword flags: a 'suicidal' emotion or a 'desperate' tone
+        """
+        return sentiment == 'Crisis' or 'suicidal' in (emotions or []) or 'desperate' in (tone or [])
+    
+    @staticmethod
+    def _safety_blocked(response=None, error=None):
+        """True if Gemini's safety filter stopped the prompt or the response"""
+        if error is not None:
+            return type(error).__name__ in ('BlockedPromptException', 'StopCandidateException')
+        
+        if not response.candidates:
+            # Prompt was blocked before any candidate was generated
+            return True
+        
+        finish_reason = response.candidates[0].finish_reason
+        return getattr(finish_reason, 'name', str(finish_reason)) in ('SAFETY', 'BLOCKLIST', 'PROHIBITED_CONTENT')
+    
+    def _check_rate_limited(self, error):
+        """Tell the quota scheduler when Gemini rejected a call for quota (HTTP 429)"""
+        if type(error).__name__ == 'ResourceExhausted' or '429' in str(error):
+            self.quota.rate_limited()
+    
+    def _generate_uncached(self, prompt, cache_key, deadline, trimmed=False, priority=QuotaScheduler.ROUTINE):
+        """Call Gemini with the prompt and parse its JSON response, caching successes"""
+        reserved = self._acquire_quota(prompt, self.max_output_tokens, deadline, priority)
+        if reserved is None:
+            return None
+        
+        try:
+            def attempt(timeout):
+                # Each attempt gets the remaining budget as its own deadline
+                return self.model.generate_content(prompt, **self._request_kwargs(timeout))
+            
+            start = time.monotonic()
+            try:
+                # A hedge is a second upstream request, so it needs its own quota reservation
+                # (kept in full - the losing call's usage is never reported)
+                response = self.hedger.call(attempt, deadline, admit_hedge=lambda: self.quota.try_acquire(reserved, priority))
+            except Exception as e:
+                self.breaker.record_failure()
+                self._check_rate_limited(e)
+                raise
+            latency = time.monotonic() - start
+            self.breaker.record_success(latency)
+            
+            output_text = response.text if response and response.parts else ''
+            prompt_tokens, output_tokens, estimated = TokenAccounting.usage_from_response(response, prompt, output_text)
+            self.accounting.record(prompt_tokens, output_tokens, latency, trimmed=trimmed, estimated=estimated,
+                                   truncated=TokenAccounting.truncated(response))
+            self.quota.settle(reserved, prompt_tokens + output_tokens)
+            
+            # Extract text from response
+            if not response or not response.parts:
+                print(f"⚠️  Gemini blocked response. Finish reason: {response.candidates[0].finish_reason if response.candidates else 'unknown'}")
+                return None
+            
+            content = self._parse_response_text(response.text)
+            if content is None:
+                return None
+            
+            result = {
+                'suggestions': content.get('suggestions', [])[:self.budget.suggestion_count],
                 'immediate_actions': content.get('immediate_actions', []),
                 'ai_generated': True
             }
+            
+            self.cache.set(cache_key, result)
+            
+            return result
                 
         except Exception as e:
             print(f"❌ Gemini API request failed: {e}")
             return None
     
+    def _parse_response_text(self, text):
+        """Parse Gemini's JSON output, tolerating code fences and unescaped newlines"""
+        # Parse JSON response - remove markdown code blocks if present
+        text = text.strip()
+        
+        # Remove ```json and ``` markers
+        if '```json' in text:
+            text = text.split('```json')[1].split('```')[0].strip()
+        elif '```' in text:
+            # Generic code block
+            parts = text.split('```')
+            if len(parts) >= 3:
+                text = parts[1].strip()
+        
+        # Parse JSON with better error handling
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as je:
+            print(f"❌ Gemini API request failed: {str(je)}")
+            print(f"⚠️  Raw response (first 800 chars):\n{text[:800]}")
+            
+            # Try to fix common JSON issues
+            try:
+                # Attempt to fix unescaped quotes and newlines
+                # Replace unescaped newlines in strings
+                fixed_text = text.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+                content = json.loads(fixed_text)
+                print("✓ JSON fixed and parsed successfully")
+                return content
+            except:
+                # If still fails, return fallback
+                print("⚠️  Using fallback recommendations due to JSON parse error")
+                return None
+    
     def _create_prompt(self, text, sentiment, confidence, emotions, concerns, tone):
         """Create structured prompt for Google Gemini - AI reads the ACTUAL TEXT for context"""
         
@@ -136,7 +631,7 @@ class AIRecommendationService:
 2. If you detect heartbreak, rejection, relationship issues, disappointment - address THOSE
 3. If you detect schadenfreude (joy at others' misfortune) - guide toward healthier mindset
 4. If genuinely positive - help maintain and amplify it
-5. Provide 2-3 specific, actionable recommendations based on what YOU detect
+5. Provide {self.budget.suggestion_phrase} specific, actionable recommendations based on what YOU detect
 
 Return ONLY valid JSON with NO markdown formatting. CRITICAL: Escape all quotes and special characters properly in strings:
 {{
@@ -157,6 +652,56 @@ Return ONLY valid JSON with NO markdown formatting. CRITICAL: Escape all quotes
 IMPORTANT: 
 - Use \\\" for quotes inside strings
 - Use \\n for line breaks
+- Keep all text on single lines within JSON strings"""
+    
+    def _format_batch_item(self, index, item):
+        """One numbered entry of a multi-item prompt"""
+        text = self.budget.trim_input(item['text'], item.get('salient_keywords'))
+        emotions = item.get('emotions') or []
+        concerns = item.get('concerns') or []
+        
+        return f"""### Item {index}
+**Their actual text:** {json.dumps(text)}
+**AI model detected:** {item.get('sentiment')}
+**Emotions flagged:** {', '.join(emotions) if emotions else 'None flagged'}
+**Concerns flagged:** {', '.join(concerns) if concerns else 'None flagged'}
+"""
+    
+    def _create_batch_prompt(self, items):
+        """Prompt covering several texts, answered with one indexed JSON object per item"""
+        entries = '\n'.join(self._format_batch_item(index, item) for index, item in enumerate(items))
+        
+        return f"""Analyze each person's emotional state from their actual words and provide personalized recommendations for EACH item separately.
+
+{entries}
+**Your task for every item:**
+1. Read the actual text to understand the TRUE emotional state (the detected label may be wrong)
+2. Address heartbreak, rejection, disappointment or schadenfreude if present; if genuinely positive, help maintain it
+3. Provide {self.budget.suggestion_phrase} specific, actionable recommendations based on what YOU detect
+
+Return ONLY valid JSON with NO markdown formatting, one entry per item using the item's number as "index":
+{{
+  "items": [
+    {{
+      "index": 0,
+      "suggestions": [
+        {{
+          "title": "Specific to their situation",
+          "description": "Actionable steps addressing their ACTUAL emotional state",
+          "rationale": "Why this helps for THEIR specific situation"
+        }}
+      ],
+      "immediate_actions": [
+        "Action addressing their real emotion",
+        "Practical step they can do now"
+      ]
+    }}
+  ]
+}}
+
+IMPORTANT: 
+- Include every item index exactly once
+- Use \\\" for quotes inside strings
 - Keep all text on single lines within JSON strings"""
     
     def _create_crisis_prompt(self, emotions, concerns, tone):
@@ -168,7 +713,7 @@ Context:
 - Emotions: {', '.join(emotions) if emotions else 'High distress'}
 - Concerns: {', '.join(concerns) if concerns else 'Intense emotions'}
 
-Provide 2-3 immediate calming techniques focusing on breathing, grounding, and self-soothing.
+Provide {self.budget.suggestion_phrase} immediate calming techniques focusing on breathing, grounding, and self-soothing.
 
 Return ONLY valid JSON with NO markdown formatting. CRITICAL: Escape all quotes and special characters properly:
 {{
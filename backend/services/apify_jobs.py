@@ -0,0 +1,314 @@
+"""
+Apify Scrape Jobs
+Starts Instagram scraper runs without waiting for them, tracks every active
+run from one monitor thread, and lets clients poll or stream the outcome -
+so a scrape that takes tens of seconds never holds a request worker
+"""
+
+import os
+import time
+import uuid
+import threading
+from typing import Dict, Optional
+
+from utils.url_canonicalizer import canonicalize
+
+# Apify run states that will not change again
+FINISHED_STATUSES = {'SUCCEEDED', 'FAILED', 'ABORTED', 'TIMED-OUT'}
+
+
+class ApifyJobService:
+    """Track Apify actor runs in the background and cache what they return"""
+
+    def __init__(self, extractor, cache=None):
+        """
+        Args:
+            extractor: InstagramExtractor supplying the token, actor, run input and parser
+            cache: ExtractionCache completed results are written to
+        """
+        self.extractor = extractor
+        self.cache = cache
+        self.poll_interval = float(os.getenv('APIFY_JOB_POLL_INTERVAL', '2'))
+        self.timeout = float(os.getenv('APIFY_JOB_TIMEOUT', '180'))
+        self.ttl = float(os.getenv('APIFY_JOB_TTL', '600'))
+
+        self._client = None
+        self._jobs = {}
+        self._active = {}        # canonical key -> job id, so one post is only scraped once at a time
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._monitor = None
+        self._stats = {
+            'submitted': 0, 'deduplicated': 0, 'cache_hits': 0, 'succeeded': 0, 'failed': 0,
+            'timed_out': 0, 'poll_errors': 0, 'total_run_seconds': 0.0, 'total_cost_usd': 0.0,
+            'total_compute_units': 0.0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.extractor.apify_token)
+
+    @property
+    def client(self):
+        """Apify client created on first use"""
+        if self._client is None:
+            from apify_client import ApifyClient
+            self._client = ApifyClient(self.extractor.apify_token)
+        return self._client
+
+    def submit(self, url: str) -> Dict:
+        """
+        Start a scrape for an Instagram URL without waiting for it
+
+        Args:
+            url: Instagram post URL
+
+        Returns:
+            Job snapshot - already 'complete' on a cache hit, otherwise 'running'
+            ('failed' if the run could not be started)
+        """
+        self._prune()
+        target = canonicalize(url)
+        key = target.key if target else None
+
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None and 'error' not in cached:
+            job = self._new_job(url, key)
+            self._finish(job, 'complete', cached)
+            with self._lock:
+                self._stats['cache_hits'] += 1
+                self._jobs[job['id']] = job
+            return self._snapshot(job)
+
+        with self._lock:
+            job_id = self._active.get(key)
+            if job_id in self._jobs:
+                self._stats['deduplicated'] += 1
+                return self._snapshot(self._jobs[job_id])
+
+        job = self._new_job(url, key)
+
+        try:
+            run = self.client.actor(self.extractor.apify_actor).start(
+                run_input=self.extractor._apify_run_input(target.url if target else url)
+            )
+        except ImportError:
+            self._finish(job, 'failed', {
+                'error': 'Apify client not installed. Run: pip install apify-client',
+                'platform': 'Instagram'
+            })
+        except Exception as e:
+            print(f"❌ Apify run could not be started: {str(e)}")
+            self._finish(job, 'failed', {
+                'error': f'Apify scraping failed: {str(e)}',
+                'platform': 'Instagram'
+            })
+        else:
+            job['run_id'] = run['id']
+            job['dataset_id'] = run.get('defaultDatasetId')
+            job['run_status'] = run.get('status')
+            print(f"Started Apify run {run['id']} for {url} (job {job['id']})")
+
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._stats['submitted'] += 1
+            if job['status'] == 'running':
+                self._active[key] = job['id']
+                self._start_monitor()
+                self._wake.notify_all()
+
+        return self._snapshot(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Current state of a job, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """
+        Block until a job finishes or the wait timeout elapses
+
+        Args:
+            job_id: Job ID returned by submit()
+            timeout: Maximum seconds to wait during this call
+
+        Returns:
+            Job snapshot, or None if the job is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if not job:
+            return None
+
+        job['done'].wait(timeout)
+        return self.get(job_id)
+
+    def _new_job(self, url, key):
+        return {
+            'id': uuid.uuid4().hex,
+            'url': url,
+            'key': key,
+            'created': time.time(),
+            'started': time.monotonic(),
+            'status': 'running',
+            'run_id': None,
+            'dataset_id': None,
+            'run_status': None,
+            'result': None,
+            'cost_usd': None,
+            'compute_units': None,
+            'run_seconds': None,
+            'done': threading.Event()
+        }
+
+    def _start_monitor(self):
+        """Start the monitor thread if it is not running (caller holds the lock)"""
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._monitor_runs, name='apify-monitor', daemon=True)
+            self._monitor.start()
+
+    def _monitor_runs(self):
+        """Poll every running job until none are left"""
+        while True:
+            with self._lock:
+                running = [job for job in self._jobs.values() if job['status'] == 'running']
+                if not running:
+                    self._monitor = None
+                    return
+
+            for job in running:
+                self._poll(job)
+
+            with self._lock:
+                self._wake.wait(self.poll_interval)
+
+    def _poll(self, job):
+        """Check one run and settle the job if the run has finished or overrun"""
+        try:
+            run = self.client.run(job['run_id']).get()
+        except Exception as e:
+            with self._lock:
+                self._stats['poll_errors'] += 1
+            print(f"⚠️  Could not poll Apify run {job['run_id']}: {e}")
+            run = None
+
+        if run is not None:
+            job['run_status'] = run.get('status')
+            self._record_usage(job, run)
+
+            if job['run_status'] in FINISHED_STATUSES:
+                self._complete(job, run)
+                return
+
+        if time.monotonic() - job['started'] > self.timeout:
+            try:
+                self.client.run(job['run_id']).abort()
+            except Exception as e:
+                print(f"⚠️  Could not abort Apify run {job['run_id']}: {e}")
+            print(f"⚠️  Apify job {job['id']} timed out after {self.timeout:.0f}s")
+            self._finish(job, 'timeout', {
+                'error': f'Apify scraping timed out after {self.timeout:.0f}s',
+                'platform': 'Instagram'
+            })
+
+    def _complete(self, job, run):
+        """Fetch the dataset of a finished run and resolve the job"""
+        if job['run_status'] != 'SUCCEEDED':
+            self._finish(job, 'failed', {
+                'error': f"Apify scraping failed: run {job['run_status'].lower()}",
+                'platform': 'Instagram'
+            })
+            return
+
+        try:
+            items = self.client.dataset(run.get('defaultDatasetId') or job['dataset_id']).list_items(limit=1).items
+            result = self.extractor._parse_apify_results(items, job['url'])
+        except Exception as e:
+            result = {
+                'error': f'Apify scraping failed: {str(e)}',
+                'platform': 'Instagram'
+            }
+
+        if 'error' in result:
+            self._finish(job, 'failed', result)
+        else:
+            if self.cache is not None:
+                self.cache.set(job['key'], 'instagram', result)
+            self._finish(job, 'complete', result)
+
+    @staticmethod
+    def _record_usage(job, run):
+        """Copy cost and runtime from the Apify run record"""
+        if run.get('usageTotalUsd') is not None:
+            job['cost_usd'] = run['usageTotalUsd']
+        stats = run.get('stats') or {}
+        if stats.get('computeUnits') is not None:
+            job['compute_units'] = stats['computeUnits']
+        if stats.get('runTimeSecs') is not None:
+            job['run_seconds'] = stats['runTimeSecs']
+
+    def _finish(self, job, status, result):
+        """Store the outcome, update counters and wake waiters"""
+        with self._lock:
+            if job['status'] != 'running' and job['result'] is not None:
+                return
+
+            job['status'] = status
+            job['result'] = result
+            job['latency_ms'] = int((time.monotonic() - job['started']) * 1000)
+            if self._active.get(job['key']) == job['id']:
+                del self._active[job['key']]
+
+            if job['run_id'] is not None:
+                counter = {'complete': 'succeeded', 'timeout': 'timed_out'}.get(status, 'failed')
+                self._stats[counter] += 1
+                self._stats['total_run_seconds'] += job['latency_ms'] / 1000
+                self._stats['total_cost_usd'] += job['cost_usd'] or 0.0
+                self._stats['total_compute_units'] += job['compute_units'] or 0.0
+
+        job['done'].set()
+
+    def _snapshot(self, job: Dict) -> Dict:
+        """Build the public view of a job"""
+        snapshot = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'url': job['url'],
+            'run_status': job['run_status'],
+            'elapsed_ms': job.get('latency_ms', int((time.monotonic() - job['started']) * 1000)),
+            'cost_usd': job['cost_usd'],
+            'compute_units': job['compute_units']
+        }
+
+        if job['result'] is not None:
+            if 'error' in job['result']:
+                snapshot['error'] = job['result']['error']
+            else:
+                snapshot['data'] = job['result']
+
+        return snapshot
+
+    def _prune(self):
+        """Forget finished jobs older than the configured TTL"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['created'] < cutoff and job['status'] != 'running'
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        """Return job counters, average run latency and credit spend"""
+        with self._lock:
+            stats = dict(self._stats)
+            finished = stats['succeeded'] + stats['failed'] + stats['timed_out']
+            stats['avg_run_ms'] = round(stats.pop('total_run_seconds') / finished * 1000, 1) if finished else 0.0
+            stats['avg_cost_usd'] = round(stats['total_cost_usd'] / finished, 4) if finished else 0.0
+            stats['total_cost_usd'] = round(stats['total_cost_usd'], 4)
+            stats['total_compute_units'] = round(stats['total_compute_units'], 4)
+            stats['running'] = sum(1 for job in self._jobs.values() if job['status'] == 'running')
+            stats['enabled'] = self.enabled
+            return stats
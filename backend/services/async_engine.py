@@ -0,0 +1,66 @@
+"""
+Async Engine
+A single background event loop that synchronous code (Flask views) submits
+coroutines to, so async extractions share one loop and its pooled sessions
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict
+
+
+class AsyncEngine:
+    """Runs an asyncio event loop in a daemon thread, started on first use"""
+
+    def __init__(self, name: str = 'async-engine'):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+        self._in_flight = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the engine loop and return a concurrent.futures.Future"""
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._in_flight += 1
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the engine loop and block until it finishes"""
+        return self.submit(coro).result(timeout)
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats['failed'] += 1
+            else:
+                self._stats['completed'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = self._in_flight
+            stats['running'] = self._loop is not None and self._loop.is_running()
+            return stats
+
+
+# Global instance shared by URL extraction
+async_engine = AsyncEngine()
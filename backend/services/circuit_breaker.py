@@ -0,0 +1,135 @@
+"""
+Circuit Breaker
+Stops calling a degraded upstream service after repeated errors or slow calls,
+then probes it with a limited number of half-open trial calls
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict
+
+
+class CircuitBreaker:
+    """Closed → open on failure rate, open → half-open after a cooldown, half-open → closed on successful trials"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str):
+        self.name = name
+        self.window = int(os.getenv('CIRCUIT_WINDOW', '20'))
+        self.min_calls = int(os.getenv('CIRCUIT_MIN_CALLS', '5'))
+        self.failure_rate = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+        self.slow_call_seconds = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '10'))
+        self.open_seconds = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+        self.half_open_trials = int(os.getenv('CIRCUIT_HALF_OPEN_TRIALS', '1'))
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._outcomes = deque(maxlen=self.window)
+        self._opened_at = None
+        self._trials_started = 0
+        self._trials_succeeded = 0
+        self._stats = {'opened': 0, 'short_circuited': 0, 'successes': 0, 'failures': 0, 'slow_calls': 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go upstream now"""
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.HALF_OPEN and self._trials_started < self.half_open_trials:
+                self._trials_started += 1
+                return True
+
+            self._stats['short_circuited'] += 1
+            return False
+
+    def record_success(self, latency: float):
+        """Record a completed call; calls slower than the threshold count as failures"""
+        if latency > self.slow_call_seconds:
+            with self._lock:
+                self._stats['slow_calls'] += 1
+            self.record_failure()
+            return
+
+        with self._lock:
+            self._stats['successes'] += 1
+
+            if self._state == self.HALF_OPEN:
+                self._trials_succeeded += 1
+                if self._trials_succeeded >= self.half_open_trials:
+                    print(f"✓ Circuit '{self.name}' closed - upstream recovered")
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                return
+
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed call and open the circuit if the failure rate is too high"""
+        with self._lock:
+            self._stats['failures'] += 1
+
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+
+            if (self._state == self.CLOSED and len(self._outcomes) >= self.min_calls
+                    and failures / len(self._outcomes) >= self.failure_rate):
+                self._open()
+
+    def release_trial(self):
+        """
+        Give back a half-open trial whose call ended without an outcome
+
+        e.g. the client disconnected mid-stream. Without this the trial slot
+        stays taken and the breaker rejects every call until restart.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials_started > self._trials_succeeded:
+                self._trials_started -= 1
+
+    def _open(self):
+        """Trip the breaker (caller holds the lock)"""
+        print(f"⚠️  Circuit '{self.name}' opened - using fallback for {self.open_seconds:.0f}s")
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._stats['opened'] += 1
+
+    def _maybe_half_open(self):
+        """Move from open to half-open once the cooldown has passed (caller holds the lock)"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._trials_started = 0
+            self._trials_succeeded = 0
+
+    def stats(self) -> Dict:
+        """Return state, window failure rate and counters"""
+        with self._lock:
+            self._maybe_half_open()
+            stats = dict(self._stats)
+            stats['state'] = self._state
+            stats['window_calls'] = len(self._outcomes)
+            stats['window_failure_rate'] = (
+                round(self._outcomes.count(False) / len(self._outcomes), 4) if self._outcomes else 0.0
+            )
+            if self._state == self.OPEN:
+                stats['retry_in_seconds'] = round(
+                    max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1
+                )
+            return stats
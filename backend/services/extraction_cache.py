@@ -0,0 +1,148 @@
+"""
+Extraction Result Cache
+In-memory LRU cache in front of URL extraction so repeat lookups of the same
+post skip the network, with per-platform TTLs and short-lived caching of
+failures that would only fail the same way again
+"""
+
+import os
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# How long a successful extraction stays fresh, in seconds
+# (override with EXTRACTION_CACHE_TTL_<PLATFORM>)
+PLATFORM_TTL = {
+    'twitter': 3600,
+    'reddit': 900,
+    'instagram': 3600,
+    'threads': 3600,
+    'facebook': 3600,
+}
+
+# Failures caused by configuration, URL shape or a missing/private post - retrying
+# within the negative TTL gives the same answer. Timeouts, connection errors,
+# 429s and 5xx responses never match and are always retried.
+DETERMINISTIC_ERRORS = re.compile(
+    r'requires Meta app review'
+    r'|requires authentication'
+    r'|Authentication required'
+    r'|No access token available'
+    r'|not installed'
+    r'|Invalid \w+ URL'
+    r'|requires media ID'
+    r'|No data found'
+    r'|post not found'
+    r'|(?:request failed|Error): (?:400|401|403|404|410)\b'
+    r'|\b(?:400|401|403|404|410) (?:Client )?Error',
+    re.IGNORECASE
+)
+
+
+def is_deterministic_failure(result: Dict) -> bool:
+    """True if an extraction error would repeat on an immediate retry"""
+    error = result.get('error')
+    return isinstance(error, str) and DETERMINISTIC_ERRORS.search(error) is not None
+
+
+class ExtractionCache:
+    """Thread-safe LRU of extraction results keyed on the canonical post identity"""
+
+    def __init__(self, max_entries=None, negative_ttl=None):
+        self.enabled = os.getenv('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+        self.max_entries = int(max_entries if max_entries is not None else os.getenv('EXTRACTION_CACHE_MAX_ENTRIES', '2048'))
+        self.negative_ttl = float(negative_ttl if negative_ttl is not None else os.getenv('EXTRACTION_CACHE_NEGATIVE_TTL', '120'))
+        self.ttl = {
+            platform: float(os.getenv(f'EXTRACTION_CACHE_TTL_{platform.upper()}', str(ttl)))
+            for platform, ttl in PLATFORM_TTL.items()
+        }
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # key -> (expires, result)
+        self._stats = {
+            'hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0,
+            'writes': 0, 'negative_writes': 0, 'uncached_failures': 0, 'evictions': 0
+        }
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """Return a copy of the cached result for key, or None on a miss or expiry"""
+        if not self.enabled or key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            expires, result = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['negative_hits' if 'error' in result else 'hits'] += 1
+            return dict(result)
+
+    def set(self, key: Optional[str], platform: str, result: Dict):
+        """
+        Store an extraction result
+
+        Successes are kept for the platform TTL, deterministic failures for the
+        negative TTL, and transient failures are not stored at all.
+        """
+        if not self.enabled or key is None or not result:
+            return
+
+        if 'error' not in result:
+            ttl = self.ttl.get(platform, min(self.ttl.values()))
+            counter = 'writes'
+        elif is_deterministic_failure(result):
+            ttl = self.negative_ttl
+            counter = 'negative_writes'
+        else:
+            with self._lock:
+                self._stats['uncached_failures'] += 1
+            return
+
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(result))
+            self._entries.move_to_end(key)
+            self._stats[counter] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, key: str):
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters, hit rate and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats['hits'] + stats['negative_hits'] + stats['misses']
+            stats['hit_rate'] = round((stats['hits'] + stats['negative_hits']) / lookups, 4) if lookups else 0.0
+            stats.update({
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': dict(self.ttl),
+                'negative_ttl_seconds': self.negative_ttl
+            })
+            return stats
@@ -0,0 +1,149 @@
+"""
+Extraction Method Racing
+Launch an extractor's fallback methods concurrently (staggered by a hedge
+delay) instead of one after another, keep the first success and cancel the
+rest. Expensive methods only join once every cheap method has failed
+"""
+
+import os
+import asyncio
+import threading
+from collections import defaultdict, namedtuple
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+# method_racer reads EXTRACTION_RACE_* at import, before app.py would load .env for it
+load_dotenv()
+
+# run: zero-argument coroutine function returning a result dict (or None / raising on failure)
+# expensive: paid methods such as Apify that only start after the cheap ones fail
+RaceMethod = namedtuple('RaceMethod', ['name', 'run', 'expensive'], defaults=(False,))
+
+
+def succeeded(result) -> bool:
+    return bool(result) and 'error' not in result
+
+
+class MethodRacer:
+    """Races extraction methods and records per-method wins, failures and cancellations"""
+
+    def __init__(self):
+        self.enabled = os.getenv('EXTRACTION_RACE_ENABLED', 'false').lower() == 'true'
+        # Head start each method gets before the next one is launched (0 = launch all at once)
+        self.hedge_delay = float(os.getenv('EXTRACTION_RACE_HEDGE_DELAY', '0.25'))
+
+        self._lock = threading.Lock()
+        self._stats = {'races': 0, 'won': 0, 'all_failed': 0, 'expensive_launched': 0}
+        self._methods = defaultdict(lambda: {'launched': 0, 'wins': 0, 'failures': 0, 'cancelled': 0})
+
+    async def race(self, platform: str, methods: List[RaceMethod]) -> Optional[Dict]:
+        """
+        Run methods until one succeeds
+
+        Args:
+            platform: Platform name, used to label per-method stats
+            methods: Methods in preference order; earlier methods launch first
+
+        Returns:
+            The first successful result. If every method failed, the failure
+            of the last method in preference order - its result dict, or its
+            exception re-raised - matching what a sequential fallback chain
+            would have reported. None if there were no methods.
+        """
+        self._count('races')
+        failures = {}
+
+        for expensive in (False, True):
+            group = [m for m in methods if m.expensive == expensive]
+            if not group:
+                continue
+            if expensive:
+                self._count('expensive_launched')
+
+            result = await self._race_group(platform, group, failures)
+            if result is not None:
+                self._count('won')
+                return result
+
+        if methods:
+            self._count('all_failed')
+
+        for m in reversed(methods):
+            if m.name in failures:
+                failure = failures[m.name]
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+        return None
+
+    async def _race_group(self, platform, group, failures):
+        """Staggered race within one cost tier; returns the winning result or None"""
+        waiting = list(group)
+        running = {}
+
+        def launch():
+            m = waiting.pop(0)
+            running[asyncio.ensure_future(m.run())] = m
+            self._count_method(platform, m.name, 'launched')
+
+        try:
+            while waiting or running:
+                if waiting and not running:
+                    launch()
+
+                done, _ = await asyncio.wait(
+                    list(running), timeout=self.hedge_delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    # Hedge delay elapsed without an answer - start the next method alongside
+                    launch()
+                    continue
+
+                for task in done:
+                    m = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+
+                    if not isinstance(result, Exception) and succeeded(result):
+                        self._count_method(platform, m.name, 'wins')
+                        return result
+
+                    failures[m.name] = result
+                    self._count_method(platform, m.name, 'failures')
+
+                # A method failed - no reason to keep the next one waiting
+                if waiting:
+                    launch()
+
+            return None
+
+        finally:
+            for task, m in running.items():
+                task.cancel()
+                self._count_method(platform, m.name, 'cancelled')
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _count_method(self, platform, name, counter):
+        with self._lock:
+            self._methods[f'{platform}.{name}'][counter] += 1
+
+    def stats(self) -> Dict:
+        """Return race counters and per-method wins/failures/cancellations"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['enabled'] = self.enabled
+            stats['hedge_delay_seconds'] = self.hedge_delay
+            stats['methods'] = {name: dict(counters) for name, counters in self._methods.items()}
+            return stats
+
+
+# Global instance shared by the extractors
+method_racer = MethodRacer()
@@ -3,10 +3,18 @@ Facebook Content Extractor
 Uses Meta Graph API and oEmbed for content extraction
 """
 
-import requests
 import os
+import sys
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.parsers import ContentParser
+from utils.validators import URLValidator
+from services.http_client import http_client, async_http_client
+from services.extraction_race import RaceMethod, method_racer
+from services.rate_limits import rate_limits
 
 
 class FacebookExtractor:
@@ -25,6 +33,9 @@ class FacebookExtractor:
         Tries oEmbed first (works for some public posts), then Graph API
         """
         try:
+            if not rate_limits.available('meta.graph'):
+                return self._rate_limited(url)
+            
             # Try oEmbed first (limited support)
             result = self._extract_with_oembed(url)
             if result and 'error' not in result:
@@ -47,50 +58,95 @@ class FacebookExtractor:
                 'platform': 'Facebook'
             }
     
+    async def extract_async(self, url):
+        """Async version of extract - races oEmbed and the Graph API when racing is enabled"""
+        try:
+            if not rate_limits.available('meta.graph'):
+                return self._rate_limited(url)
+            
+            if self.access_token and method_racer.enabled:
+                result = await method_racer.race('facebook', [
+                    RaceMethod('oembed', lambda: self._extract_with_oembed_async(url)),
+                    RaceMethod('graph_api', lambda: self._extract_with_graph_api_async(url))
+                ])
+                if result is not None:
+                    return result
+            else:
+                result = await self._extract_with_oembed_async(url)
+                if result and 'error' not in result:
+                    return result
+                
+                if self.access_token:
+                    return await self._extract_with_graph_api_async(url)
+            
+            return {
+                'platform': 'Facebook',
+                'error': 'Could not extract Facebook post. Authentication required for most posts.',
+                'info': 'Set FACEBOOK_ACCESS_TOKEN to access posts.',
+                'url': url
+            }
+            
+        except Exception as e:
+            return {
+                'error': f'Facebook extraction failed: {str(e)}',
+                'platform': 'Facebook'
+            }
+    
     def _extract_with_oembed(self, url):
         """
         Extract using Facebook oEmbed API
         Limited support - works for some public posts
         """
         try:
-            params = {
-                'url': url,
-                'access_token': f"{self.app_id}|{self.app_secret}" if self.app_id and self.app_secret else None
-            }
-            
-            response = requests.get(self.oembed_url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Parse HTML to extract content
-                html = data.get('html', '')
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract text from embed
-                content = ''
-                if soup:
-                    text_elem = soup.find('blockquote') or soup.find('div')
-                    if text_elem:
-                        content = text_elem.get_text(strip=True, separator=' ')
-                
-                return {
-                    'platform': 'Facebook',
-                    'author': data.get('author_name', 'Unknown'),
-                    'author_url': data.get('author_url', ''),
-                    'content': content or 'No content available',
-                    'url': url,
-                    'width': data.get('width'),
-                    'height': data.get('height'),
-                    'method': 'oembed'
-                }
+            response = http_client.get(self.oembed_url, params=self._oembed_params(url))
+            return self._parse_oembed(response, url)
             
+        except Exception as e:
+            print(f"oEmbed extraction failed: {e}")
             return None
+    
+    async def _extract_with_oembed_async(self, url):
+        """Async version of _extract_with_oembed"""
+        try:
+            response = await async_http_client.get(self.oembed_url, params=self._oembed_params(url))
+            return self._parse_oembed(response, url)
             
         except Exception as e:
             print(f"oEmbed extraction failed: {e}")
             return None
     
+    def _oembed_params(self, url):
+        return {
+            'url': url,
+            'access_token': f"{self.app_id}|{self.app_secret}" if self.app_id and self.app_secret else None
+        }
+    
+    @staticmethod
+    def _parse_oembed(response, url):
+        """Build the result from an oEmbed response, or None if it was rejected"""
+        rate_limits.record('meta.graph', response)
+        if response.status_code == 200:
+            data = response.json()
+            
+            # Parse HTML to extract content
+            html = data.get('html', '')
+            
+            # Extract text from embed
+            content = ContentParser.parse_oembed_embed_text(html)
+            
+            return {
+                'platform': 'Facebook',
+                'author': data.get('author_name', 'Unknown'),
+                'author_url': data.get('author_url', ''),
+                'content': content or 'No content available',
+                'url': url,
+                'width': data.get('width'),
+                'height': data.get('height'),
+                'method': 'oembed'
+            }
+        
+        return None
+    
     def _extract_with_graph_api(self, url):
         """
         Extract using Facebook Graph API
@@ -100,41 +156,26 @@ class FacebookExtractor:
             # Extract post ID from URL
             post_id = self._extract_post_id(url)
             if not post_id:
-                return {
-                    'platform': 'Facebook',
-                    'error': 'Invalid Facebook URL format',
-                    'url': url
-                }
+                return self._invalid_post_url(url)
             
-            # Get post data
-            endpoint = f"{self.graph_api}/{post_id}"
-            params = {
-                'fields': 'message,created_time,from,permalink_url,story,type',
-                'access_token': self.access_token
+            response = http_client.get(**self._graph_api_request(post_id))
+            return self._parse_graph_api(response, url, post_id)
+                
+        except Exception as e:
+            return {
+                'platform': 'Facebook',
+                'error': f'Graph API extraction failed: {str(e)}'
             }
+    
+    async def _extract_with_graph_api_async(self, url):
+        """Async version of _extract_with_graph_api"""
+        try:
+            post_id = self._extract_post_id(url)
+            if not post_id:
+                return self._invalid_post_url(url)
             
-            response = requests.get(endpoint, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                return {
-                    'platform': 'Facebook',
-                    'author': data.get('from', {}).get('name', 'Unknown'),
-                    'content': data.get('message') or data.get('story', 'No content available'),
-                    'date': data.get('created_time', ''),
-                    'url': data.get('permalink_url', url),
-                    'post_type': data.get('type', 'status'),
-                    'post_id': post_id,
-                    'method': 'graph_api'
-                }
-            else:
-                return {
-                    'platform': 'Facebook',
-                    'error': f'Graph API request failed: {response.status_code}',
-                    'details': response.text,
-                    'info': 'You may need Page Public Content Access permission from Meta.'
-                }
+            response = await async_http_client.get(**self._graph_api_request(post_id))
+            return self._parse_graph_api(response, url, post_id)
                 
         except Exception as e:
             return {
@@ -142,6 +183,57 @@ class FacebookExtractor:
                 'error': f'Graph API extraction failed: {str(e)}'
             }
     
+    @staticmethod
+    def _rate_limited(url):
+        return {
+            'platform': 'Facebook',
+            'error': f"Meta API usage limit reached - retry in {rate_limits.retry_after('meta.graph'):.0f}s",
+            'url': url
+        }
+    
+    @staticmethod
+    def _invalid_post_url(url):
+        return {
+            'platform': 'Facebook',
+            'error': 'Invalid Facebook URL format',
+            'url': url
+        }
+    
+    def _graph_api_request(self, post_id):
+        """Endpoint and params for a Graph API post lookup"""
+        return {
+            'url': f"{self.graph_api}/{post_id}",
+            'params': {
+                'fields': 'message,created_time,from,permalink_url,story,type',
+                'access_token': self.access_token
+            }
+        }
+    
+    @staticmethod
+    def _parse_graph_api(response, url, post_id):
+        """Build the result from a Graph API response"""
+        rate_limits.record('meta.graph', response)
+        if response.status_code == 200:
+            data = response.json()
+            
+            return {
+                'platform': 'Facebook',
+                'author': data.get('from', {}).get('name', 'Unknown'),
+                'content': data.get('message') or data.get('story', 'No content available'),
+                'date': data.get('created_time', ''),
+                'url': data.get('permalink_url', url),
+                'post_type': data.get('type', 'status'),
+                'post_id': post_id,
+                'method': 'graph_api'
+            }
+        else:
+            return {
+                'platform': 'Facebook',
+                'error': f'Graph API request failed: {response.status_code}',
+                'details': response.text,
+                'info': 'You may need Page Public Content Access permission from Meta.'
+            }
+    
     def _extract_post_id(self, url):
         """
         Extract post ID from Facebook URL
@@ -149,24 +241,9 @@ class FacebookExtractor:
         - https://www.facebook.com/PAGE_NAME/posts/POST_ID
         - https://www.facebook.com/permalink.php?story_fbid=POST_ID&id=PAGE_ID
         - https://www.facebook.com/USER_ID/posts/POST_ID
+        Permalink posts are addressed as PAGE_ID_POST_ID in the Graph API
         """
-        # Try to parse different URL formats
-        if '/posts/' in url:
-            parts = url.rstrip('/').split('/posts/')
-            if len(parts) == 2:
-                return parts[1].split('/')[0].split('?')[0]
-        
-        if 'story_fbid=' in url:
-            # Parse query parameters
-            from urllib.parse import urlparse, parse_qs
-            parsed = urlparse(url)
-            params = parse_qs(parsed.query)
-            story_fbid = params.get('story_fbid', [None])[0]
-            page_id = params.get('id', [None])[0]
-            if story_fbid and page_id:
-                return f"{page_id}_{story_fbid}"
-        
-        return None
+        return URLValidator.extract_facebook_id(url)
     
     def get_page_posts(self, page_id):
         """
@@ -183,7 +260,7 @@ class FacebookExtractor:
                 'access_token': self.access_token
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = http_client.get(endpoint, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -4,10 +4,19 @@ Primary: Meta oEmbed API (official, requires app review)
 Fallback: Apify Scraper (development/testing)
 """
 
-import requests
 import os
+import sys
+import asyncio
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.parsers import ContentParser
+from utils.validators import URLValidator
+from services.http_client import http_client, async_http_client
+from services.extraction_race import RaceMethod, method_racer
+from services.rate_limits import rate_limits
 
 
 class InstagramExtractor:
@@ -21,6 +30,7 @@ class InstagramExtractor:
         self.access_token = os.getenv('INSTAGRAM_ACCESS_TOKEN')
         self.apify_token = os.getenv('APIFY_API_TOKEN')
         self.use_apify = bool(self.apify_token)
+        self.apify_actor = "apify/instagram-scraper"
     
     def extract(self, url):
         """
@@ -29,7 +39,7 @@ class InstagramExtractor:
         """
         try:
             # Method 1: Try oEmbed first (official, but requires app review)
-            if self.app_id and self.app_secret:
+            if self._oembed_available():
                 print(f"Attempting Instagram extraction via Meta oEmbed...")
                 result = self._extract_with_oembed(url)
                 if result and 'error' not in result:
@@ -59,6 +69,70 @@ class InstagramExtractor:
                 'platform': 'Instagram'
             }
     
+    async def extract_async(self, url):
+        """
+        Async version of extract
+        The Apify client is blocking, so that fallback runs in a worker thread
+        """
+        try:
+            if method_racer.enabled:
+                return await self._race(url)
+            
+            if self._oembed_available():
+                print(f"Attempting Instagram extraction via Meta oEmbed...")
+                result = await self._extract_with_oembed_async(url)
+                if result and 'error' not in result:
+                    return result
+                print(f"Meta oEmbed blocked (app review required)")
+            
+            if self.use_apify:
+                print(f"Falling back to Apify scraper...")
+                result = await asyncio.to_thread(self._extract_with_apify, url)
+                if result and 'error' not in result:
+                    return result
+            
+            if self.access_token:
+                return self._extract_with_graph_api(url)
+            
+            return {
+                'error': 'Instagram extraction requires Meta app review or Apify API token. Try Twitter/Reddit!',
+                'platform': 'Instagram',
+                'suggestion': 'Instagram support coming soon after Meta approval'
+            }
+            
+        except Exception as e:
+            return {
+                'error': f'Instagram extraction failed: {str(e)}',
+                'platform': 'Instagram'
+            }
+    
+    async def _race(self, url):
+        """
+        Race the free methods (oEmbed, Graph API); Apify costs credits so it
+        only starts once both have failed
+        """
+        methods = []
+        if self._oembed_available():
+            methods.append(RaceMethod('oembed', lambda: self._extract_with_oembed_async(url)))
+        if self.use_apify:
+            methods.append(RaceMethod('apify', lambda: asyncio.to_thread(self._extract_with_apify, url), expensive=True))
+        if self.access_token:
+            methods.append(RaceMethod('graph_api', lambda: asyncio.to_thread(self._extract_with_graph_api, url)))
+        
+        result = await method_racer.race('instagram', methods)
+        if result is not None:
+            return result
+        
+        return {
+            'error': 'Instagram extraction requires Meta app review or Apify API token. Try Twitter/Reddit!',
+            'platform': 'Instagram',
+            'suggestion': 'Instagram support coming soon after Meta approval'
+        }
+    
+    def _oembed_available(self):
+        """oEmbed is configured and Meta's app usage leaves room for it"""
+        return bool(self.app_id and self.app_secret) and rate_limits.available('meta.graph')
+    
     def _extract_with_oembed(self, url):
         """
         Extract using Facebook's Instagram oEmbed API
@@ -68,46 +142,64 @@ class InstagramExtractor:
             # Try without access token first for public posts
             params = {'url': url}
             
-            response = requests.get(self.oembed_url, params=params, timeout=10)
+            response = http_client.get(self.oembed_url, params=params)
             
             # If that fails and we have app credentials, try with app token
             if response.status_code != 200 and self.app_id and self.app_secret:
                 params['access_token'] = f"{self.app_id}|{self.app_secret}"
-                response = requests.get(self.oembed_url, params=params, timeout=10)
+                response = http_client.get(self.oembed_url, params=params)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Parse HTML to extract caption
-                html = data.get('html', '')
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Extract text from blockquote or similar
-                caption = ''
-                if soup:
-                    text_elem = soup.find('blockquote') or soup.find('div')
-                    if text_elem:
-                        caption = text_elem.get_text(strip=True, separator=' ')
-                
-                return {
-                    'platform': 'Instagram',
-                    'author': data.get('author_name', 'Unknown'),
-                    'author_url': data.get('author_url', ''),
-                    'content': caption or 'No caption available',
-                    'media_type': 'photo/video',
-                    'url': url,
-                    'thumbnail': data.get('thumbnail_url', ''),
-                    'width': data.get('thumbnail_width'),
-                    'height': data.get('thumbnail_height'),
-                    'method': 'oembed'
-                }
+            return self._parse_oembed(response, url)
             
+        except Exception as e:
+            print(f"oEmbed extraction failed: {e}")
             return None
+    
+    async def _extract_with_oembed_async(self, url):
+        """Async version of _extract_with_oembed"""
+        try:
+            params = {'url': url}
+            
+            response = await async_http_client.get(self.oembed_url, params=params)
+            
+            if response.status_code != 200 and self.app_id and self.app_secret:
+                params['access_token'] = f"{self.app_id}|{self.app_secret}"
+                response = await async_http_client.get(self.oembed_url, params=params)
+            
+            return self._parse_oembed(response, url)
             
         except Exception as e:
             print(f"oEmbed extraction failed: {e}")
             return None
     
+    @staticmethod
+    def _parse_oembed(response, url):
+        """Build the result from an oEmbed response, or None if it was rejected"""
+        rate_limits.record('meta.graph', response)
+        if response.status_code == 200:
+            data = response.json()
+            
+            # Parse HTML to extract caption
+            html = data.get('html', '')
+            
+            # Extract text from blockquote or similar
+            caption = ContentParser.parse_oembed_embed_text(html)
+            
+            return {
+                'platform': 'Instagram',
+                'author': data.get('author_name', 'Unknown'),
+                'author_url': data.get('author_url', ''),
+                'content': caption or 'No caption available',
+                'media_type': 'photo/video',
+                'url': url,
+                'thumbnail': data.get('thumbnail_url', ''),
+                'width': data.get('thumbnail_width'),
+                'height': data.get('thumbnail_height'),
+                'method': 'oembed'
+            }
+        
+        return None
+    
     def _extract_with_graph_api(self, url):
         """
         Extract using Instagram Graph API
@@ -142,10 +234,7 @@ class InstagramExtractor:
         """Extract media code from Instagram URL"""
         # https://www.instagram.com/p/ABC123xyz/
         # https://www.instagram.com/reel/ABC123xyz/
-        parts = url.rstrip('/').split('/')
-        if len(parts) >= 5 and parts[3] in ['p', 'reel', 'tv']:
-            return parts[4]
-        return None
+        return URLValidator.extract_instagram_id(url)
     
     def get_user_media(self, user_id=None):
         """
@@ -162,7 +251,7 @@ class InstagramExtractor:
                 'access_token': self.access_token
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = http_client.get(endpoint, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -187,49 +276,17 @@ class InstagramExtractor:
             
             client = ApifyClient(self.apify_token)
             
-            # Configure scraper to get just this one post
-            run_input = {
-                "directUrls": [url],
-                "resultsType": "posts",
-                "resultsLimit": 1,
-                "searchType": "hashtag",
-                "searchLimit": 1
-            }
-            
             print(f"Starting Apify Instagram scraper (this costs ~$0.05 from your credits)...")
             
             # Run the Instagram scraper actor
-            run = client.actor("apify/instagram-scraper").call(run_input=run_input)
+            run = client.actor(self.apify_actor).call(run_input=self._apify_run_input(url))
             
             # Get results from the run
             results = []
             for item in client.dataset(run["defaultDatasetId"]).iterate_items():
                 results.append(item)
             
-            if not results:
-                return {
-                    'error': 'No data found for this Instagram post',
-                    'platform': 'Instagram'
-                }
-            
-            post = results[0]
-            
-            print(f"✅ Successfully extracted Instagram post via Apify!")
-            print(f"   Author: {post.get('ownerUsername', 'Unknown')}")
-            print(f"   Caption length: {len(post.get('caption', ''))} chars")
-            
-            return {
-                'platform': 'Instagram',
-                'author': post.get('ownerUsername', 'Unknown'),
-                'author_name': post.get('ownerFullName', ''),
-                'content': post.get('caption', ''),
-                'date': post.get('timestamp', ''),
-                'url': url,
-                'likes': post.get('likesCount', 0),
-                'comments': post.get('commentsCount', 0),
-                'media_type': post.get('type', 'unknown'),
-                'method': 'apify_scraper'
-            }
+            return self._parse_apify_results(results, url)
         
         except ImportError:
             return {
@@ -243,6 +300,45 @@ class InstagramExtractor:
                 'platform': 'Instagram'
             }
 
+    @staticmethod
+    def _apify_run_input(url):
+        """Configure the scraper to get just this one post"""
+        return {
+            "directUrls": [url],
+            "resultsType": "posts",
+            "resultsLimit": 1,
+            "searchType": "hashtag",
+            "searchLimit": 1
+        }
+    
+    @staticmethod
+    def _parse_apify_results(results, url):
+        """Build the result from the scraper's dataset items"""
+        if not results:
+            return {
+                'error': 'No data found for this Instagram post',
+                'platform': 'Instagram'
+            }
+        
+        post = results[0]
+        
+        print(f"✅ Successfully extracted Instagram post via Apify!")
+        print(f"   Author: {post.get('ownerUsername', 'Unknown')}")
+        print(f"   Caption length: {len(post.get('caption', ''))} chars")
+        
+        return {
+            'platform': 'Instagram',
+            'author': post.get('ownerUsername', 'Unknown'),
+            'author_name': post.get('ownerFullName', ''),
+            'content': post.get('caption', ''),
+            'date': post.get('timestamp', ''),
+            'url': url,
+            'likes': post.get('likesCount', 0),
+            'comments_count': post.get('commentsCount', 0),
+            'media_type': post.get('type', 'unknown'),
+            'method': 'apify_scraper'
+        }
+
 
 def test_instagram_extractor():
     """Test Instagram extraction with sample URLs"""
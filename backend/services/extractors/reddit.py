@@ -1,18 +1,25 @@
 """
 Reddit Content Extractor
 Uses JSON API (no authentication required)
+Posts are looked up through /api/info.json (up to 100 per request); the full
+comment thread is only fetched when comments are asked for
 """
 
 import os
 import sys
-import requests
-from typing import Dict
+import asyncio
+from typing import Dict, List, Optional
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from utils.parsers import ContentParser
 from utils.validators import URLValidator
+from services.http_client import http_client, async_http_client
+from services.rate_limits import rate_limits
+
+# Reddit's limit on fullnames per /api/info request
+INFO_BATCH_SIZE = 100
 
 class RedditExtractor:
     """Extract content from Reddit URLs using JSON API"""
@@ -23,14 +30,17 @@ class RedditExtractor:
         self.headers = {
             'User-Agent': 'MindTrack-AI/1.0 (Mental health analyzer; Academic research)'
         }
+        self.info_url = "https://www.reddit.com/api/info.json"
+        self.max_comments = int(os.getenv('REDDIT_MAX_COMMENTS', '50'))
     
-    def extract(self, url: str) -> Dict:
+    def extract(self, url: str, include_comments: bool = False) -> Dict:
         """
         Extract Reddit post content from URL using JSON API
         
         Args:
             url: Reddit post URL
-            
+            include_comments: Also fetch the thread's top-level comments
+        
         Returns:
             Dictionary with extracted data
         """
@@ -38,12 +48,12 @@ class RedditExtractor:
             # Validate Reddit URL
             reddit_info = URLValidator.extract_reddit_info(url)
             if not reddit_info:
-                return {
-                    'success': False,
-                    'error': 'Invalid Reddit URL format. Use: https://www.reddit.com/r/subreddit/comments/post_id/title/'
-                }
+                return self._invalid_url()
+            
+            if include_comments:
+                return self._rate_limited() or self._extract_with_json(url)
             
-            return self._extract_with_json(url)
+            return self.extract_batch([url])[0]
         
         except Exception as e:
             return {
@@ -51,22 +61,170 @@ class RedditExtractor:
                 'error': f'Failed to extract Reddit post: {str(e)}'
             }
     
-    def _extract_with_json(self, url: str) -> Dict:
+    async def extract_async(self, url: str, include_comments: bool = False) -> Dict:
         """
-        Extract post using Reddit JSON API (no authentication required)
+        Async version of extract
         
         Args:
             url: Reddit post URL
+            include_comments: Also fetch the thread's top-level comments
+        
+        Returns:
+            Dictionary with extracted data
+        """
+        try:
+            reddit_info = URLValidator.extract_reddit_info(url)
+            if not reddit_info:
+                return self._invalid_url()
             
+            if include_comments:
+                return self._rate_limited() or await self._extract_with_json_async(url)
+            
+            return (await self.extract_batch_async([url]))[0]
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Failed to extract Reddit post: {str(e)}'
+            }
+    
+    def extract_batch(self, urls: List[str]) -> List[Dict]:
+        """
+        Extract many posts with one /api/info.json request per 100 posts
+        
+        Args:
+            urls: Reddit post URLs
+        
+        Returns:
+            Results aligned with urls
+        """
+        posts, errors = {}, {}
+        
+        for chunk in self._chunks(urls):
+            try:
+                error = self._rate_limited()
+                if error:
+                    raise RuntimeError(error['error'])
+                response = http_client.get(self.info_url, params=self._info_params(chunk), headers=self.headers)
+                posts.update(self._parse_info(response))
+            except Exception as e:
+                errors.update({post_id: e for post_id in chunk})
+        
+        return self._batch_results(urls, posts, errors)
+    
+    async def extract_batch_async(self, urls: List[str]) -> List[Dict]:
+        """Async version of extract_batch - the info requests run concurrently"""
+        chunks = self._chunks(urls)
+        posts, errors = {}, {}
+        
+        async def lookup(chunk):
+            error = self._rate_limited()
+            if error:
+                raise RuntimeError(error['error'])
+            response = await async_http_client.get(self.info_url, params=self._info_params(chunk), headers=self.headers)
+            return self._parse_info(response)
+        
+        results = await asyncio.gather(*(lookup(chunk) for chunk in chunks), return_exceptions=True)
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                errors.update({post_id: result for post_id in chunk})
+            else:
+                posts.update(result)
+        
+        return self._batch_results(urls, posts, errors)
+    
+    def _extract_with_json(self, url: str) -> Dict:
+        """
+        Extract post and comments using the thread's JSON listing (no authentication required)
+        
+        Args:
+            url: Reddit post URL
+        
         Returns:
             Dictionary with extracted data
         """
-        # Remove URL parameters (utm_source, etc.) before adding .json
-        # Split at ? to remove query parameters
-        clean_url = url.split('?')[0].rstrip('/')
-        json_url = clean_url + '.json'
+        response = http_client.get(self._json_url(url), headers=self.headers)
+        return self._parse_json(response, url)
+    
+    async def _extract_with_json_async(self, url: str) -> Dict:
+        """Async version of _extract_with_json"""
+        response = await async_http_client.get(self._json_url(url), headers=self.headers)
+        return self._parse_json(response, url)
+    
+    @staticmethod
+    def _invalid_url() -> Dict:
+        return {
+            'success': False,
+            'error': 'Invalid Reddit URL format. Use: https://www.reddit.com/r/subreddit/comments/post_id/title/'
+        }
+    
+    @staticmethod
+    def _rate_limited() -> Optional[Dict]:
+        """Error result while Reddit's rate-limit window is used up (there's no other method to route to)"""
+        if rate_limits.available('reddit.json'):
+            return None
+        return {
+            'success': False,
+            'error': f"Reddit rate limit reached - retry in {rate_limits.retry_after('reddit.json'):.0f}s"
+        }
+    
+    @staticmethod
+    def _chunks(urls: List[str]) -> List[List[str]]:
+        """Distinct post IDs of the valid URLs, in groups of INFO_BATCH_SIZE"""
+        post_ids = []
+        seen = set()
+        for url in urls:
+            reddit_info = URLValidator.extract_reddit_info(url)
+            if reddit_info and reddit_info['post_id'] not in seen:
+                seen.add(reddit_info['post_id'])
+                post_ids.append(reddit_info['post_id'])
+        return [post_ids[i:i + INFO_BATCH_SIZE] for i in range(0, len(post_ids), INFO_BATCH_SIZE)]
+    
+    @staticmethod
+    def _info_params(post_ids: List[str]) -> Dict:
+        return {'id': ','.join(f't3_{post_id}' for post_id in post_ids)}
+    
+    @staticmethod
+    def _parse_info(response) -> Dict[str, Dict]:
+        """Post data by ID from an /api/info listing"""
+        rate_limits.record('reddit.json', response)
+        response.raise_for_status()
+        
+        children = response.json()['data']['children']
+        return {child['data']['id']: child['data'] for child in children if child.get('kind') == 't3'}
+    
+    def _batch_results(self, urls: List[str], posts: Dict[str, Dict], errors: Dict[str, Exception]) -> List[Dict]:
+        """One result per URL from the looked-up posts"""
+        results = []
+        
+        for url in urls:
+            reddit_info = URLValidator.extract_reddit_info(url)
+            if not reddit_info:
+                results.append(self._invalid_url())
+            elif reddit_info['post_id'] in posts:
+                results.append(self._post_result(posts[reddit_info['post_id']], url, 'info_api'))
+            elif reddit_info['post_id'] in errors:
+                results.append({
+                    'success': False,
+                    'error': f"Failed to extract Reddit post: {str(errors[reddit_info['post_id']])}"
+                })
+            else:
+                results.append({
+                    'success': False,
+                    'error': 'Reddit post not found (deleted, private or wrong ID)'
+                })
         
-        response = requests.get(json_url, headers=self.headers, timeout=10)
+        return results
+    
+    @staticmethod
+    def _json_url(url: str) -> str:
+        """Canonical post URL (www host, no utm_source etc.) with .json appended"""
+        clean_url = (URLValidator.canonical_url(url) or url.split('?')[0]).rstrip('/')
+        return clean_url + '.json'
+    
+    def _parse_json(self, response, url: str) -> Dict:
+        """Build the result, with top-level comments, from a thread's JSON listing"""
+        rate_limits.record('reddit.json', response)
         response.raise_for_status()
         
         # Parse JSON response
@@ -81,6 +239,32 @@ class RedditExtractor:
         # Extract post data
         post_data = data[0]['data']['children'][0]['data']
         
+        result = self._post_result(post_data, url, 'json_api')
+        result['comments'] = self._parse_comments(data[1] if len(data) > 1 else {})
+        return result
+    
+    def _parse_comments(self, listing: Dict) -> List[Dict]:
+        """Top-level comments from a thread's comment listing"""
+        comments = []
+        
+        for child in listing.get('data', {}).get('children', []):
+            if child.get('kind') != 't1':
+                continue
+            comment = child['data']
+            comments.append({
+                'author': comment.get('author', ''),
+                'content': ContentParser.clean_text(comment.get('body', '')),
+                'score': comment.get('score', 0),
+                'date': ContentParser.format_reddit_date(comment.get('created_utc', 0))
+            })
+            if len(comments) >= self.max_comments:
+                break
+        
+        return comments
+    
+    @staticmethod
+    def _post_result(post_data: Dict, url: str, method: str) -> Dict:
+        """Build the result from a post's data"""
         # Combine title and selftext
         content = post_data.get('title', '')
         selftext = post_data.get('selftext', '')
@@ -98,5 +282,5 @@ class RedditExtractor:
             'url': url,
             'score': post_data.get('score', 0),
             'num_comments': post_data.get('num_comments', 0),
-            'method': 'json_api'
+            'method': method
         }
@@ -3,10 +3,17 @@ Threads Content Extractor
 Uses Meta's Threads API for content extraction
 """
 
-import requests
 import os
+import sys
 from datetime import datetime
 
+# Add backend to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from utils.validators import URLValidator
+from services.http_client import http_client, async_http_client
+from services.rate_limits import rate_limits
+
 
 class ThreadsExtractor:
     """Extract content from Threads posts"""
@@ -24,21 +31,15 @@ class ThreadsExtractor:
         """
         try:
             if not self.access_token:
-                return {
-                    'platform': 'Threads',
-                    'error': 'Threads API requires authentication. Please set THREADS_ACCESS_TOKEN.',
-                    'info': 'Get access token from Meta Developer Portal → Threads API',
-                    'url': url
-                }
+                return self._missing_token(url)
             
             # Extract thread ID from URL
             thread_id = self._extract_thread_id(url)
             if not thread_id:
-                return {
-                    'platform': 'Threads',
-                    'error': 'Invalid Threads URL format',
-                    'url': url
-                }
+                return self._invalid_thread_url(url)
+            
+            if not rate_limits.available('threads.api'):
+                return self._rate_limited(url)
             
             # Get thread data
             return self._get_thread_data(thread_id)
@@ -49,49 +50,78 @@ class ThreadsExtractor:
                 'platform': 'Threads'
             }
     
+    async def extract_async(self, url):
+        """Async version of extract"""
+        try:
+            if not self.access_token:
+                return self._missing_token(url)
+            
+            thread_id = self._extract_thread_id(url)
+            if not thread_id:
+                return self._invalid_thread_url(url)
+            
+            if not rate_limits.available('threads.api'):
+                return self._rate_limited(url)
+            
+            return await self._get_thread_data_async(thread_id)
+            
+        except Exception as e:
+            return {
+                'error': f'Threads extraction failed: {str(e)}',
+                'platform': 'Threads'
+            }
+    
+    @staticmethod
+    def _missing_token(url):
+        return {
+            'platform': 'Threads',
+            'error': 'Threads API requires authentication. Please set THREADS_ACCESS_TOKEN.',
+            'info': 'Get access token from Meta Developer Portal → Threads API',
+            'url': url
+        }
+    
+    @staticmethod
+    def _rate_limited(url):
+        return {
+            'platform': 'Threads',
+            'error': f"Threads API usage limit reached - retry in {rate_limits.retry_after('threads.api'):.0f}s",
+            'url': url
+        }
+    
+    @staticmethod
+    def _invalid_thread_url(url):
+        return {
+            'platform': 'Threads',
+            'error': 'Invalid Threads URL format',
+            'url': url
+        }
+    
     def _extract_thread_id(self, url):
         """
         Extract thread ID from Threads URL
         Example: https://www.threads.net/@username/post/THREAD_ID
         """
-        parts = url.rstrip('/').split('/')
-        if 'threads.net' in url and len(parts) >= 5:
-            if parts[-2] == 'post':
-                return parts[-1]
-        return None
+        return URLValidator.extract_threads_id(url)
     
     def _get_thread_data(self, thread_id):
         """
         Get thread data from Threads API
         """
         try:
-            endpoint = f"{self.api_base}/{thread_id}"
-            params = {
-                'fields': 'id,text,username,timestamp,media_type,media_url,permalink',
-                'access_token': self.access_token
-            }
-            
-            response = requests.get(endpoint, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
+            response = http_client.get(**self._thread_request(thread_id))
+            return self._parse_thread_data(response, thread_id)
                 
-                return {
-                    'platform': 'Threads',
-                    'author': data.get('username', 'Unknown'),
-                    'content': data.get('text', 'No text content'),
-                    'date': data.get('timestamp', ''),
-                    'media_type': data.get('media_type', 'text'),
-                    'media_url': data.get('media_url', ''),
-                    'url': data.get('permalink', ''),
-                    'thread_id': thread_id
-                }
-            else:
-                return {
-                    'platform': 'Threads',
-                    'error': f'API request failed: {response.status_code}',
-                    'details': response.text
-                }
+        except Exception as e:
+            return {
+                'platform': 'Threads',
+                'error': f'Failed to get thread data: {str(e)}'
+            }
+    
+    async def _get_thread_data_async(self, thread_id):
+        """Async version of _get_thread_data"""
+        try:
+            response = await async_http_client.get(**self._thread_request(thread_id))
+            return self._parse_thread_data(response, thread_id)
                 
         except Exception as e:
             return {
@@ -99,6 +129,40 @@ class ThreadsExtractor:
                 'error': f'Failed to get thread data: {str(e)}'
             }
     
+    def _thread_request(self, thread_id):
+        """Endpoint and params for a thread lookup"""
+        return {
+            'url': f"{self.api_base}/{thread_id}",
+            'params': {
+                'fields': 'id,text,username,timestamp,media_type,media_url,permalink',
+                'access_token': self.access_token
+            }
+        }
+    
+    @staticmethod
+    def _parse_thread_data(response, thread_id):
+        """Build the result from a Threads API response"""
+        rate_limits.record('threads.api', response)
+        if response.status_code == 200:
+            data = response.json()
+            
+            return {
+                'platform': 'Threads',
+                'author': data.get('username', 'Unknown'),
+                'content': data.get('text', 'No text content'),
+                'date': data.get('timestamp', ''),
+                'media_type': data.get('media_type', 'text'),
+                'media_url': data.get('media_url', ''),
+                'url': data.get('permalink', ''),
+                'thread_id': thread_id
+            }
+        else:
+            return {
+                'platform': 'Threads',
+                'error': f'API request failed: {response.status_code}',
+                'details': response.text
+            }
+    
     def get_user_threads(self, user_id=None):
         """
         Get threads from authenticated user
@@ -114,7 +178,7 @@ class ThreadsExtractor:
                 'access_token': self.access_token
             }
             
-            response = requests.get(endpoint, params=params, timeout=10)
+            response = http_client.get(endpoint, params=params)
             
             if response.status_code == 200:
                 return response.json()
@@ -13,6 +13,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from utils.parsers import ContentParser
 from utils.validators import URLValidator
+from services.http_client import http_client, async_http_client
+from services.extraction_race import RaceMethod, method_racer
+from services.rate_limits import rate_limits
 
 class TwitterExtractor:
     """Extract content from Twitter/X URLs"""
@@ -41,19 +44,13 @@ class TwitterExtractor:
                     'error': 'Invalid Twitter URL'
                 }
             
-            # Try API v2 first if bearer token available, fall back to oEmbed
-            if self.use_api_v2:
+            # Try API v2 first if bearer token available and its rate-limit
+            # window isn't used up, fall back to oEmbed
+            if self._api_v2_available():
                 try:
                     return self._extract_with_api_v2(tweet_id, url)
-                except requests.exceptions.HTTPError as e:
-                    # Fall back to oEmbed on rate limit (429) or other API errors
-                    if e.response.status_code == 429:
-                        print(f"Twitter API rate limit hit, falling back to oEmbed for {url}")
-                    else:
-                        print(f"Twitter API v2 error ({e.response.status_code}), falling back to oEmbed")
-                    return self._extract_with_oembed(url)
                 except Exception as e:
-                    print(f"Twitter API v2 error: {str(e)}, falling back to oEmbed")
+                    self._report_api_v2_error(e, url)
                     return self._extract_with_oembed(url)
             else:
                 return self._extract_with_oembed(url)
@@ -64,6 +61,63 @@ class TwitterExtractor:
                 'error': f'Failed to extract tweet: {str(e)}'
             }
     
+    async def extract_async(self, url: str) -> Dict:
+        """
+        Async version of extract
+        
+        Args:
+            url: Twitter/X post URL
+            
+        Returns:
+            Dictionary with extracted data
+        """
+        try:
+            tweet_id = URLValidator.extract_twitter_id(url)
+            if not tweet_id:
+                return {
+                    'success': False,
+                    'error': 'Invalid Twitter URL'
+                }
+            
+            use_api_v2 = self._api_v2_available()
+            
+            if use_api_v2 and method_racer.enabled:
+                # API v2 gets a head start; oEmbed joins after the hedge delay
+                return await method_racer.race('twitter', [
+                    RaceMethod('api_v2', lambda: self._extract_with_api_v2_async(tweet_id, url)),
+                    RaceMethod('oembed', lambda: self._extract_with_oembed_async(url))
+                ])
+            elif use_api_v2:
+                try:
+                    return await self._extract_with_api_v2_async(tweet_id, url)
+                except Exception as e:
+                    self._report_api_v2_error(e, url)
+                    return await self._extract_with_oembed_async(url)
+            else:
+                return await self._extract_with_oembed_async(url)
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Failed to extract tweet: {str(e)}'
+            }
+    
+    def _api_v2_available(self) -> bool:
+        """API v2 is configured and has requests left in its current rate-limit window"""
+        return self.use_api_v2 and rate_limits.available('twitter.api_v2')
+    
+    @staticmethod
+    def _report_api_v2_error(error: Exception, url: str):
+        """Log why API v2 failed before falling back to oEmbed"""
+        if isinstance(error, requests.exceptions.HTTPError):
+            # Fall back to oEmbed on rate limit (429) or other API errors
+            if error.response.status_code == 429:
+                print(f"Twitter API rate limit hit, falling back to oEmbed for {url}")
+            else:
+                print(f"Twitter API v2 error ({error.response.status_code}), falling back to oEmbed")
+        else:
+            print(f"Twitter API v2 error: {str(error)}, falling back to oEmbed")
+    
     def _extract_with_oembed(self, url: str) -> Dict:
         """
         Extract tweet using oEmbed API (no authentication required)
@@ -74,9 +128,21 @@ class TwitterExtractor:
         Returns:
             Dictionary with extracted data
         """
-        oembed_url = f"https://publish.twitter.com/oembed?url={url}"
-        
-        response = requests.get(oembed_url, timeout=10)
+        response = http_client.get(self._oembed_url(url))
+        return self._parse_oembed(response, url)
+    
+    async def _extract_with_oembed_async(self, url: str) -> Dict:
+        """Async version of _extract_with_oembed"""
+        response = await async_http_client.get(self._oembed_url(url))
+        return self._parse_oembed(response, url)
+    
+    @staticmethod
+    def _oembed_url(url: str) -> str:
+        return f"https://publish.twitter.com/oembed?url={url}"
+    
+    @staticmethod
+    def _parse_oembed(response, url: str) -> Dict:
+        """Build the result from an oEmbed response"""
         response.raise_for_status()
         
         data = response.json()
@@ -106,19 +172,32 @@ class TwitterExtractor:
         Returns:
             Dictionary with extracted data
         """
-        api_url = f"https://api.twitter.com/2/tweets/{tweet_id}"
-        
-        params = {
-            'tweet.fields': 'created_at,author_id,text,public_metrics',
-            'expansions': 'author_id',
-            'user.fields': 'username,name'
-        }
-        
-        headers = {
-            'Authorization': f'Bearer {self.bearer_token}'
+        response = http_client.get(**self._api_v2_request(tweet_id))
+        return self._parse_api_v2(response, url)
+    
+    async def _extract_with_api_v2_async(self, tweet_id: str, url: str) -> Dict:
+        """Async version of _extract_with_api_v2"""
+        response = await async_http_client.get(**self._api_v2_request(tweet_id))
+        return self._parse_api_v2(response, url)
+    
+    def _api_v2_request(self, tweet_id: str) -> Dict:
+        """URL, params and auth headers for an API v2 tweet lookup"""
+        return {
+            'url': f"https://api.twitter.com/2/tweets/{tweet_id}",
+            'params': {
+                'tweet.fields': 'created_at,author_id,text,public_metrics',
+                'expansions': 'author_id',
+                'user.fields': 'username,name'
+            },
+            'headers': {
+                'Authorization': f'Bearer {self.bearer_token}'
+            }
         }
-        
-        response = requests.get(api_url, headers=headers, params=params, timeout=10)
+    
+    @staticmethod
+    def _parse_api_v2(response, url: str) -> Dict:
+        """Build the result from an API v2 response"""
+        rate_limits.record('twitter.api_v2', response)
         response.raise_for_status()
         
         data = response.json()
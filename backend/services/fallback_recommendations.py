@@ -0,0 +1,366 @@
+"""
+Fallback Recommendation Table
+Hardcoded recommendations used when Gemini is unavailable, precomputed at startup
+into an immutable table so the degraded path is a constant-time lookup
+"""
+
+from collections import namedtuple
+from typing import Iterable, Optional
+
+
+# Every primary emotion analyze_text_context can produce
+EMOTIONS = ('suicidal', 'depression', 'anxiety', 'stress', 'anger', 'grief', 'trauma', 'neutral')
+
+# Only these tones and concerns change the fallback output, so they form the key
+TONE_FLAGS = ('desperate', 'seeking_help', 'overwhelmed')
+CONCERN_FLAGS = ('Work Stress', 'Relationships', 'Sleep', 'Financial')
+
+FallbackEntry = namedtuple('FallbackEntry', ['suggestions', 'immediate_actions', 'support_resources'])
+
+
+class FrozenDict(dict):
+    """Read-only dict - still a dict so jsonify can serialize it"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('Fallback recommendations are shared and cannot be modified')
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def _freeze(value):
+    """Recursively convert lists and dicts to tuples and FrozenDicts"""
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _bitmask(values: Optional[Iterable[str]], flags) -> int:
+    """Encode which of the given flags appear in values"""
+    if not values:
+        return 0
+    mask = 0
+    for bit, flag in enumerate(flags):
+        if flag in values:
+            mask |= 1 << bit
+    return mask
+
+
+def _expand(mask: int, flags) -> list:
+    """Decode a bitmask back into the list of flags it represents"""
+    return [flag for bit, flag in enumerate(flags) if mask & (1 << bit)]
+
+
+def _build_suggestions(emotion, tone, concerns):
+    """Generate personalized AI suggestions based on emotional context"""
+    suggestions = []
+    
+    # Crisis-level suggestions
+    if emotion == 'suicidal' or 'desperate' in tone:
+        suggestions.extend([
+            {
+                'priority': 'critical',
+                'title': 'Reach Out for Immediate Help',
+                'description': 'Your safety is the top priority. Please contact a crisis helpline immediately (988 in USA).',
+                'rationale': 'Professional crisis counselors are trained to help in situations like yours and are available 24/7.'
+            },
+            {
+                'priority': 'critical',
+                'title': 'Don\'t Stay Alone Right Now',
+                'description': 'Call a trusted friend, family member, or go to a public place. Physical presence of others can provide immediate safety.',
+                'rationale': 'Social connection during crisis moments has been shown to significantly reduce risk and provide emotional grounding.'
+            }
+        ])
+    
+    # Depression-specific suggestions
+    if emotion == 'depression':
+        suggestions.extend([
+            {
+                'priority': 'high',
+                'title': 'Start with One Small Action',
+                'description': 'Choose just one small task today - make your bed, take a 5-minute walk, or drink a glass of water.',
+                'rationale': 'Depression makes everything feel impossible. Small wins create momentum and prove you can still take action.'
+            },
+            {
+                'priority': 'high',
+                'title': 'Schedule a Therapy Session',
+                'description': 'Consider reaching out to a mental health professional. Cognitive Behavioral Therapy (CBT) has strong evidence for treating depression.',
+                'rationale': 'Professional support provides structured approaches to address underlying patterns and develop coping strategies.'
+            },
+            {
+                'priority': 'medium',
+                'title': 'Get Sunlight Exposure',
+                'description': 'Spend 15-30 minutes outdoors in natural sunlight, especially in the morning.',
+                'rationale': 'Sunlight helps regulate circadian rhythm and boosts serotonin production, which is often low in depression.'
+            }
+        ])
+    
+    # Anxiety-specific suggestions
+    if emotion == 'anxiety':
+        suggestions.extend([
+            {
+                'priority': 'high',
+                'title': 'Practice Grounding Techniques',
+                'description': 'Use the 5-4-3-2-1 method: Name 5 things you see, 4 you feel, 3 you hear, 2 you smell, 1 you taste.',
+                'rationale': 'Grounding techniques interrupt anxiety spirals by bringing your focus back to the present moment.'
+            },
+            {
+                'priority': 'high',
+                'title': 'Box Breathing Exercise',
+                'description': 'Breathe in for 4 counts, hold for 4, out for 4, hold for 4. Repeat for 5 minutes.',
+                'rationale': 'This technique activates your parasympathetic nervous system, physically calming your anxiety response.'
+            },
+            {
+                'priority': 'medium',
+                'title': 'Write Down Your Worries',
+                'description': 'Set aside 15 minutes to write all your anxious thoughts. Then schedule a time tomorrow to address them.',
+                'rationale': 'Externalizing worries reduces mental load and helps distinguish between productive and unproductive anxiety.'
+            }
+        ])
+    
+    # Stress-specific suggestions
+    if emotion == 'stress':
+        suggestions.extend([
+            {
+                'priority': 'high',
+                'title': 'Prioritize and Delegate',
+                'description': 'List everything overwhelming you. Identify top 3 priorities and see what can be delegated, delayed, or dropped.',
+                'rationale': 'Stress often comes from feeling everything is urgent. Prioritization reduces cognitive load and creates clarity.'
+            },
+            {
+                'priority': 'medium',
+                'title': 'Take Strategic Breaks',
+                'description': 'Use the Pomodoro technique: 25 minutes focused work, then 5-minute break. Every 4 cycles, take 15-30 minutes.',
+                'rationale': 'Regular breaks prevent burnout and actually improve productivity by maintaining mental freshness.'
+            }
+        ])
+    
+    # Work-related concerns
+    if 'Work Stress' in concerns:
+        suggestions.append({
+            'priority': 'medium',
+            'title': 'Set Clear Work Boundaries',
+            'description': 'Establish specific work hours and communicate them. Turn off notifications outside these hours.',
+            'rationale': 'Boundary-setting reduces work-life conflict and prevents chronic stress from constant availability.'
+        })
+    
+    # Relationship concerns
+    if 'Relationships' in concerns:
+        suggestions.append({
+            'priority': 'medium',
+            'title': 'Practice "I Feel" Communication',
+            'description': 'Express concerns using "I feel [emotion] when [situation]" instead of blaming language.',
+            'rationale': 'This communication style reduces defensiveness and opens pathways for genuine understanding and resolution.'
+        })
+    
+    # Sleep concerns
+    if 'Sleep' in concerns:
+        suggestions.append({
+            'priority': 'high',
+            'title': 'Create a Sleep Routine',
+            'description': 'Go to bed and wake at consistent times. Avoid screens 1 hour before bed. Keep bedroom cool and dark.',
+            'rationale': 'Sleep hygiene directly impacts mental health. Poor sleep amplifies depression and anxiety by 40-60%.'
+        })
+    
+    # General wellness if no specific emotion detected
+    # Only show for neutral content that might benefit from general advice
+    # Don't show for clearly positive/normal content
+    if emotion == 'neutral' and ('seeking_help' in tone or 'overwhelmed' in tone):
+        suggestions.extend([
+            {
+                'priority': 'medium',
+                'title': 'Maintain Mental Fitness',
+                'description': 'Continue daily practices like journaling, exercise, and social connection to build resilience.',
+                'rationale': 'Preventive mental health care is as important as physical fitness for long-term wellbeing.'
+            }
+        ])
+    
+    # If no suggestions (truly normal/positive content), return empty list
+    return suggestions[:5] if suggestions else []
+
+
+def _build_immediate_actions(emotion, tone):
+    """Generate immediate action steps based on emotional state"""
+    actions = []
+    
+    if emotion == 'suicidal' or 'desperate' in tone:
+        actions = [
+            "Call 988 (Suicide Prevention Lifeline) immediately",
+            "Text 'HOME' to 741741 (Crisis Text Line)",
+            "Go to nearest emergency room if in immediate danger",
+            "Call a trusted friend or family member right now",
+            "Remove any means of self-harm from your environment"
+        ]
+    elif emotion == 'depression':
+        actions = [
+            "Take a 5-minute walk outside",
+            "Drink a glass of water and eat something nutritious",
+            "Call or text one person you trust",
+            "Write down one thing you're grateful for",
+            "Take a warm shower"
+        ]
+    elif emotion == 'anxiety':
+        actions = [
+            "Practice deep breathing for 2 minutes",
+            "Name 5 things you can see around you",
+            "Splash cold water on your face",
+            "Listen to calming music for 10 minutes",
+            "Step away from the stressful situation if possible"
+        ]
+    elif emotion == 'stress':
+        actions = [
+            "Write down everything on your mind",
+            "Identify your top 3 priorities for today",
+            "Take a 15-minute break from work/tasks",
+            "Do 10 jumping jacks to release tension",
+            "Drink water and check if you're hungry"
+        ]
+    elif emotion == 'neutral' and any(t in tone for t in ['seeking_help', 'overwhelmed']):
+        # Only show for neutral content that seems like user is asking for help
+        actions = [
+            "Continue your current wellness practices",
+            "Take a moment to check in with yourself",
+            "Maintain your sleep and exercise routines"
+        ]
+    else:
+        # Truly normal/positive content - no actions needed
+        actions = []
+    
+    return actions
+
+
+def _build_support_resources(emotion, concerns):
+    """Generate relevant support resources based on context"""
+    resources = []
+    
+    if emotion == 'suicidal':
+        resources.extend([
+            {
+                'name': '988 Suicide & Crisis Lifeline',
+                'type': 'crisis',
+                'contact': '988 (USA)',
+                'description': '24/7 crisis support by trained counselors',
+                'availability': 'Immediate'
+            },
+            {
+                'name': 'Crisis Text Line',
+                'type': 'crisis',
+                'contact': 'Text HOME to 741741',
+                'description': 'Text-based crisis counseling',
+                'availability': 'Immediate'
+            }
+        ])
+    
+    if emotion in ['depression', 'anxiety']:
+        resources.extend([
+            {
+                'name': 'BetterHelp',
+                'type': 'therapy',
+                'contact': 'betterhelp.com',
+                'description': 'Online therapy with licensed therapists',
+                'availability': 'Within 48 hours'
+            },
+            {
+                'name': 'Psychology Today Therapist Finder',
+                'type': 'therapy',
+                'contact': 'psychologytoday.com/us/therapists',
+                'description': 'Find local therapists by specialty',
+                'availability': 'Varies'
+            }
+        ])
+    
+    if 'Work Stress' in concerns:
+        resources.append({
+            'name': 'Employee Assistance Program (EAP)',
+            'type': 'workplace',
+            'contact': 'Check with your HR department',
+            'description': 'Free confidential counseling through employer',
+            'availability': 'Varies by employer'
+        })
+    
+    if 'Financial' in concerns:
+        resources.append({
+            'name': 'National Foundation for Credit Counseling',
+            'type': 'financial',
+            'contact': 'nfcc.org',
+            'description': 'Free financial counseling and debt management',
+            'availability': 'Within days'
+        })
+    
+    # Only include general NAMI resource if there are mental health concerns
+    # Don't show for truly normal/positive content
+    if emotion != 'neutral' or resources:
+        resources.append({
+            'name': 'NAMI Helpline',
+            'type': 'support',
+            'contact': '1-800-950-NAMI (6264)',
+            'description': 'Mental health information and support',
+            'availability': 'Mon-Fri 10am-10pm ET'
+        })
+    
+    return resources[:5] if resources else []
+
+
+class FallbackRecommendationTable:
+    """Immutable table of fallback recommendations keyed by (emotion, tone flags, concern bitmask)"""
+
+    def __init__(self):
+        self._table = {}
+
+        for emotion in EMOTIONS:
+            for tone_mask in range(1 << len(TONE_FLAGS)):
+                for concern_mask in range(1 << len(CONCERN_FLAGS)):
+                    self._table[(emotion, tone_mask, concern_mask)] = self._build(
+                        emotion,
+                        _expand(tone_mask, TONE_FLAGS),
+                        _expand(concern_mask, CONCERN_FLAGS)
+                    )
+
+    def lookup(self, emotion: str, tone: Optional[Iterable[str]] = None,
+               concerns: Optional[Iterable[str]] = None) -> FallbackEntry:
+        """
+        Get fallback recommendations for an emotional context
+
+        Args:
+            emotion: Primary emotion
+            tone: Detected tone labels
+            concerns: Detected concern labels (title case, e.g. 'Work Stress')
+
+        Returns:
+            FallbackEntry with shared, read-only suggestions, actions and resources
+        """
+        key = (emotion, _bitmask(tone, TONE_FLAGS), _bitmask(concerns, CONCERN_FLAGS))
+        entry = self._table.get(key)
+
+        if entry is None:
+            # Emotion outside the precomputed space - build it on demand
+            entry = self._build(emotion, _expand(key[1], TONE_FLAGS), _expand(key[2], CONCERN_FLAGS))
+
+        return entry
+
+    def entries(self):
+        """
+        Iterate over the precomputed table
+
+        Yields:
+            (emotion, tone flags, concern flags, FallbackEntry)
+        """
+        for (emotion, tone_mask, concern_mask), entry in self._table.items():
+            yield emotion, _expand(tone_mask, TONE_FLAGS), _expand(concern_mask, CONCERN_FLAGS), entry
+
+    def __len__(self):
+        return len(self._table)
+
+    @staticmethod
+    def _build(emotion, tone, concerns):
+        return FallbackEntry(
+            suggestions=_freeze(_build_suggestions(emotion, tone, concerns)),
+            immediate_actions=_freeze(_build_immediate_actions(emotion, tone)),
+            support_resources=_freeze(_build_support_resources(emotion, concerns))
+        )
+
+
+# Global instance - built once at import
+fallback_recommendations = FallbackRecommendationTable()
@@ -0,0 +1,226 @@
+"""
+Gemini Stub Backend
+Offline stand-in for google.generativeai.GenerativeModel used for load and
+fault-injection testing without spending Gemini quota
+
+Enable with GEMINI_BACKEND=stub
+"""
+
+import os
+import json
+import math
+import time
+import random
+import threading
+
+
+class StubUpstreamError(RuntimeError):
+    """Injected upstream failure"""
+
+
+class _StubPart:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StubCandidate:
+    def __init__(self, finish_reason):
+        self.finish_reason = finish_reason
+
+
+class _StubUsage:
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+def _tokens(text):
+    """Approximate token count (~4 characters per token)"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class StubResponse:
+    """Mimics the parts of GenerateContentResponse that AIRecommendationService reads"""
+
+    def __init__(self, text=None, finish_reason='STOP', usage=None):
+        self.parts = [_StubPart(text)] if text is not None else []
+        self.candidates = [_StubCandidate(finish_reason)]
+        self.usage_metadata = usage
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError('Response was blocked and has no text')
+        return self._text
+
+
+class StubGenerativeModel:
+    """GenerativeModel replacement with configurable latency, errors and malformed output"""
+
+    def __init__(self, model_name='gemini-stub'):
+        self.model_name = model_name
+        self.latency_ms = float(os.getenv('GEMINI_STUB_LATENCY_MS', '800'))
+        self.latency_sigma = float(os.getenv('GEMINI_STUB_LATENCY_SIGMA', '0.5'))
+        self.error_rate = float(os.getenv('GEMINI_STUB_ERROR_RATE', '0'))
+        self.malformed_rate = float(os.getenv('GEMINI_STUB_MALFORMED_RATE', '0'))
+        self.blocked_rate = float(os.getenv('GEMINI_STUB_BLOCKED_RATE', '0'))
+        self.fenced_rate = float(os.getenv('GEMINI_STUB_FENCED_RATE', '0.5'))
+
+        seed = os.getenv('GEMINI_STUB_SEED')
+        self._random = random.Random(int(seed) if seed else None)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _sample(self):
+        """Draw latency and fault outcome for one call"""
+        with self._lock:
+            self.calls += 1
+            # Log-normal latency with the configured median
+            latency = self.latency_ms / 1000 * math.exp(self._random.gauss(0, self.latency_sigma))
+            roll = self._random.random()
+            fenced = self._random.random() < self.fenced_rate
+
+        if roll < self.error_rate:
+            outcome = 'error'
+        elif roll < self.error_rate + self.blocked_rate:
+            outcome = 'blocked'
+        elif roll < self.error_rate + self.blocked_rate + self.malformed_rate:
+            outcome = 'malformed'
+        else:
+            outcome = 'ok'
+
+        return latency, outcome, fenced
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None,
+                         request_options=None, stream=False, **kwargs):
+        """
+        Return a schema-valid recommendation response after a simulated delay
+
+        Honors request_options['timeout'] like the real client by raising
+        TimeoutError once the sampled latency exceeds it. With stream=True the
+        response text is delivered as an iterator of chunks spread over the latency.
+        """
+        latency, outcome, fenced = self._sample()
+        timeout = (request_options or {}).get('timeout')
+        max_tokens = self._max_output_tokens(generation_config)
+
+        if stream:
+            return self._stream(prompt, latency, outcome, fenced, timeout, max_tokens)
+
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f'504 Deadline Exceeded (stub, {latency:.2f}s > {timeout:.2f}s)')
+
+        time.sleep(latency)
+
+        if outcome == 'error':
+            raise StubUpstreamError('503 Service Unavailable (stub)')
+
+        if outcome == 'blocked':
+            return StubResponse(finish_reason='SAFETY', usage=_StubUsage(_tokens(prompt), 0))
+
+        text, finish_reason = self._render(prompt, outcome, fenced, max_tokens)
+        return StubResponse(text, finish_reason, usage=_StubUsage(_tokens(prompt), _tokens(text)))
+
+    @staticmethod
+    def _max_output_tokens(generation_config):
+        """Read max_output_tokens from a GenerationConfig object or dict"""
+        if generation_config is None:
+            return None
+        if isinstance(generation_config, dict):
+            return generation_config.get('max_output_tokens')
+        return getattr(generation_config, 'max_output_tokens', None)
+
+    def _stream(self, prompt, latency, outcome, fenced, timeout, max_tokens=None, chunk_size=40):
+        """Yield the response text in chunks, sleeping so the whole stream takes `latency`"""
+        if outcome == 'blocked':
+            # Like the real API, a blocked stream ends with an empty SAFETY chunk
+            time.sleep(min(latency, timeout or latency))
+            yield StubResponse(finish_reason='SAFETY', usage=_StubUsage(_tokens(prompt), 0))
+            return
+
+        text, finish_reason = self._render(prompt, outcome, fenced, max_tokens)
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        delay = latency / len(chunks)
+        elapsed = 0.0
+
+        for index, chunk in enumerate(chunks):
+            if timeout is not None and elapsed + delay > timeout:
+                time.sleep(max(0.0, timeout - elapsed))
+                raise TimeoutError('504 Deadline Exceeded (stub stream)')
+
+            time.sleep(delay)
+            elapsed += delay
+
+            if outcome == 'error' and index >= len(chunks) // 2:
+                raise StubUpstreamError('503 Service Unavailable (stub stream)')
+
+            if index == len(chunks) - 1:
+                # Like the real API, the last chunk carries usage for the whole response
+                yield StubResponse(chunk, finish_reason, usage=_StubUsage(_tokens(prompt), _tokens(text)))
+            else:
+                yield StubResponse(chunk)
+
+    def _render(self, prompt, outcome, fenced, max_tokens=None):
+        """Serialize the stub content, applying malformed/fenced injection and the token cap"""
+        text = json.dumps(self._build_content(prompt), indent=2)
+        finish_reason = 'STOP'
+
+        if outcome == 'malformed':
+            # Cut the JSON off mid-object, as happens when output hits the token cap
+            text = text[:max(1, len(text) // 2)]
+
+        if fenced:
+            text = f"```json\n{text}\n```"
+
+        if max_tokens and _tokens(text) > max_tokens:
+            text = text[:max_tokens * 4]
+            finish_reason = 'MAX_TOKENS'
+
+        return text, finish_reason
+
+    @staticmethod
+    def _build_content(prompt):
+        """Build recommendation JSON in the schema the prompts request"""
+        crisis = 'calming techniques' in prompt
+
+        suggestions = [
+            {
+                'title': 'Grounding Technique' if crisis else 'Name What You Are Feeling',
+                'description': 'Use 5-4-3-2-1: Name 5 things you see, 4 you touch, 3 you hear, 2 you smell, 1 you taste.'
+                               if crisis else 'Write down the main emotion behind your words and what triggered it.',
+                'rationale': 'Stub response for offline testing.'
+            },
+            {
+                'title': 'Reach Out for Support',
+                'description': 'Talk to someone you trust about how you are feeling today.',
+                'rationale': 'Stub response for offline testing.'
+            },
+            {
+                'title': 'Take a Short Break',
+                'description': 'Step away for ten minutes and take a slow walk.',
+                'rationale': 'Stub response for offline testing.'
+            }
+        ]
+
+        immediate_actions = [
+            'Take 5 slow deep breaths',
+            'Drink a glass of water',
+            'Message someone you trust'
+        ]
+
+        if '"items"' in prompt:
+            # Multi-item prompt - answer every numbered item
+            count = prompt.count('### Item ')
+            return {
+                'items': [
+                    {'index': index, 'suggestions': suggestions, 'immediate_actions': immediate_actions}
+                    for index in range(count)
+                ]
+            }
+
+        return {
+            'suggestions': suggestions,
+            'immediate_actions': immediate_actions
+        }
@@ -0,0 +1,191 @@
+"""
+Deadline-Bounded Hedged Calls
+Run upstream calls under a deadline, optionally firing a second attempt when
+the first is slower than a recent latency percentile, and record per-attempt latency
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """Rolling window of per-attempt latencies with percentile lookups"""
+
+    def __init__(self, window=None):
+        self.window = int(window if window is not None else os.getenv('GEMINI_LATENCY_WINDOW', '200'))
+        self._latencies = deque(maxlen=self.window)
+        self._lock = threading.Lock()
+        self._outcomes = {}
+
+    def record(self, latency: float, outcome: str):
+        """Record one attempt's latency (seconds) and outcome ('ok', 'error', 'lost')"""
+        with self._lock:
+            if outcome in ('ok', 'lost'):
+                self._latencies.append(latency)
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the p-th percentile latency in seconds, or None with no samples"""
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._latencies)
+
+    def stats(self) -> Dict:
+        """Return sample count, outcome counters and p50/p95/p99 in milliseconds"""
+        stats = {'samples': len(self)}
+
+        with self._lock:
+            stats['outcomes'] = dict(self._outcomes)
+
+        for p in (50, 95, 99):
+            value = self.percentile(p)
+            stats[f'p{p}_ms'] = round(value * 1000, 1) if value is not None else None
+
+        return stats
+
+
+class HedgedExecutor:
+    """Run a call under a deadline with an optional hedged second attempt"""
+
+    def __init__(self, tracker: Optional[LatencyTracker] = None):
+        self.tracker = tracker or LatencyTracker()
+        self.hedging_enabled = os.getenv('GEMINI_HEDGING_ENABLED', 'false').lower() == 'true'
+        self.hedge_percentile = float(os.getenv('GEMINI_HEDGE_PERCENTILE', '95'))
+        self.hedge_min_samples = int(os.getenv('GEMINI_HEDGE_MIN_SAMPLES', '20'))
+        self.min_attempt_timeout = float(os.getenv('GEMINI_MIN_ATTEMPT_TIMEOUT', '0.5'))
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('GEMINI_HEDGE_WORKERS', '8')),
+            thread_name_prefix='gemini-attempt'
+        )
+        self._lock = threading.Lock()
+        self._stats = {'calls': 0, 'hedges_fired': 0, 'hedges_skipped': 0, 'hedge_wins': 0, 'deadline_exceeded': 0}
+
+    def call(self, fn: Callable[[float], object], deadline: float,
+             admit_hedge: Optional[Callable[[], bool]] = None):
+        """
+        Call fn(timeout) and return the first successful result before the deadline
+
+        The losing attempt is not interrupted: once running it keeps its worker
+        until it returns or its own timeout expires, and its result is discarded.
+
+        Args:
+            fn: Callable taking the remaining seconds as its per-attempt timeout
+            deadline: Absolute time.monotonic() value by which a result is needed
+            admit_hedge: Called just before a hedge would fire; returning False
+                         (e.g. no upstream quota to spare) skips the hedge
+
+        Returns:
+            Result of the winning attempt
+
+        Raises:
+            TimeoutError: If no attempt succeeds before the deadline
+            Exception: The last attempt's error if every attempt failed
+        """
+        with self._lock:
+            self._stats['calls'] += 1
+
+        remaining = deadline - time.monotonic()
+        if remaining < self.min_attempt_timeout:
+            self._count('deadline_exceeded')
+            raise TimeoutError('Request budget exhausted before upstream call')
+
+        winner = {'attempt': None}
+        futures = {self._submit(fn, remaining, 1, winner): 1}
+
+        hedge_delay = self._hedge_delay()
+        hedged = hedge_delay is None
+        last_error = None
+
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            wait_for = remaining if hedged else min(hedge_delay, remaining)
+            done, _ = wait(list(futures), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                attempt = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+
+                # First success wins. cancel() only stops an attempt that has not
+                # started yet - a running one finishes in the background, ignored
+                with self._lock:
+                    if winner['attempt'] is None:
+                        winner['attempt'] = attempt
+                for other in futures:
+                    other.cancel()
+                if attempt > 1:
+                    self._count('hedge_wins')
+                return result
+
+            if not done and not hedged:
+                hedged = True
+                remaining = deadline - time.monotonic()
+                if remaining >= self.min_attempt_timeout:
+                    if admit_hedge is not None and not admit_hedge():
+                        self._count('hedges_skipped')
+                    else:
+                        self._count('hedges_fired')
+                        futures[self._submit(fn, remaining, 2, winner)] = 2
+
+        if futures:
+            for future in futures:
+                future.cancel()
+            self._count('deadline_exceeded')
+            raise TimeoutError('Upstream call exceeded its deadline')
+
+        raise last_error
+
+    def _submit(self, fn, timeout, attempt, winner):
+        """Start one attempt, recording its latency and whether it won"""
+        def run():
+            start = time.monotonic()
+            try:
+                result = fn(timeout)
+            except Exception:
+                self.tracker.record(time.monotonic() - start, 'error')
+                raise
+
+            with self._lock:
+                lost = winner['attempt'] is not None and winner['attempt'] != attempt
+            self.tracker.record(time.monotonic() - start, 'lost' if lost else 'ok')
+            return result
+
+        return self._executor.submit(run)
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Latency after which a hedge fires, or None if hedging is off or untrained"""
+        if not self.hedging_enabled or len(self.tracker) < self.hedge_min_samples:
+            return None
+        return self.tracker.percentile(self.hedge_percentile)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict:
+        """Return hedging counters and attempt latency percentiles"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['hedging_enabled'] = self.hedging_enabled
+        stats['hedge_percentile'] = self.hedge_percentile
+        stats['latency'] = self.tracker.stats()
+        return stats
@@ -0,0 +1,275 @@
+"""
+Shared HTTP Client
+One pooled requests.Session for every extractor so repeat calls to the same
+host reuse keep-alive connections instead of paying a new TCP+TLS handshake,
+plus an aiohttp-based equivalent for the async extraction engine
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+import weakref
+from collections import defaultdict
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# The pooled-client singletons read HTTP_* settings at import
+load_dotenv()
+
+
+class HTTPClient:
+    """Keep-alive connection pools per host with split connect/read timeouts"""
+
+    def __init__(self):
+        # Number of hosts with a live pool, and connections kept per host
+        self.pool_hosts = int(os.getenv('HTTP_POOL_HOSTS', '16'))
+        self.pool_size = int(os.getenv('HTTP_POOL_SIZE', '10'))
+        self.connect_timeout = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+        self.read_timeout = float(os.getenv('HTTP_READ_TIMEOUT', '10'))
+
+        self._session = None
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: {'requests': 0, 'errors': 0, 'seconds': 0.0})
+
+    @property
+    def session(self) -> requests.Session:
+        """Session created on first request"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_hosts, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url: str, params=None, headers=None, timeout=None, **kwargs) -> requests.Response:
+        """
+        GET through the shared pools
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Extra request headers
+            timeout: Seconds or (connect, read); defaults to HTTP_CONNECT_TIMEOUT/HTTP_READ_TIMEOUT
+
+        Returns:
+            requests.Response
+        """
+        return self.request('GET', url, params=params, headers=headers, timeout=timeout, **kwargs)
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        """Send any request through the shared pools, recording per-host latency"""
+        host = urlsplit(url).hostname or ''
+        start = time.monotonic()
+
+        try:
+            return self.session.request(
+                method, url, timeout=timeout or (self.connect_timeout, self.read_timeout), **kwargs
+            )
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._latency[host]['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._latency[host]['requests'] += 1
+                self._latency[host]['seconds'] += time.monotonic() - start
+
+    def close(self):
+        """Drop every pooled connection"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def stats(self) -> Dict:
+        """Per-host request counts, new vs reused connections and average latency"""
+        hosts = {}
+
+        with self._lock:
+            for host, counters in self._latency.items():
+                requests_made = counters['requests']
+                hosts[host] = {
+                    'requests': requests_made,
+                    'errors': counters['errors'],
+                    'avg_latency_ms': round(counters['seconds'] / requests_made * 1000, 1) if requests_made else 0.0
+                }
+
+            session = self._session
+
+        if session is not None:
+            # urllib3 keeps one connection pool per (scheme, host, port)
+            pools = session.get_adapter('https://').poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = hosts.setdefault(pool.host, {'requests': 0, 'errors': 0, 'avg_latency_ms': 0.0})
+                host['new_connections'] = host.get('new_connections', 0) + pool.num_connections
+                host['pooled_requests'] = host.get('pooled_requests', 0) + pool.num_requests
+
+        for host in hosts.values():
+            if 'pooled_requests' in host:
+                host['reused_connections'] = max(0, host['pooled_requests'] - host['new_connections'])
+                host['reuse_rate'] = (
+                    round(host['reused_connections'] / host['pooled_requests'], 4) if host['pooled_requests'] else 0.0
+                )
+
+        return {
+            'pool_hosts': self.pool_hosts,
+            'pool_size': self.pool_size,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout,
+            'hosts': hosts
+        }
+
+
+class AsyncResponse:
+    """Fully-read aiohttp response with the requests.Response attributes extractors use"""
+
+    def __init__(self, url, status_code, headers, content, encoding=None):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        """Raise requests' HTTPError so sync and async callers handle failures the same way"""
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f'{self.status_code} Error for url: {self.url}', response=self)
+
+
+class AsyncHTTPClient:
+    """aiohttp sessions (one per event loop) with the same pool and timeout settings as HTTPClient"""
+
+    def __init__(self):
+        self.max_connections = int(os.getenv('HTTP_ASYNC_MAX_CONNECTIONS', '100'))
+        self.pool_size = int(os.getenv('HTTP_POOL_SIZE', '10'))
+        self.connect_timeout = float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05'))
+        self.read_timeout = float(os.getenv('HTTP_READ_TIMEOUT', '10'))
+
+        self._sessions = weakref.WeakKeyDictionary()   # event loop -> ClientSession
+        self._lock = threading.Lock()
+        self._hosts = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'seconds': 0.0, 'new_connections': 0, 'reused_connections': 0
+        })
+
+    def _session(self):
+        """Session for the running event loop, created on first use"""
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+
+        if session is None or session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_created)
+            trace.on_connection_reuseconn.append(self._on_connection_reused)
+
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+                trace_configs=[trace]
+            )
+            self._sessions[loop] = session
+
+        return session
+
+    async def _on_connection_created(self, session, context, params):
+        with self._lock:
+            self._hosts[context.trace_request_ctx['host']]['new_connections'] += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        with self._lock:
+            self._hosts[context.trace_request_ctx['host']]['reused_connections'] += 1
+
+    async def get(self, url: str, params=None, headers=None, timeout=None) -> AsyncResponse:
+        """
+        GET through the event loop's pooled session
+
+        Args:
+            url: Request URL
+            params: Query parameters (None values are dropped, as requests does)
+            headers: Extra request headers
+            timeout: Seconds or (connect, read); defaults to HTTP_CONNECT_TIMEOUT/HTTP_READ_TIMEOUT
+
+        Returns:
+            AsyncResponse with the body already read
+        """
+        import aiohttp
+
+        host = urlsplit(url).hostname or ''
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+
+        options = {'params': params, 'headers': headers, 'trace_request_ctx': {'host': host}}
+        if timeout is not None:
+            # Passing timeout=None to aiohttp would disable the session default entirely
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            options['timeout'] = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+        start = time.monotonic()
+        try:
+            async with self._session().get(url, **options) as response:
+                content = await response.read()
+                return AsyncResponse(str(response.url), response.status, response.headers, content,
+                                     response.get_encoding() if content else None)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            with self._lock:
+                self._hosts[host]['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._hosts[host]['requests'] += 1
+                self._hosts[host]['seconds'] += time.monotonic() - start
+
+    async def close(self):
+        """Close the running loop's session"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def stats(self) -> Dict:
+        """Per-host request counts, new vs reused connections and average latency"""
+        with self._lock:
+            hosts = {}
+            for host, counters in self._hosts.items():
+                counters = dict(counters)
+                requests_made = counters['requests']
+                connections = counters['new_connections'] + counters['reused_connections']
+                counters['avg_latency_ms'] = (
+                    round(counters.pop('seconds') / requests_made * 1000, 1) if requests_made else 0.0
+                )
+                counters['reuse_rate'] = round(counters['reused_connections'] / connections, 4) if connections else 0.0
+                hosts[host] = counters
+
+            return {
+                'max_connections': self.max_connections,
+                'pool_size': self.pool_size,
+                'event_loops': len(self._sessions),
+                'hosts': hosts
+            }
+
+
+# Global instances shared by every extractor
+http_client = HTTPClient()
+async_http_client = AsyncHTTPClient()
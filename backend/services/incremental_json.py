@@ -0,0 +1,115 @@
+"""
+Incremental JSON Parser for Streamed Recommendations
+Scans Gemini output as it arrives and emits each element of the
+"suggestions" and "immediate_actions" arrays as soon as it is complete
+"""
+
+import json
+from typing import Iterable, List, Tuple
+
+
+class IncrementalRecommendationParser:
+    """Character-level JSON scanner that yields completed array elements under tracked keys"""
+
+    def __init__(self, keys: Iterable[str] = ('suggestions', 'immediate_actions')):
+        self.keys = frozenset(keys)
+        self._text = ''
+        self._pos = 0
+
+        self._stack = []          # frames: {'type': '{' | '[', 'key': str|None, 'item_start': int|None}
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._pending_key = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, object]]:
+        """
+        Consume the next piece of model output
+
+        Args:
+            chunk: Newly received text (may split tokens anywhere)
+
+        Returns:
+            List of (key, element) pairs completed by this chunk
+        """
+        if not chunk:
+            return []
+
+        self._text += chunk
+        text = self._text
+        completed = []
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:i + 1]
+                    frame = self._tracked_array()
+                    if frame is not None and frame['item_start'] is None:
+                        # String element directly inside a tracked array
+                        self._emit(completed, frame['key'], self._last_string)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == ':':
+                if self._stack and self._stack[-1]['type'] == '{' and self._last_string:
+                    self._pending_key = self._decode(self._last_string)
+            elif c == ',':
+                self._pending_key = None
+            elif c == '{':
+                frame = self._tracked_array()
+                if frame is not None:
+                    frame['item_start'] = i
+                self._stack.append({'type': '{', 'key': None, 'item_start': None})
+            elif c == '[':
+                key = self._pending_key if self._stack and self._stack[-1]['type'] == '{' else None
+                self._stack.append({'type': '[', 'key': key, 'item_start': None})
+                self._pending_key = None
+            elif c in '}]':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if c == '}':
+                    frame = self._tracked_array()
+                    if frame is not None and frame['item_start'] is not None:
+                        self._emit(completed, frame['key'], text[frame['item_start']:i + 1])
+                        frame['item_start'] = None
+
+        self._pos = len(text)
+        return completed
+
+    def _tracked_array(self):
+        """Return the innermost frame if it is an array under a tracked key"""
+        if self._stack and self._stack[-1]['type'] == '[' and self._stack[-1]['key'] in self.keys:
+            return self._stack[-1]
+        return None
+
+    def _emit(self, completed, key, raw):
+        value = self._decode(raw)
+        if value is not None:
+            completed.append((key, value))
+
+    @staticmethod
+    def _decode(raw):
+        """Decode one JSON value, tolerating raw newlines inside strings"""
+        try:
+            return json.loads(raw)
+        except ValueError:
+            try:
+                return json.loads(raw.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t'))
+            except ValueError:
+                return None
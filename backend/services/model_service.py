@@ -3,25 +3,46 @@ DistilBERT Model Service for MindTrack AI
 Provides real-time mental health sentiment analysis using trained BERT model
 """
 
-import torch
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
 import os
+import threading
 from pathlib import Path
+from dotenv import load_dotenv
+
+# torch and transformers are imported inside load_model/predict - they dominate
+# process start time, so importing this module stays cheap until the model is needed
+
+# The singleton below reads MODEL_BATCH_SIZE at import, which can be before app.py loads .env
+load_dotenv()
 
 class ModelService:
     """Service for loading and running DistilBERT emotion classification model"""
     
     def __init__(self):
-        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.device = None
         self.model = None
         self.tokenizer = None
         self.model_loaded = False
         self.max_length = 128
+        self.batch_size = int(os.getenv('MODEL_BATCH_SIZE', '32'))
+        self._load_lock = threading.Lock()
+        self._load_attempted = False
         
         # Label mapping
         self.id2label = {0: "Normal", 1: "Stressed"}
         self.label2id = {"Normal": 0, "Stressed": 1}
         
+    def ensure_loaded(self):
+        """Load the model on first use; later calls return the cached outcome"""
+        if self._load_attempted:
+            return self.model_loaded
+        
+        with self._load_lock:
+            if not self._load_attempted:
+                self.load_model()
+                self._load_attempted = True
+        
+        return self.model_loaded
+    
     def load_model(self):
         """Load the trained DistilBERT model and tokenizer"""
         try:
@@ -36,6 +57,11 @@ class ModelService:
             
             print(f"🔄 Loading DistilBERT model from {model_path}...")
             
+            import torch
+            from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+            
+            self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+            
             # Load tokenizer
             self.tokenizer = DistilBertTokenizer.from_pretrained(str(model_path))
             
@@ -73,9 +99,11 @@ class ModelService:
         Returns:
             dict: Prediction results with sentiment, confidence, and probabilities
         """
-        if not self.model_loaded:
+        if not self.ensure_loaded():
             return None
         
+        import torch
+        
         try:
             # Tokenize input
             encoding = self.tokenizer(
@@ -123,19 +151,34 @@ class ModelService:
             print(f"❌ Error during prediction: {e}")
             return None
     
-    def predict_batch(self, texts):
+    def predict_batch(self, texts, batch_size=None):
         """
         Predict sentiment for multiple texts
         
         Args:
             texts (list): List of input texts
+            batch_size (int): Texts per forward pass (defaults to MODEL_BATCH_SIZE)
             
         Returns:
             list: List of prediction dictionaries
         """
-        if not self.model_loaded:
+        if not self.ensure_loaded():
             return [None] * len(texts)
         
+        batch_size = batch_size or self.batch_size
+        if len(texts) > batch_size:
+            # Bound tensor size by running fixed-size chunks
+            results = []
+            for start in range(0, len(texts), batch_size):
+                results.extend(self._predict_chunk(texts[start:start + batch_size]))
+            return results
+        
+        return self._predict_chunk(texts)
+    
+    def _predict_chunk(self, texts):
+        """Run a single batched forward pass"""
+        import torch
+        
         try:
             # Tokenize all texts
             encodings = self.tokenizer(
@@ -0,0 +1,178 @@
+"""
+Prompt and Output Token Budgeting
+Trims over-long user text to its most salient sentences, derives output token
+caps from the number of suggestions requested, and accounts tokens per call
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) for when usage metadata is missing"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def trim_to_salient_sentences(text: str, keywords: Optional[Iterable[str]], max_chars: int) -> str:
+    """
+    Shorten text to at most max_chars, keeping the sentences with the most keyword hits
+
+    Sentences keep their original order. The first sentence is always considered
+    first on ties so the opening context survives.
+
+    Args:
+        text: User text
+        keywords: Keyword hits already found by analyze_text_context
+        max_chars: Character budget for the trimmed text
+
+    Returns:
+        Original text if it fits, otherwise the selected sentences joined by spaces
+    """
+    if len(text) <= max_chars:
+        return text
+
+    sentences = [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence.strip()]
+    keywords = [keyword for keyword in (keywords or []) if keyword]
+
+    def score(sentence):
+        lowered = sentence.lower()
+        return sum(1 for keyword in keywords if keyword in lowered)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: (-score(sentences[i]), i))
+
+    selected = set()
+    used = 0
+    for i in ranked:
+        length = len(sentences[i]) + (1 if selected else 0)
+        if used + length > max_chars:
+            continue
+        selected.add(i)
+        used += length
+
+    if not selected:
+        # A single sentence is longer than the budget - hard cut the best one
+        return sentences[ranked[0]][:max_chars]
+
+    return ' '.join(sentences[i] for i in sorted(selected))
+
+
+class PromptBudget:
+    """Configurable input and output budgets for recommendation prompts"""
+
+    def __init__(self):
+        self.max_input_chars = int(os.getenv('GEMINI_MAX_INPUT_CHARS', '2000'))
+        self.suggestion_count = int(os.getenv('GEMINI_SUGGESTION_COUNT', '3'))
+        self.tokens_per_suggestion = int(os.getenv('GEMINI_TOKENS_PER_SUGGESTION', '250'))
+        self.output_token_overhead = int(os.getenv('GEMINI_OUTPUT_TOKEN_OVERHEAD', '400'))
+        # gemini-2.5-flash counts thinking tokens against max_output_tokens, so
+        # without this allowance the JSON answer can be cut off mid-object
+        self.thinking_tokens = int(os.getenv('GEMINI_THINKING_TOKENS', '1024'))
+
+        # Multi-item batched prompts
+        self.batch_max_items = int(os.getenv('GEMINI_BATCH_MAX_ITEMS', '10'))
+        self.batch_max_prompt_tokens = int(os.getenv('GEMINI_BATCH_MAX_PROMPT_TOKENS', '6000'))
+        self.batch_max_output_tokens = int(os.getenv('GEMINI_BATCH_MAX_OUTPUT_TOKENS', '8192'))
+
+    @property
+    def max_output_tokens(self) -> int:
+        """Output cap sized for the requested suggestions plus immediate actions, JSON framing and thinking"""
+        return self.thinking_tokens + self.output_token_overhead + self.suggestion_count * self.tokens_per_suggestion
+
+    def batch_output_tokens(self, items: int) -> int:
+        """Output cap for a batched prompt covering `items` texts"""
+        return self.thinking_tokens + self.output_token_overhead + items * (self.suggestion_count * self.tokens_per_suggestion + 100)
+
+    @property
+    def suggestion_phrase(self) -> str:
+        """How many suggestions to ask for, phrased for the prompt (e.g. '2-3')"""
+        if self.suggestion_count <= 1:
+            return '1'
+        return f"{self.suggestion_count - 1}-{self.suggestion_count}"
+
+    def trim_input(self, text: str, keywords: Optional[Iterable[str]] = None) -> str:
+        """Trim user text to the input budget using salient sentences"""
+        return trim_to_salient_sentences(text, keywords, self.max_input_chars)
+
+
+class TokenAccounting:
+    """Per-call and aggregate token and latency accounting for Gemini calls"""
+
+    def __init__(self, recent=20):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self._totals = {
+            'calls': 0,
+            'prompt_tokens': 0,
+            'output_tokens': 0,
+            'latency_seconds': 0.0,
+            'trimmed_inputs': 0,
+            'truncated': 0,
+            'estimated': 0
+        }
+
+    def record(self, prompt_tokens: int, output_tokens: int, latency: float,
+               trimmed: bool = False, estimated: bool = False, truncated: bool = False):
+        """Record one completed Gemini call (truncated: output stopped at max_output_tokens)"""
+        with self._lock:
+            self._totals['calls'] += 1
+            self._totals['prompt_tokens'] += prompt_tokens
+            self._totals['output_tokens'] += output_tokens
+            self._totals['latency_seconds'] += latency
+            self._totals['trimmed_inputs'] += int(trimmed)
+            self._totals['estimated'] += int(estimated)
+            self._totals['truncated'] += int(truncated)
+            self._recent.append({
+                'prompt_tokens': prompt_tokens,
+                'output_tokens': output_tokens,
+                'latency_ms': round(latency * 1000, 1),
+                'trimmed': trimmed,
+                'truncated': truncated
+            })
+
+        if truncated:
+            print(f"⚠️  Gemini output hit max_output_tokens ({output_tokens} tokens) - response may be cut off")
+
+    @staticmethod
+    def usage_from_response(response, prompt: str, output_text: str):
+        """
+        Read token counts from a Gemini response, estimating if usage metadata is absent
+
+        Thinking tokens count as output: they use up max_output_tokens and quota.
+
+        Returns:
+            (prompt_tokens, output_tokens, estimated)
+        """
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', None) if usage else None
+        output_tokens = getattr(usage, 'candidates_token_count', None) if usage else None
+
+        if prompt_tokens is None or output_tokens is None:
+            return estimate_tokens(prompt), estimate_tokens(output_text), True
+
+        thinking_tokens = getattr(usage, 'thoughts_token_count', None) or 0
+        return prompt_tokens, output_tokens + thinking_tokens, False
+
+    @staticmethod
+    def truncated(response) -> bool:
+        """True if the response stopped because it reached max_output_tokens"""
+        candidates = getattr(response, 'candidates', None)
+        if not candidates:
+            return False
+        finish_reason = candidates[0].finish_reason
+        return getattr(finish_reason, 'name', str(finish_reason)) == 'MAX_TOKENS'
+
+    def stats(self) -> Dict:
+        """Return totals, per-call averages and the most recent calls"""
+        with self._lock:
+            stats = dict(self._totals)
+            calls = stats['calls']
+            stats['avg_prompt_tokens'] = round(stats['prompt_tokens'] / calls, 1) if calls else 0.0
+            stats['avg_output_tokens'] = round(stats['output_tokens'] / calls, 1) if calls else 0.0
+            stats['avg_latency_ms'] = round(stats.pop('latency_seconds') / calls * 1000, 1) if calls else 0.0
+            stats['recent'] = list(self._recent)
+            return stats
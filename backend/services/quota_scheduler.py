@@ -0,0 +1,209 @@
+"""
+Quota Scheduler
+Local token buckets mirroring Gemini's per-minute request and token quotas.
+Calls queue briefly when the buckets run low, crisis analyses go first, and a
+call is only refused when its wait would run past the caller's deadline
+"""
+
+import os
+import time
+import heapq
+import itertools
+import threading
+from typing import Dict
+
+
+class TokenBucket:
+    """Bucket refilled continuously at capacity-per-minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` is available (call refill first)"""
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else float('inf')
+
+
+class QuotaScheduler:
+    """Priority queue in front of request/token buckets"""
+
+    CRISIS = 0
+    ROUTINE = 1
+
+    def __init__(self):
+        self.enabled = os.getenv('GEMINI_QUOTA_ENABLED', 'true').lower() == 'true'
+        self.requests_per_minute = float(os.getenv('GEMINI_RPM', '10'))
+        self.tokens_per_minute = float(os.getenv('GEMINI_TPM', '250000'))
+        # Time kept back from the deadline for the call itself
+        self.call_reserve = float(os.getenv('GEMINI_QUOTA_CALL_RESERVE', '2'))
+        self.max_queue = int(os.getenv('GEMINI_QUOTA_MAX_QUEUE', '100'))
+
+        self._requests = TokenBucket(self.requests_per_minute)
+        self._tokens = TokenBucket(self.tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queue = []          # heap of (priority, seq, tokens)
+        self._seq = itertools.count()
+        self._stats = {
+            'admitted': 0, 'queued': 0, 'rejected': 0, 'timed_out': 0,
+            'crisis_admitted': 0, 'upstream_rate_limited': 0, 'total_wait_seconds': 0.0, 'max_wait_seconds': 0.0
+        }
+
+    def acquire(self, tokens: int, deadline: float, priority: int = ROUTINE) -> bool:
+        """
+        Reserve one request and `tokens` tokens, waiting in line if needed
+
+        Args:
+            tokens: Estimated prompt + output tokens for the call
+            deadline: Absolute time.monotonic() the caller must finish by
+            priority: CRISIS or ROUTINE
+
+        Returns:
+            True once the quota is reserved, False if the wait would exceed the deadline
+        """
+        if not self.enabled:
+            return True
+
+        tokens = min(tokens, self._tokens.capacity)
+
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            entry = (priority, next(self._seq), tokens)
+
+            if not self._ahead_of(entry) and self._available(tokens):
+                self._take(entry, 0.0)
+                return True
+
+            wait = self._estimate_wait(entry)
+            if len(self._queue) >= self.max_queue or now + wait > deadline - self.call_reserve:
+                self._stats['rejected'] += 1
+                return False
+
+            heapq.heappush(self._queue, entry)
+            self._stats['queued'] += 1
+            enqueued = now
+
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                at_head = self._queue[0] is entry
+
+                if at_head and self._available(tokens):
+                    heapq.heappop(self._queue)
+                    self._take(entry, now - enqueued)
+                    self._cond.notify_all()
+                    return True
+
+                remaining = deadline - self.call_reserve - now
+                if remaining <= 0:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._stats['timed_out'] += 1
+                    self._cond.notify_all()
+                    return False
+
+                if at_head:
+                    remaining = min(remaining, max(self._requests.time_until(1), self._tokens.time_until(tokens)))
+                self._cond.wait(remaining)
+
+    def try_acquire(self, tokens: int, priority: int = ROUTINE) -> bool:
+        """
+        Reserve one request and `tokens` tokens only if they are free right now
+
+        Never queues or jumps the queue - used for optional extra calls such as hedges
+        """
+        if not self.enabled:
+            return True
+
+        tokens = min(tokens, self._tokens.capacity)
+
+        with self._cond:
+            self._refill(time.monotonic())
+            entry = (priority, next(self._seq), tokens)
+
+            if self._ahead_of(entry) or not self._available(tokens):
+                return False
+
+            self._take(entry, 0.0)
+            return True
+
+    def settle(self, reserved: int, used: int):
+        """Correct the token bucket once actual usage is known"""
+        if not self.enabled:
+            return
+        with self._cond:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved - used)
+            self._cond.notify_all()
+
+    def release(self, reserved: int):
+        """Return a reservation for a call that was never made"""
+        if not self.enabled:
+            return
+        with self._cond:
+            self._requests.level = min(self._requests.capacity, self._requests.level + 1)
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved)
+            self._cond.notify_all()
+
+    def rate_limited(self):
+        """Upstream returned 429 - drain the request bucket so queued calls wait for a refill"""
+        if not self.enabled:
+            return
+        with self._cond:
+            self._requests.level = min(self._requests.level, 0.0)
+            self._stats['upstream_rate_limited'] += 1
+
+    def _refill(self, now):
+        self._requests.refill(now)
+        self._tokens.refill(now)
+
+    def _available(self, tokens):
+        return self._requests.level >= 1 and self._tokens.level >= tokens
+
+    def _ahead_of(self, entry):
+        """Queued entries that go before `entry`"""
+        return [queued for queued in self._queue if queued[:2] < entry[:2]]
+
+    def _estimate_wait(self, entry):
+        """Seconds until the buckets cover everything queued ahead plus this entry"""
+        ahead = self._ahead_of(entry)
+        requests = len(ahead) + 1
+        tokens = sum(queued[2] for queued in ahead) + entry[2]
+        return max(self._requests.time_until(requests), self._tokens.time_until(tokens))
+
+    def _take(self, entry, waited):
+        """Consume the reservation (caller holds the lock)"""
+        priority, _, tokens = entry
+        self._requests.level -= 1
+        self._tokens.level -= tokens
+        self._stats['admitted'] += 1
+        if priority == self.CRISIS:
+            self._stats['crisis_admitted'] += 1
+        self._stats['total_wait_seconds'] += waited
+        self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+
+    def stats(self) -> Dict:
+        """Return bucket levels, queue depth and admission counters"""
+        with self._cond:
+            self._refill(time.monotonic())
+            stats = dict(self._stats)
+            admitted = stats['admitted']
+            stats['avg_wait_ms'] = round(stats.pop('total_wait_seconds') / admitted * 1000, 1) if admitted else 0.0
+            stats['max_wait_ms'] = round(stats.pop('max_wait_seconds') * 1000, 1)
+            stats.update({
+                'enabled': self.enabled,
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'requests_available': round(self._requests.level, 2),
+                'tokens_available': int(self._tokens.level),
+                'queue_depth': len(self._queue)
+            })
+            return stats
@@ -0,0 +1,208 @@
+"""
+Upstream Rate-Limit Budgets
+Reads the rate-limit headers Twitter, Reddit and Meta send on every response
+into per-endpoint budgets, so extractors can route to another method before
+an endpoint runs dry and return to it once its window resets
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+# rate_limits reads RATE_LIMIT_* at import, before app.py would load .env for it
+load_dotenv()
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitTracker:
+    """Per-endpoint remaining/reset state shared by every extractor"""
+
+    def __init__(self):
+        self.enabled = os.getenv('RATE_LIMIT_ROUTING_ENABLED', 'true').lower() == 'true'
+        # Requests kept in hand on count-based endpoints (Twitter, Reddit)
+        self.reserve = float(os.getenv('RATE_LIMIT_RESERVE', '1'))
+        # Meta reports usage as a percentage of the app's hourly allowance
+        self.meta_max_usage = float(os.getenv('RATE_LIMIT_META_MAX_USAGE', '90'))
+        self.meta_cooldown = float(os.getenv('RATE_LIMIT_META_COOLDOWN', '300'))
+        # Pause after a 429, or on a used-up budget, that carries no reset information
+        self.default_cooldown = float(os.getenv('RATE_LIMIT_DEFAULT_COOLDOWN', '60'))
+
+        self._lock = threading.Lock()
+        self._budgets = {}
+
+    def record(self, endpoint: str, response):
+        """
+        Update an endpoint's budget from a response
+
+        Understands x-rate-limit-* (Twitter, reset as epoch seconds),
+        x-ratelimit-* (Reddit, reset as seconds from now), x-app-usage /
+        x-business-use-case-usage (Meta, percentages) and Retry-After on 429s.
+
+        Args:
+            endpoint: Budget name, e.g. 'twitter.api_v2'
+            response: requests.Response or AsyncResponse
+        """
+        if not self.enabled or response is None:
+            return
+
+        headers = response.headers
+        now = time.monotonic()
+        update = None
+
+        if headers.get('x-rate-limit-remaining') is not None:
+            reset = _number(headers.get('x-rate-limit-reset'))
+            update = {
+                'limit': _number(headers.get('x-rate-limit-limit')),
+                'remaining': _number(headers.get('x-rate-limit-remaining')),
+                'reset_at': now + max(0.0, reset - time.time()) if reset is not None else None,
+                'reserve': self.reserve
+            }
+        elif headers.get('x-ratelimit-remaining') is not None:
+            remaining = _number(headers.get('x-ratelimit-remaining'))
+            used = _number(headers.get('x-ratelimit-used'))
+            reset = _number(headers.get('x-ratelimit-reset'))
+            update = {
+                'limit': remaining + used if remaining is not None and used is not None else None,
+                'remaining': remaining,
+                'reset_at': now + reset if reset is not None else None,
+                'reserve': self.reserve
+            }
+        else:
+            usage, regain_minutes = self._meta_usage(headers)
+            if usage is not None:
+                exhausted = usage >= self.meta_max_usage
+                if regain_minutes:
+                    reset_at = now + regain_minutes * 60
+                else:
+                    reset_at = now + self.meta_cooldown if exhausted else None
+                update = {
+                    'limit': 100.0,
+                    'remaining': max(0.0, 100.0 - usage),
+                    'reset_at': reset_at,
+                    'reserve': 100.0 - self.meta_max_usage
+                }
+
+        if update is not None and update['reset_at'] is None and update['remaining'] is not None \
+                and update['remaining'] <= update['reserve']:
+            # Without a reset time the budget would stay unavailable for good
+            update['reset_at'] = now + self.default_cooldown
+
+        if response.status_code == 429:
+            retry_after = _number(headers.get('Retry-After'))
+            update = update or {'limit': None, 'reserve': self.reserve}
+            update['remaining'] = 0.0
+            if retry_after is not None:
+                update['reset_at'] = now + retry_after
+            elif not update.get('reset_at') or update['reset_at'] <= now:
+                update['reset_at'] = now + self.default_cooldown
+
+        if update is None:
+            return
+
+        with self._lock:
+            budget = self._budgets.setdefault(endpoint, {'denied': 0, 'rate_limited': 0})
+            budget.update(update)
+            budget['updated'] = now
+            if response.status_code == 429:
+                budget['rate_limited'] += 1
+                print(f"⚠️  {endpoint} rate limited - routing around it for {budget['reset_at'] - now:.0f}s")
+
+    @staticmethod
+    def _meta_usage(headers):
+        """Highest usage percentage across Meta's usage headers, and minutes until access returns"""
+        usage = None
+        regain = None
+
+        for name in ('x-app-usage', 'x-ad-account-usage'):
+            try:
+                values = json.loads(headers.get(name) or 'null')
+            except ValueError:
+                continue
+            if isinstance(values, dict):
+                for value in values.values():
+                    if isinstance(value, (int, float)):
+                        usage = max(usage or 0.0, float(value))
+
+        try:
+            business = json.loads(headers.get('x-business-use-case-usage') or 'null')
+        except ValueError:
+            business = None
+        if isinstance(business, dict):
+            for entries in business.values():
+                for entry in entries if isinstance(entries, list) else []:
+                    for key in ('call_count', 'total_cputime', 'total_time'):
+                        if isinstance(entry.get(key), (int, float)):
+                            usage = max(usage or 0.0, float(entry[key]))
+                    if entry.get('estimated_time_to_regain_access'):
+                        regain = max(regain or 0, entry['estimated_time_to_regain_access'])
+
+        return usage, regain
+
+    def available(self, endpoint: str) -> bool:
+        """
+        True if the endpoint has budget beyond its reserve, or its window has reset
+
+        A False answer is counted as a routing decision in stats()
+        """
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            budget = self._budgets.get(endpoint)
+            if budget is None or budget['remaining'] is None:
+                return True
+
+            if budget['reset_at'] is not None and time.monotonic() >= budget['reset_at']:
+                return True
+
+            if budget['remaining'] > budget['reserve']:
+                return True
+
+            budget['denied'] += 1
+            return False
+
+    def retry_after(self, endpoint: str) -> float:
+        """Seconds until the endpoint's window resets (0 if unknown or already reset)"""
+        with self._lock:
+            budget = self._budgets.get(endpoint)
+            if not budget or budget['reset_at'] is None:
+                return 0.0
+            return max(0.0, budget['reset_at'] - time.monotonic())
+
+    def stats(self) -> Dict:
+        """Return each endpoint's remaining budget, time to reset and routing counters"""
+        now = time.monotonic()
+        with self._lock:
+            endpoints = {}
+            for endpoint, budget in self._budgets.items():
+                reset_in = budget['reset_at'] - now if budget['reset_at'] is not None else None
+                reset = reset_in is not None and reset_in <= 0
+                endpoints[endpoint] = {
+                    'limit': budget['limit'],
+                    'remaining': budget['remaining'],
+                    'reserve': budget['reserve'],
+                    'reset_in_seconds': round(reset_in, 1) if reset_in is not None and not reset else None,
+                    'available': reset or budget['remaining'] is None or budget['remaining'] > budget['reserve'],
+                    'denied': budget['denied'],
+                    'rate_limited': budget['rate_limited'],
+                    'updated_seconds_ago': round(now - budget['updated'], 1)
+                }
+
+            return {
+                'enabled': self.enabled,
+                'meta_max_usage': self.meta_max_usage,
+                'endpoints': endpoints
+            }
+
+
+# Global instance shared by every extractor
+rate_limits = RateLimitTracker()
@@ -0,0 +1,172 @@
+"""
+Persistent Recommendation Cache
+SQLite-backed cache for Gemini recommendations so identical prompts survive
+restarts and skip the upstream call entirely
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class RecommendationCache:
+    """On-disk cache with TTL and LRU size-based eviction"""
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        default_path = Path(__file__).parent.parent / '.cache' / 'recommendations.sqlite3'
+
+        self.enabled = os.getenv('RECOMMENDATION_CACHE_ENABLED', 'true').lower() == 'true'
+        self.path = str(path or os.getenv('RECOMMENDATION_CACHE_PATH', default_path))
+        self.ttl = float(ttl if ttl is not None else os.getenv('RECOMMENDATION_CACHE_TTL', '86400'))
+        self.max_entries = int(max_entries if max_entries is not None else os.getenv('RECOMMENDATION_CACHE_MAX_ENTRIES', '10000'))
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0, 'errors': 0}
+
+        if self.enabled:
+            try:
+                self._connect()
+            except Exception as e:
+                print(f"⚠️  Recommendation cache disabled - could not open {self.path}: {e}")
+                self.enabled = False
+
+    def _connect(self):
+        """Open the database and create the table if needed"""
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS recommendations ('
+            '  key TEXT PRIMARY KEY,'
+            '  value TEXT NOT NULL,'
+            '  created REAL NOT NULL,'
+            '  accessed REAL NOT NULL'
+            ')'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_recommendations_accessed ON recommendations (accessed)')
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, **params) -> str:
+        """
+        Build a cache key from everything that determines the model output
+
+        Args:
+            model_name: Gemini model name
+            prompt: Final prompt text sent to the model
+            **params: Generation settings such as temperature and max_output_tokens
+
+        Returns:
+            SHA-256 hex digest
+        """
+        payload = json.dumps({'model': model_name, 'prompt': prompt, 'params': params}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached value for key, or None on a miss or expiry"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    'SELECT value, created FROM recommendations WHERE key = ?', (key,)
+                ).fetchone()
+
+                if row is None:
+                    self._stats['misses'] += 1
+                    return None
+
+                value, created = row
+
+                if now - created > self.ttl:
+                    self._conn.execute('DELETE FROM recommendations WHERE key = ?', (key,))
+                    self._stats['expired'] += 1
+                    self._stats['misses'] += 1
+                    return None
+
+                self._conn.execute('UPDATE recommendations SET accessed = ? WHERE key = ?', (now, key))
+                self._stats['hits'] += 1
+                return json.loads(value)
+
+            except Exception as e:
+                self._stats['errors'] += 1
+                print(f"⚠️  Recommendation cache read failed: {e}")
+                return None
+
+    def set(self, key: str, value: Dict):
+        """Store value under key, evicting expired and least-recently-used entries"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO recommendations (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), now, now)
+                )
+                self._stats['writes'] += 1
+                self._evict(now)
+
+            except Exception as e:
+                self._stats['errors'] += 1
+                print(f"⚠️  Recommendation cache write failed: {e}")
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used rows over max_entries"""
+        expired = self._conn.execute(
+            'DELETE FROM recommendations WHERE created < ?', (now - self.ttl,)
+        ).rowcount
+
+        count = self._conn.execute('SELECT COUNT(*) FROM recommendations').fetchone()[0]
+        overflow = count - self.max_entries
+
+        if overflow > 0:
+            self._conn.execute(
+                'DELETE FROM recommendations WHERE key IN ('
+                '  SELECT key FROM recommendations ORDER BY accessed ASC LIMIT ?'
+                ')',
+                (overflow,)
+            )
+
+        self._stats['evictions'] += max(0, expired) + max(0, overflow)
+
+    def clear(self):
+        """Remove every cached entry"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._conn.execute('DELETE FROM recommendations')
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters, hit rate and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['enabled'] = self.enabled
+
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+
+            if self.enabled:
+                try:
+                    stats['entries'] = self._conn.execute('SELECT COUNT(*) FROM recommendations').fetchone()[0]
+                except Exception:
+                    stats['entries'] = None
+
+            stats['max_entries'] = self.max_entries
+            stats['ttl_seconds'] = self.ttl
+
+            return stats
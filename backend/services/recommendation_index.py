@@ -0,0 +1,296 @@
+"""
+Retrieval Recommendation Index
+Sparse TF-IDF index over vetted suggestions - the fallback library plus past
+Gemini outputs - so requests close to one already answered are served locally
+and Gemini is only called when no confident match exists. A Gemini answer is
+only reused for a request with the same emotion and concern labels
+"""
+
+import os
+import re
+import math
+import time
+import threading
+from collections import Counter, defaultdict, namedtuple
+from typing import Dict, List, Optional
+
+from services.fallback_recommendations import fallback_recommendations
+
+WORD = re.compile(r"[a-z][a-z']+")
+
+STOPWORDS = frozenset("""
+about after again all also and any are because been before being but can cant could did does doing dont
+down during each even feel feeling few for from get got had has have having her here hers him his how
+into its just like more most much myself not now off once only other our out over own really same she
+should some such than that the their them then there these they this those through too under until very
+was way were what when where which while who why will with would you your yours
+""".split())
+
+# Emotion/tone/concern labels outweigh individual words
+LABEL_WEIGHT = 2.0
+
+# labels: emotion/concern labels a Gemini answer was written for (None for library suggestions)
+RetrievalEntry = namedtuple('RetrievalEntry', ['suggestion', 'immediate_actions', 'source', 'labels'])
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase content words with possessives and plural 's' stripped"""
+    if not text:
+        return []
+    words = []
+    for word in WORD.findall(text.lower()):
+        word = word.replace("'", '')
+        if len(word) < 3 or word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+
+def context_features(text=None, sentiment=None, emotions=None, concerns=None, tone=None,
+                     salient_keywords=None) -> Counter:
+    """Feature counts for an analysis context (shared by queries and learned entries)"""
+    features = Counter(tokenize(text))
+    for keyword in salient_keywords or []:
+        features.update(tokenize(keyword))
+
+    labels = [f'sentiment={sentiment.lower()}'] if sentiment else []
+    labels += [f'emotion={emotion.lower()}' for emotion in emotions or []]
+    labels += [f'concern={concern.lower()}' for concern in concerns or []]
+    labels += [f'tone={flag.lower()}' for flag in tone or []]
+    for label in labels:
+        features[label] += LABEL_WEIGHT
+
+    return features
+
+
+def context_labels(emotions=None, concerns=None) -> frozenset:
+    """Emotion and concern labels a reused Gemini answer must match exactly"""
+    return frozenset(
+        [f'emotion={emotion.lower()}' for emotion in emotions or []]
+        + [f'concern={concern.lower()}' for concern in concerns or []]
+    )
+
+
+def suggestion_features(suggestion: Dict) -> Counter:
+    """Feature counts for a suggestion's own wording"""
+    features = Counter()
+    for field in ('title', 'description', 'rationale'):
+        features.update(tokenize(suggestion.get(field)))
+    return features
+
+
+class RecommendationIndex:
+    """In-memory inverted index; each entry is a single suggestion with its context"""
+
+    def __init__(self):
+        self.enabled = os.getenv('RECOMMENDATION_RETRIEVAL_ENABLED', 'true').lower() == 'true'
+        self.min_score = float(os.getenv('RECOMMENDATION_RETRIEVAL_MIN_SCORE', '0.55'))
+        self.max_entries = int(os.getenv('RECOMMENDATION_RETRIEVAL_MAX_ENTRIES', '50000'))
+
+        self._lock = threading.RLock()
+        self._built = False
+        self._entries = []
+        self._norms = []
+        self._postings = defaultdict(list)     # term -> [(entry_id, weight)]
+        self._idf = {}
+        self._default_idf = 1.0
+        self._stats = {'searches': 0, 'hits': 0, 'misses': 0, 'added': 0, 'search_seconds': 0.0, 'build_ms': 0.0}
+
+    def build(self):
+        """
+        Index the fallback library
+
+        Results in the recommendation cache are not indexed: they are stored
+        without the labels they were written for, so they could not be matched
+        safely. IDF weights are fixed here; entries added later reuse them,
+        with unseen terms weighted as the rarest term.
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if self._built:
+                return
+
+            start = time.perf_counter()
+            documents = list(self._library_documents())
+
+            document_frequency = Counter()
+            for features, _ in documents:
+                document_frequency.update(features.keys())
+
+            total = len(documents)
+            self._idf = {term: math.log((1 + total) / (1 + count)) + 1 for term, count in document_frequency.items()}
+            self._default_idf = math.log(1 + total) + 1
+
+            for features, entry in documents[:self.max_entries]:
+                self._insert(features, entry)
+
+            self._built = True
+            self._stats['build_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            print(f"✓ Recommendation index built ({len(self._entries)} entries, {self._stats['build_ms']:.0f} ms)")
+
+    def search(self, text, sentiment, confidence=None, emotions=None, concerns=None, tone=None,
+               salient_keywords=None, k=3) -> Optional[Dict]:
+        """
+        Find the k best-matching distinct suggestions for an analysis context
+
+        Gemini answers are skipped unless their emotion and concern labels
+        equal the query's.
+
+        Returns:
+            Recommendation result shaped like AIRecommendationService output, or
+            None when the k-th match scores below RECOMMENDATION_RETRIEVAL_MIN_SCORE
+        """
+        if not self.enabled:
+            return None
+
+        self.build()
+        start = time.perf_counter()
+        query = self._weigh(context_features(text, sentiment, emotions, concerns, tone, salient_keywords))
+        labels = context_labels(emotions, concerns)
+
+        with self._lock:
+            query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+            scores = defaultdict(float)
+            for term, weight in query.items():
+                for entry_id, entry_weight in self._postings.get(term, ()):
+                    scores[entry_id] += weight * entry_weight
+
+            ranked = sorted(
+                ((score / (query_norm * self._norms[entry_id]), entry_id) for entry_id, score in scores.items()),
+                reverse=True
+            ) if query_norm else []
+
+            matches = []
+            titles = set()
+            for score, entry_id in ranked:
+                entry = self._entries[entry_id]
+                if entry.labels is not None and entry.labels != labels:
+                    # Written for a different situation
+                    continue
+                title = entry.suggestion.get('title', '').lower()
+                if title in titles:
+                    continue
+                titles.add(title)
+                matches.append((score, entry))
+                if len(matches) == k:
+                    break
+
+            self._stats['searches'] += 1
+            self._stats['search_seconds'] += time.perf_counter() - start
+
+            if len(matches) < k or matches[-1][0] < self.min_score:
+                self._stats['misses'] += 1
+                return None
+
+            self._stats['hits'] += 1
+
+        immediate_actions = next((list(entry.immediate_actions) for _, entry in matches if entry.immediate_actions), [])
+        return {
+            'suggestions': [dict(entry.suggestion) for _, entry in matches],
+            'immediate_actions': immediate_actions,
+            'ai_generated': False,
+            'recommendation_source': 'retrieval',
+            'retrieval_score': round(matches[-1][0], 4)
+        }
+
+    def add(self, result: Dict, text=None, sentiment=None, confidence=None, emotions=None, concerns=None,
+            tone=None, salient_keywords=None):
+        """Index a fresh Gemini result together with the context that produced it"""
+        if not self.enabled or not result:
+            return
+
+        self.build()
+        context = context_features(text, sentiment, emotions, concerns, tone, salient_keywords)
+        labels = context_labels(emotions, concerns)
+
+        with self._lock:
+            for features, entry in self._result_documents(result, context, labels):
+                if len(self._entries) >= self.max_entries:
+                    return
+                self._insert(features, entry)
+                self._stats['added'] += 1
+
+    def _library_documents(self):
+        """
+        One document per distinct fallback suggestion
+
+        A suggestion is labelled with every emotion that produces it, and with a
+        tone or concern flag only if it never appears without that flag.
+        """
+        contexts = {}
+        for emotion, tone, concerns, entry in fallback_recommendations.entries():
+            for suggestion in entry.suggestions:
+                title = suggestion['title']
+                if title not in contexts:
+                    contexts[title] = {
+                        'suggestion': suggestion,
+                        'immediate_actions': entry.immediate_actions,
+                        'emotions': set(),
+                        'tone': set(tone),
+                        'concerns': set(concerns)
+                    }
+                context = contexts[title]
+                context['emotions'].add(emotion)
+                context['tone'] &= set(tone)
+                context['concerns'] &= set(concerns)
+
+        for context in contexts.values():
+            features = suggestion_features(context['suggestion'])
+            features.update(context_features(
+                emotions=sorted(context['emotions']),
+                concerns=sorted(context['concerns']),
+                tone=sorted(context['tone'])
+            ))
+            yield features, RetrievalEntry(context['suggestion'], context['immediate_actions'], 'library', None)
+
+    @staticmethod
+    def _result_documents(result, context: Counter, labels: frozenset):
+        """One document per well-formed suggestion in a Gemini result"""
+        immediate_actions = tuple(
+            action for action in result.get('immediate_actions') or [] if isinstance(action, str)
+        )
+        for suggestion in result.get('suggestions') or []:
+            if not isinstance(suggestion, dict) or not suggestion.get('title') or not suggestion.get('description'):
+                continue
+            features = suggestion_features(suggestion)
+            features.update(context)
+            yield features, RetrievalEntry(suggestion, immediate_actions, 'gemini', labels)
+
+    def _weigh(self, features: Counter) -> Dict[str, float]:
+        """Sublinear TF x IDF"""
+        return {
+            term: (1 + math.log(count)) * self._idf.get(term, self._default_idf)
+            for term, count in features.items() if count > 0
+        }
+
+    def _insert(self, features: Counter, entry: RetrievalEntry):
+        """Add one document to the postings (caller holds the lock)"""
+        vector = self._weigh(features)
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not norm:
+            return
+
+        entry_id = len(self._entries)
+        self._entries.append(entry)
+        self._norms.append(norm)
+        for term, weight in vector.items():
+            self._postings[term].append((entry_id, weight))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Return index size by source, hit rate and average search latency"""
+        with self._lock:
+            stats = dict(self._stats)
+            searches = stats['searches']
+            stats['avg_search_ms'] = round(stats.pop('search_seconds') / searches * 1000, 2) if searches else 0.0
+            stats['hit_rate'] = round(stats['hits'] / searches, 4) if searches else 0.0
+            stats['enabled'] = self.enabled
+            stats['min_score'] = self.min_score
+            stats['entries'] = dict(Counter(entry.source for entry in self._entries))
+            return stats
@@ -0,0 +1,161 @@
+"""
+Deferred Recommendation Jobs
+Runs Gemini recommendation generation in the background so the classifier
+result can be returned immediately and suggestions delivered later
+"""
+
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+
+class RecommendationJobService:
+    """Track background recommendation jobs and resolve them with a fallback on timeout"""
+
+    def __init__(self):
+        self.max_workers = int(os.getenv('RECOMMENDATION_JOB_WORKERS', '4'))
+        self.timeout = float(os.getenv('RECOMMENDATION_JOB_TIMEOUT', '20'))
+        self.ttl = float(os.getenv('RECOMMENDATION_JOB_TTL', '600'))
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='recommendation-job'
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, generate: Callable[[], Optional[Dict]], fallback: Callable[[], Dict]) -> str:
+        """
+        Start a recommendation job in the background
+
+        Args:
+            generate: Callable returning AI recommendations, or None on failure
+            fallback: Callable returning hardcoded recommendations
+
+        Returns:
+            Job ID to poll or stream
+        """
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'created': time.time(),
+            'future': self._executor.submit(generate),
+            'fallback': fallback,
+            'status': 'pending',
+            'result': None
+        }
+
+        with self._lock:
+            self._jobs[job_id] = job
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get the current state of a job without blocking
+
+        Args:
+            job_id: Job ID returned by submit()
+
+        Returns:
+            Job snapshot with status ('pending', 'complete', 'fallback', 'timeout')
+            and recommendations once resolved, or None if the job is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if not job:
+            return None
+
+        self._resolve(job)
+        return self._snapshot(job)
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """
+        Block until a job resolves or the wait timeout elapses
+
+        Args:
+            job_id: Job ID returned by submit()
+            timeout: Maximum seconds to wait during this call
+
+        Returns:
+            Job snapshot, or None if the job is unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if not job:
+            return None
+
+        remaining = job['created'] + self.timeout - time.time()
+        wait_for = max(0.0, min(timeout, remaining))
+
+        try:
+            job['future'].result(timeout=wait_for)
+        except Exception:
+            # Timeouts and generation errors are both handled by _resolve
+            pass
+
+        self._resolve(job)
+        return self._snapshot(job)
+
+    def _resolve(self, job: Dict):
+        """Move a job to its final state if it has finished or timed out"""
+        with self._lock:
+            if job['status'] != 'pending':
+                return
+
+            future = job['future']
+
+            if future.done():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"❌ Recommendation job {job['id']} failed: {e}")
+                    result = None
+
+                if result:
+                    job['result'] = result
+                    job['status'] = 'complete'
+                else:
+                    job['result'] = job['fallback']()
+                    job['status'] = 'fallback'
+
+            elif time.time() - job['created'] > self.timeout:
+                # Running calls can't be interrupted, but queued ones are dropped
+                future.cancel()
+                print(f"⚠️  Recommendation job {job['id']} timed out - using fallback recommendations")
+                job['result'] = job['fallback']()
+                job['status'] = 'timeout'
+
+    def _snapshot(self, job: Dict) -> Dict:
+        """Build the public view of a job"""
+        snapshot = {
+            'job_id': job['id'],
+            'status': job['status'],
+            'elapsed_ms': int((time.time() - job['created']) * 1000)
+        }
+
+        if job['result'] is not None:
+            snapshot['ai_suggestions'] = job['result'].get('suggestions', [])
+            snapshot['immediate_actions'] = job['result'].get('immediate_actions', [])
+            snapshot['ai_generated'] = job['result'].get('ai_generated', False)
+
+        return snapshot
+
+    def _prune(self):
+        """Forget jobs older than the configured TTL"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job['created'] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+
+# Global instance
+recommendation_jobs = RecommendationJobService()
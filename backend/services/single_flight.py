@@ -0,0 +1,84 @@
+"""
+Single-Flight Call Coalescing
+Concurrent callers asking for the same key share one in-flight call instead
+of each hitting the upstream service
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+
+class _Call:
+    """One in-flight call and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls keyed by a string"""
+
+    def __init__(self, max_waiters=None, wait_timeout=None):
+        self.max_waiters = int(max_waiters if max_waiters is not None else os.getenv('SINGLE_FLIGHT_MAX_WAITERS', '50'))
+        self.wait_timeout = float(wait_timeout if wait_timeout is not None else os.getenv('SINGLE_FLIGHT_WAIT_TIMEOUT', '30'))
+
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'leaders': 0, 'coalesced': 0, 'rejected': 0, 'timeouts': 0}
+
+    def do(self, key: str, fn: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """
+        Run fn once per key across concurrent callers
+
+        The first caller runs fn; callers arriving while it is in flight wait for
+        its result. Callers beyond max_waiters, or whose wait exceeds wait_timeout,
+        get None so they can use fallback recommendations instead of queueing.
+
+        Args:
+            key: Identity of the call (e.g. recommendation cache key)
+            fn: Zero-argument callable performing the call
+
+        Returns:
+            Result of fn, or None
+        """
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['leaders'] += 1
+                leader = True
+            elif call.waiters >= self.max_waiters:
+                self._stats['rejected'] += 1
+                return None
+            else:
+                call.waiters += 1
+                self._stats['coalesced'] += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(self.wait_timeout):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                return None
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Return coalescing counters and current in-flight count"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._calls)
+            stats['max_waiters'] = self.max_waiters
+            return stats
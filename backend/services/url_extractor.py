@@ -3,14 +3,18 @@ Main URL Extractor Service
 Coordinates extraction from different social media platforms
 """
 
-from typing import Dict
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+import asyncio
+import queue
 import sys
 import os
+import time
+import weakref
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.validators import URLValidator
+from utils.url_canonicalizer import canonicalize
 from services.extractors import (
     TwitterExtractor, 
     RedditExtractor,
@@ -18,6 +22,23 @@ from services.extractors import (
     ThreadsExtractor,
     FacebookExtractor
 )
+from services.async_engine import async_engine
+from services.extraction_cache import ExtractionCache
+from services.extraction_race import method_racer
+from services.apify_jobs import ApifyJobService
+from services.extractors.reddit import INFO_BATCH_SIZE
+
+# Default in-flight extractions per platform for async/bulk extraction
+# (override with EXTRACTION_CONCURRENCY_<PLATFORM>, e.g. EXTRACTION_CONCURRENCY_REDDIT=2)
+PLATFORM_CONCURRENCY = {
+    'twitter': 4,
+    'reddit': 4,
+    'instagram': 2,
+    'threads': 4,
+    'facebook': 4,
+}
+
+_DONE = object()
 
 class URLExtractorService:
     """Main service to extract content from social media URLs"""
@@ -31,6 +52,16 @@ class URLExtractorService:
             'threads': ThreadsExtractor(),
             'facebook': FacebookExtractor(),
         }
+        self.max_concurrency = int(os.getenv('EXTRACTION_MAX_CONCURRENCY', '100'))
+        self.platform_concurrency = {
+            platform: int(os.getenv(f'EXTRACTION_CONCURRENCY_{platform.upper()}', str(limit)))
+            for platform, limit in PLATFORM_CONCURRENCY.items()
+        }
+        # Semaphores belong to an event loop, so keep one set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.cache = ExtractionCache()
+        # Background Apify scrapes for Instagram (results land in the cache above)
+        self.apify_jobs = ApifyJobService(self.extractors['instagram'], self.cache)
     
     def extract(self, url: str) -> Dict:
         """
@@ -42,37 +73,262 @@ class URLExtractorService:
         Returns:
             Dictionary with extracted data and metadata
         """
+        target, extractor, error = self._route(url)
+        if error:
+            return error
+        
+        cached = self.cache.get(target.key)
+        if cached is not None:
+            return cached
+        
+        # Extract content using appropriate extractor. Racing fallback methods
+        # needs an event loop, so hand the call to the shared one
+        if method_racer.enabled:
+            result = async_engine.run(extractor.extract_async(target.url))
+        else:
+            result = extractor.extract(target.url)
+        self.cache.set(target.key, target.platform, result)
+        return result
+    
+    async def extract_async(self, url: str, include_comments: bool = False) -> Dict:
+        """
+        Async version of extract - runs on the caller's event loop and waits
+        for a slot under the platform's concurrency cap
+        
+        Args:
+            url: Social media post URL
+            include_comments: Fetch the comment thread too (Reddit only)
+            
+        Returns:
+            Dictionary with extracted data and metadata
+        """
+        target, extractor, error = self._route(url)
+        if error:
+            return error
+        
+        # Cached entries never carry comments, so those requests always go upstream
+        with_comments = include_comments and target.platform == 'reddit'
+        
+        if not with_comments:
+            cached = self.cache.get(target.key)
+            if cached is not None:
+                return cached
+        
+        async with self._platform_semaphore(target.platform):
+            if with_comments:
+                return await extractor.extract_async(target.url, include_comments=True)
+            result = await extractor.extract_async(target.url)
+        self.cache.set(target.key, target.platform, result)
+        return result
+    
+    async def extract_reddit_batch_async(self, urls: List[str]) -> List[Dict]:
+        """
+        Resolve Reddit post URLs with batched /api/info.json lookups
+        
+        Cached posts are answered from the cache; the rest share one request
+        per 100 posts instead of one thread download each.
+        
+        Args:
+            urls: Reddit post URLs
+            
+        Returns:
+            Results aligned with urls
+        """
+        results = [None] * len(urls)
+        pending = {}
+        
+        for index, url in enumerate(urls):
+            target, extractor, error = self._route(url)
+            if error:
+                results[index] = error
+                continue
+            cached = self.cache.get(target.key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.setdefault(target.key, (target, []))[1].append(index)
+        
+        if pending:
+            targets = [target for target, _ in pending.values()]
+            async with self._platform_semaphore('reddit'):
+                batch = await self.extractors['reddit'].extract_batch_async([target.url for target in targets])
+            
+            for target, result in zip(targets, batch):
+                self.cache.set(target.key, target.platform, result)
+                for index in pending[target.key][1]:
+                    results[index] = result
+        
+        return results
+    
+    async def extract_many_async(self, urls: List[str], concurrency: Optional[int] = None,
+                                 include_comments: bool = False) -> List[Dict]:
+        """
+        Extract many URLs concurrently on one event loop
+        
+        Args:
+            urls: Social media post URLs
+            concurrency: Maximum extractions in flight (defaults to EXTRACTION_MAX_CONCURRENCY)
+            include_comments: Fetch Reddit comment threads too
+            
+        Returns:
+            Results aligned with urls
+        """
+        results = [None] * len(urls)
+        async for item in self.iter_extract_many_async(urls, concurrency, include_comments):
+            results[item['index']] = item['result']
+        return results
+    
+    async def iter_extract_many_async(self, urls: List[str], concurrency: Optional[int] = None,
+                                      include_comments: bool = False) -> AsyncIterator[Dict]:
+        """
+        Extract many URLs concurrently, yielding each result as soon as it finishes
+        
+        Reddit posts are looked up INFO_BATCH_SIZE at a time unless comments
+        are requested; every URL in a batch is yielded when the batch returns.
+        
+        Args:
+            urls: Social media post URLs
+            concurrency: Maximum extractions in flight (defaults to EXTRACTION_MAX_CONCURRENCY);
+                         per-platform caps apply on top of this
+            include_comments: Fetch Reddit comment threads too (one request per post)
+            
+        Yields:
+            {'index', 'url', 'platform', 'result', 'elapsed_ms'} in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+        
+        def item(index, url, result, start):
+            target = canonicalize(url)
+            return {
+                'index': index,
+                'url': url,
+                'platform': target.platform if target else None,
+                'result': result,
+                'elapsed_ms': round((time.monotonic() - start) * 1000, 1)
+            }
+        
+        async def extract_one(index, url):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    result = await self.extract_async(url, include_comments)
+                except Exception as e:
+                    result = {
+                        'success': False,
+                        'error': f'Extraction failed: {str(e)}',
+                        'url': url
+                    }
+                return [item(index, url, result, start)]
+        
+        async def extract_reddit(batch):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    results = await self.extract_reddit_batch_async([url for _, url in batch])
+                except Exception as e:
+                    results = [{
+                        'success': False,
+                        'error': f'Extraction failed: {str(e)}',
+                        'url': url
+                    } for _, url in batch]
+                return [item(index, url, result, start) for (index, url), result in zip(batch, results)]
+        
+        tasks = []
+        reddit = []
+        for index, url in enumerate(urls):
+            target = canonicalize(url) if isinstance(url, str) else None
+            if not include_comments and target and target.platform == 'reddit' and 'reddit' in self.extractors:
+                reddit.append((index, url))
+            else:
+                tasks.append(asyncio.ensure_future(extract_one(index, url)))
+        tasks.extend(
+            asyncio.ensure_future(extract_reddit(reddit[i:i + INFO_BATCH_SIZE]))
+            for i in range(0, len(reddit), INFO_BATCH_SIZE)
+        )
+        
+        try:
+            for task in asyncio.as_completed(tasks):
+                for finished in await task:
+                    yield finished
+        finally:
+            # Consumer stopped early (e.g. client disconnected) - drop the rest
+            for task in tasks:
+                task.cancel()
+    
+    def extract_many(self, urls: List[str], concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                     include_comments: bool = False) -> List[Dict]:
+        """Blocking wrapper around extract_many_async using the shared background event loop"""
+        return async_engine.run(self.extract_many_async(urls, concurrency, include_comments), timeout)
+    
+    def iter_extract_many(self, urls: List[str], concurrency: Optional[int] = None,
+                          include_comments: bool = False) -> Iterator[Dict]:
+        """
+        Blocking generator over iter_extract_many_async for sync callers (Flask streaming)
+        
+        Extractions run on the shared background event loop; closing the
+        generator early cancels whatever is still in flight.
+        """
+        results = queue.Queue()
+        
+        async def pump():
+            try:
+                async for item in self.iter_extract_many_async(urls, concurrency, include_comments):
+                    results.put(item)
+            finally:
+                results.put(_DONE)
+        
+        future = async_engine.submit(pump())
+        try:
+            while True:
+                item = results.get()
+                if item is _DONE:
+                    break
+                yield item
+            future.result()
+        finally:
+            future.cancel()
+    
+    def _platform_semaphore(self, platform: str) -> asyncio.Semaphore:
+        """Concurrency cap for a platform on the running event loop"""
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if platform not in semaphores:
+            semaphores[platform] = asyncio.Semaphore(self.platform_concurrency.get(platform, self.max_concurrency))
+        return semaphores[platform]
+    
+    def _route(self, url: str):
+        """
+        Validate the URL, canonicalize it and pick its extractor
+        
+        Returns:
+            (CanonicalURL, extractor, None) or (CanonicalURL or None, None, error result)
+        """
         # Validate URL
         if not url or not isinstance(url, str):
-            return {
+            return None, None, {
                 'success': False,
                 'error': 'Invalid URL provided'
             }
         
-        # Detect platform
-        platform = URLValidator.detect_platform(url)
+        # Parse once: platform, canonical URL, cache key and post IDs
+        target = canonicalize(url)
         
-        if not platform:
-            return {
+        if not target:
+            return None, None, {
                 'success': False,
                 'error': 'Unsupported platform or invalid URL format',
                 'supported_platforms': list(self.extractors.keys())
             }
         
         # Check if platform is supported
-        if platform not in self.extractors:
-            return {
+        if target.platform not in self.extractors:
+            return target, None, {
                 'success': False,
-                'error': f'{platform.capitalize()} extraction not yet implemented',
-                'platform': platform,
+                'error': f'{target.platform.capitalize()} extraction not yet implemented',
+                'platform': target.platform,
                 'supported_platforms': list(self.extractors.keys())
             }
         
-        # Extract content using appropriate extractor
-        extractor = self.extractors[platform]
-        result = extractor.extract(url)
-        
-        return result
+        return target, self.extractors[target.platform], None
     
     def get_supported_platforms(self) -> list:
         """Get list of supported platforms"""
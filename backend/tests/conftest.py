@@ -0,0 +1,8 @@
+"""
+Shared pytest setup - puts backend/ on the import path like app.py does
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,51 @@
+"""
+Circuit breaker tests - half-open trials must not leak when a stream is abandoned
+"""
+
+from services.circuit_breaker import CircuitBreaker
+
+
+def make_stub_service(monkeypatch):
+    monkeypatch.setenv('GEMINI_BACKEND', 'stub')
+    monkeypatch.setenv('GEMINI_STUB_LATENCY_MS', '50')
+    monkeypatch.setenv('GEMINI_STUB_LATENCY_SIGMA', '0')
+    monkeypatch.setenv('GEMINI_STUB_FENCED_RATE', '0')
+    monkeypatch.setenv('CIRCUIT_MIN_CALLS', '1')
+    monkeypatch.setenv('CIRCUIT_OPEN_SECONDS', '0')
+    monkeypatch.setenv('RECOMMENDATION_RETRIEVAL_ENABLED', 'false')
+
+    from services.ai_service import AIRecommendationService
+    return AIRecommendationService()
+
+
+def test_abandoned_half_open_stream_releases_trial(monkeypatch):
+    service = make_stub_service(monkeypatch)
+    service.breaker.record_failure()
+    assert service.breaker.state == CircuitBreaker.HALF_OPEN
+
+    stream = service.stream_recommendations(
+        text='Work has been really stressful this week',
+        sentiment='Stressed',
+        confidence=0.9,
+        emotions=['stress'],
+        concerns=['Work Stress'],
+        tone=[]
+    )
+    event, _ = next(stream)
+    assert event == 'suggestion'
+
+    # Client disconnects mid-stream
+    stream.close()
+
+    assert service.breaker.state == CircuitBreaker.HALF_OPEN
+    assert service.breaker.allow_request()
+
+
+def test_release_trial_is_a_no_op_when_closed(monkeypatch):
+    monkeypatch.setenv('CIRCUIT_HALF_OPEN_TRIALS', '1')
+    breaker = CircuitBreaker('test')
+
+    breaker.release_trial()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
@@ -0,0 +1,26 @@
+"""
+Import-time regression tests - backend startup must stay within IMPORT_TIME_BUDGET_MS
+and leave heavy dependencies to first use
+"""
+
+import pytest
+
+from import_report import BUDGET_MS, LAZY_MODULES, measure
+
+
+@pytest.fixture(scope='module')
+def app_import():
+    """(total_us, modules) for one fresh `import app`"""
+    return measure('app')
+
+
+def test_app_import_within_budget(app_import):
+    total, _ = app_import
+
+    assert total / 1000 <= BUDGET_MS, f"import of app took {total / 1000:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_dependencies_stay_lazy(app_import):
+    _, modules = app_import
+
+    assert [name for name in LAZY_MODULES if name in modules] == []
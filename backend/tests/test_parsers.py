@@ -0,0 +1,36 @@
+"""
+Golden-output tests - the oEmbed tokenizer must return exactly what the
+BeautifulSoup extraction it replaced returns
+"""
+
+import warnings
+
+import pytest
+
+from parser_benchmark import CHECKS, PAYLOADS
+
+
+@pytest.mark.parametrize('name', sorted(PAYLOADS))
+@pytest.mark.parametrize('check', sorted(CHECKS))
+def test_tokenizer_matches_beautifulsoup(check, name):
+    fast, soup = CHECKS[check]
+    html = PAYLOADS[name]
+
+    with warnings.catch_warnings():
+        # BeautifulSoup warns about markup that looks like XML (CDATA, <?xml ...?>)
+        warnings.simplefilter('ignore')
+        expected = soup(html)
+
+    assert fast(html) == expected
+
+
+def test_cdata_text_is_kept():
+    fast, _ = CHECKS['twitter_text']
+
+    assert fast('<![CDATA[x]]><p>y</p>') == 'x y'
+
+
+def test_unknown_entity_drops_semicolon_like_beautifulsoup():
+    fast, _ = CHECKS['twitter_text']
+
+    assert fast('&unknown;') == '&unknown'
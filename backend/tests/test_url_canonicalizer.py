@@ -0,0 +1,49 @@
+"""
+URL canonicalizer tests - case handling and Facebook permalinks
+"""
+
+import pytest
+
+from utils.url_canonicalizer import canonicalize
+from utils.validators import URLValidator
+
+
+@pytest.mark.parametrize('url, platform, post_id', [
+    ('https://twitter.com/User/Status/123', 'twitter', '123'),
+    ('HTTPS://X.COM/User/STATUS/123?s=20', 'twitter', '123'),
+    ('https://www.instagram.com/P/CxY_1abc/', 'instagram', 'CxY_1abc'),
+    ('https://www.instagram.com/Reels/CxY_1abc/', 'instagram', 'CxY_1abc'),
+    ('https://www.threads.net/@Someone/Post/C3abcDEF', 'threads', 'C3abcDEF'),
+    ('https://www.facebook.com/Page.Name/Posts/123', 'facebook', '123'),
+    ('https://www.reddit.com/R/Python/Comments/AbC12/title/', 'reddit', 'abc12'),
+])
+def test_path_keywords_match_in_any_case(url, platform, post_id):
+    target = canonicalize(url)
+
+    assert target is not None
+    assert target.platform == platform
+    assert target.key == f'{platform}:{post_id}'
+    assert URLValidator.is_valid_url(url)
+
+
+def test_ids_keep_their_case():
+    target = canonicalize('https://www.instagram.com/P/CxY_1abc/')
+
+    assert target.ids['shortcode'] == 'CxY_1abc'
+    assert target.ids['kind'] == 'p'
+    assert target.url == 'https://www.instagram.com/p/CxY_1abc/'
+    assert canonicalize('https://twitter.com/User/Status/123').ids['username'] == 'User'
+
+
+def test_facebook_permalink_without_page_id_uses_story_fbid():
+    url = 'https://www.facebook.com/permalink.php?story_fbid=456'
+
+    assert URLValidator.extract_facebook_id(url) == '456'
+    assert canonicalize(url).key == 'facebook:456'
+
+
+def test_facebook_permalink_with_page_id():
+    url = 'https://m.facebook.com/Permalink.php?story_fbid=456&id=789'
+
+    assert URLValidator.extract_facebook_id(url) == '789_456'
+    assert canonicalize(url).url == 'https://www.facebook.com/permalink.php?story_fbid=456&id=789'
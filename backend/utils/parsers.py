@@ -3,9 +3,130 @@ Content Parsers
 Parse HTML and extract clean text from social media responses
 """
 
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import Optional
+from html.entities import name2codepoint
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Elements with no closing tag, and elements whose text is never content
+VOID_ELEMENTS = frozenset('area base br col embed hr img input link meta param source track wbr'.split())
+SKIPPED_ELEMENTS = frozenset(('script', 'style'))
+
+# Named references decoded without BeautifulSoup. Anything else (unknown names,
+# and lang/rang, whose HTML4 and HTML5 characters differ) goes to the fallback
+NAMED_ENTITIES = {name: chr(codepoint) for name, codepoint in name2codepoint.items() if name not in ('lang', 'rang')}
+
+
+class EmbedTextParser(HTMLParser):
+    """
+    Single-pass tokenizer for oEmbed snippets
+    
+    Collects the stripped text runs of the whole document and of the first
+    <blockquote> and first <div>, without building a tree. Markup that isn't
+    properly nested (stray or mismatched end tags, an element left open) sets
+    `unusual`, since BeautifulSoup would repair it into a different tree. So do
+    character references BeautifulSoup decodes its own way (unknown entity
+    names, control and windows-1252 code points, surrogates).
+    """
+    
+    TARGETS = ('blockquote', 'div')
+    
+    def __init__(self):
+        # References are decoded below, as BeautifulSoup does, not by html.unescape
+        super().__init__(convert_charrefs=False)
+        self.unusual = False
+        self.texts = {'document': [], 'blockquote': [], 'div': []}
+        self._stack = []
+        self._skip = 0
+        self._open = {}        # target tag -> stack depth while its first element is open
+        self._done = set()
+        self._pending = []
+    
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in VOID_ELEMENTS:
+            return
+        self._stack.append(tag)
+        if tag in SKIPPED_ELEMENTS:
+            self._skip += 1
+        if tag in self.TARGETS and tag not in self._open and tag not in self._done:
+            self._open[tag] = len(self._stack)
+    
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+    
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in VOID_ELEMENTS:
+            return
+        if not self._stack or self._stack[-1] != tag:
+            self.unusual = True
+            return
+        if tag in SKIPPED_ELEMENTS:
+            self._skip -= 1
+        if self._open.get(tag) == len(self._stack):
+            del self._open[tag]
+            self._done.add(tag)
+        self._stack.pop()
+    
+    def handle_data(self, data):
+        # Text can arrive in pieces (e.g. around a stray '<'); join them into one run
+        if not self._skip:
+            self._pending.append(data)
+    
+    def handle_entityref(self, name):
+        if name not in NAMED_ENTITIES:
+            self.unusual = True
+        elif not self._skip:
+            self._pending.append(NAMED_ENTITIES[name])
+    
+    def handle_charref(self, name):
+        codepoint = int(name[1:], 16) if name[:1] in ('x', 'X') else int(name)
+        if not (32 <= codepoint < 127 or 160 <= codepoint < 0xD800 or 0xE000 <= codepoint <= 0x10FFFF):
+            self.unusual = True
+        elif not self._skip:
+            self._pending.append(chr(codepoint))
+    
+    def handle_comment(self, data):
+        self._flush()
+    
+    def handle_decl(self, decl):
+        self._flush()
+    
+    def handle_pi(self, data):
+        self._flush()
+    
+    def unknown_decl(self, data):
+        self._flush()
+        # BeautifulSoup keeps CDATA sections as text runs of their own
+        if data.upper().startswith('CDATA[') and not self._skip:
+            self._pending.append(data[len('CDATA['):])
+            self._flush()
+    
+    def close(self):
+        super().close()
+        self._flush()
+        if self._open:
+            self.unusual = True
+    
+    def _flush(self):
+        """End the current text run"""
+        if not self._pending:
+            return
+        text = ''.join(self._pending).strip()
+        self._pending = []
+        if text:
+            self.texts['document'].append(text)
+            for tag in self._open:
+                self.texts[tag].append(text)
+    
+    def first_element_text(self) -> Optional[List[str]]:
+        """Text runs of the first <blockquote>, else the first <div>; None if neither exists"""
+        for tag in self.TARGETS:
+            if tag in self._done:
+                return self.texts[tag]
+        return None
+
 
 class ContentParser:
     """Parse and clean content from social media APIs"""
@@ -24,19 +145,68 @@ class ContentParser:
         if not html:
             return ""
         
+        try:
+            parser = EmbedTextParser()
+            parser.feed(html)
+            parser.close()
+            if parser.unusual:
+                raise ValueError('markup needs BeautifulSoup')
+            text = ' '.join(parser.texts['document'])
+        except Exception:
+            text = ContentParser._soup_document_text(html)
+        
+        # Remove extra whitespace
+        text = ' '.join(text.split())
+        
+        return text
+    
+    @staticmethod
+    def parse_oembed_embed_text(html: str) -> str:
+        """
+        Extract the post text from an Instagram/Facebook oEmbed HTML snippet
+        
+        Args:
+            html: HTML content from the oEmbed API
+            
+        Returns:
+            Text of the first <blockquote> (or <div> if there is none), '' if neither exists
+        """
+        if not html:
+            return ""
+        
+        try:
+            parser = EmbedTextParser()
+            parser.feed(html)
+            parser.close()
+            if not parser.unusual:
+                return ' '.join(parser.first_element_text() or [])
+        except Exception:
+            pass
+        
+        # Unusual markup - let BeautifulSoup repair the tree
+        return ContentParser._soup_embed_text(html)
+    
+    @staticmethod
+    def _soup_document_text(html: str) -> str:
+        """BeautifulSoup equivalent of the tokenizer's document text"""
+        from bs4 import BeautifulSoup
+        
         soup = BeautifulSoup(html, 'html.parser')
         
         # Remove script tags
         for script in soup.find_all('script'):
             script.decompose()
         
-        # Get text and clean it
-        text = soup.get_text(separator=' ', strip=True)
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+        return soup.get_text(separator=' ', strip=True)
+    
+    @staticmethod
+    def _soup_embed_text(html: str) -> str:
+        """BeautifulSoup equivalent of parse_oembed_embed_text"""
+        from bs4 import BeautifulSoup
         
-        return text
+        soup = BeautifulSoup(html, 'html.parser')
+        text_elem = soup.find('blockquote') or soup.find('div')
+        return text_elem.get_text(strip=True, separator=' ') if text_elem else ''
     
     @staticmethod
     def format_twitter_date(date_str: str) -> str:
@@ -0,0 +1,177 @@
+"""
+URL Canonicalizer
+Parse a social media URL once: look the host up in a table (twitter.com, x.com,
+old.reddit.com, m.facebook.com, ...), match only that platform's precompiled
+path patterns, drop tracking parameters and rebuild a canonical URL. The
+resulting descriptor is shared by the validators, the extractors and the
+extraction cache
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+# platform: 'twitter', 'reddit', 'instagram', 'threads' or 'facebook'
+# url:      canonical URL (preferred host, no tracking parameters or fragment)
+# key:      '<platform>:<post id>' - identical for every URL of the same post
+# ids:      read-only mapping of the parts extractors need (tweet_id, post_id, ...)
+CanonicalURL = namedtuple('CanonicalURL', ['platform', 'url', 'key', 'ids'])
+
+# Host (without 'www.') -> platform
+HOSTS = {
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'mobile.twitter.com': 'twitter',
+    'mobile.x.com': 'twitter',
+    'reddit.com': 'reddit',
+    'old.reddit.com': 'reddit',
+    'new.reddit.com': 'reddit',
+    'np.reddit.com': 'reddit',
+    'm.reddit.com': 'reddit',
+    'i.reddit.com': 'reddit',
+    'instagram.com': 'instagram',
+    'm.instagram.com': 'instagram',
+    'threads.net': 'threads',
+    'threads.com': 'threads',
+    'facebook.com': 'facebook',
+    'm.facebook.com': 'facebook',
+    'mbasic.facebook.com': 'facebook',
+    'touch.facebook.com': 'facebook',
+    'web.facebook.com': 'facebook',
+}
+
+# Path keywords match in any case (/User/Status/123, /P/<code>/); IDs keep their case
+TWITTER_STATUS = re.compile(r'/(?P<username>\w+)/status(?:es)?/(?P<tweet_id>\d+)(?:/|$)', re.IGNORECASE)
+REDDIT_COMMENTS = re.compile(
+    r'/r/(?P<subreddit>\w+)/comments/(?P<post_id>[a-z0-9]+)(?:/(?P<slug>[^/]+))?(?:/|$)', re.IGNORECASE
+)
+INSTAGRAM_MEDIA = re.compile(r'/(?P<kind>p|reels?|tv)/(?P<shortcode>[A-Za-z0-9_-]+)(?:/|$)', re.IGNORECASE)
+THREADS_POST = re.compile(r'/@(?P<username>[\w.]+)/post/(?P<thread_id>[A-Za-z0-9_-]+)(?:/|$)', re.IGNORECASE)
+FACEBOOK_POST = re.compile(r'/(?P<page>[\w.]+)/posts/(?P<post_id>\d+)(?:/|$)', re.IGNORECASE)
+FACEBOOK_PERMALINK = re.compile(r'/(?:permalink|story)\.php$', re.IGNORECASE)
+
+
+def _twitter(path, query):
+    match = TWITTER_STATUS.match(path)
+    if not match:
+        return None
+    username, tweet_id = match.group('username', 'tweet_id')
+    return (
+        f'https://twitter.com/{username}/status/{tweet_id}',
+        tweet_id,
+        {'tweet_id': tweet_id, 'username': username}
+    )
+
+
+def _reddit(path, query):
+    match = REDDIT_COMMENTS.match(path)
+    if not match:
+        return None
+    subreddit, slug = match.group('subreddit', 'slug')
+    # Reddit post IDs are base36 and case-insensitive
+    post_id = match.group('post_id').lower()
+    url = f'https://www.reddit.com/r/{subreddit}/comments/{post_id}/' + (f'{slug}/' if slug else '')
+    return url, post_id, {'subreddit': subreddit, 'post_id': post_id, 'title': slug or ''}
+
+
+def _instagram(path, query):
+    match = INSTAGRAM_MEDIA.match(path)
+    if not match:
+        return None
+    kind = match.group('kind').lower()
+    kind = 'reel' if kind == 'reels' else kind
+    shortcode = match.group('shortcode')
+    return f'https://www.instagram.com/{kind}/{shortcode}/', shortcode, {'shortcode': shortcode, 'kind': kind}
+
+
+def _threads(path, query):
+    match = THREADS_POST.match(path)
+    if not match:
+        return None
+    username, thread_id = match.group('username', 'thread_id')
+    return (
+        f'https://www.threads.net/@{username}/post/{thread_id}',
+        thread_id,
+        {'thread_id': thread_id, 'username': username}
+    )
+
+
+def _facebook(path, query):
+    match = FACEBOOK_POST.match(path)
+    if match:
+        page, post_id = match.group('page', 'post_id')
+        return f'https://www.facebook.com/{page}/posts/{post_id}', post_id, {'post_id': post_id, 'page': page}
+
+    if FACEBOOK_PERMALINK.match(path):
+        params = parse_qs(query)
+        story_fbid = params.get('story_fbid', [None])[0]
+        page_id = params.get('id', [None])[0]
+        if story_fbid and story_fbid.isdigit():
+            if page_id:
+                url = f'https://www.facebook.com/permalink.php?story_fbid={story_fbid}&id={page_id}'
+                # Graph API addresses permalink posts as <page id>_<story id>
+                return url, story_fbid, {'post_id': f'{page_id}_{story_fbid}', 'page': page_id}
+            return (
+                f'https://www.facebook.com/permalink.php?story_fbid={story_fbid}',
+                story_fbid,
+                {'post_id': story_fbid, 'page': None}
+            )
+
+    return None
+
+
+PARSERS = {
+    'twitter': _twitter,
+    'reddit': _reddit,
+    'instagram': _instagram,
+    'threads': _threads,
+    'facebook': _facebook,
+}
+
+
+@lru_cache(maxsize=4096)
+def _canonicalize(url: str) -> Optional[CanonicalURL]:
+    if '://' not in url:
+        url = 'https://' + url
+
+    try:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').rstrip('.')
+    except ValueError:
+        return None
+
+    if parts.scheme.lower() not in ('http', 'https'):
+        return None
+
+    if host.startswith('www.'):
+        host = host[4:]
+
+    platform = HOSTS.get(host)
+    if platform is None:
+        return None
+
+    parsed = PARSERS[platform](parts.path, parts.query)
+    if parsed is None:
+        return None
+
+    canonical_url, post_id, ids = parsed
+    return CanonicalURL(platform, canonical_url, f'{platform}:{post_id}', MappingProxyType(ids))
+
+
+def canonicalize(url) -> Optional[CanonicalURL]:
+    """
+    Parse a social media post URL
+
+    Args:
+        url: Post URL in any supported form (x.com, old.reddit.com, m.facebook.com,
+             tracking parameters, missing scheme, ...)
+
+    Returns:
+        CanonicalURL descriptor, or None if the URL is not a supported post URL
+    """
+    if not url or not isinstance(url, str):
+        return None
+    return _canonicalize(url.strip())
@@ -3,36 +3,13 @@ URL Validators
 Validate and parse social media URLs
 """
 
-import re
 from typing import Optional, Dict
 
+from utils.url_canonicalizer import canonicalize
+
 class URLValidator:
     """Validate and parse social media URLs"""
     
-    # URL patterns for different platforms
-    PATTERNS = {
-        'twitter': [
-            r'https?://(?:www\.)?twitter\.com/\w+/status/(\d+)',
-            r'https?://(?:www\.)?x\.com/\w+/status/(\d+)',
-        ],
-        'reddit': [
-            r'https?://(?:www\.)?reddit\.com/r/(\w+)/comments/(\w+)/([^/]+)/?',
-        ],
-        'instagram': [
-            r'https?://(?:www\.)?instagram\.com/p/([A-Za-z0-9_-]+)/?',
-            r'https?://(?:www\.)?instagram\.com/reel/([A-Za-z0-9_-]+)/?',
-            r'https?://(?:www\.)?instagram\.com/tv/([A-Za-z0-9_-]+)/?',
-        ],
-        'threads': [
-            r'https?://(?:www\.)?threads\.(?:net|com)/@[\w.]+/post/([A-Za-z0-9_-]+)/?',
-        ],
-        'facebook': [
-            r'https?://(?:www\.)?facebook\.com/[\w.]+/posts/(\d+)',
-            r'https?://(?:www\.)?facebook\.com/permalink\.php\?story_fbid=(\d+)',
-            r'https?://(?:www\.)?facebook\.com/\d+/posts/(\d+)',
-        ],
-    }
-    
     @staticmethod
     def detect_platform(url: str) -> Optional[str]:
         """
@@ -40,74 +17,78 @@ class URLValidator:
         
         Args:
             url: Social media URL
-            
+        
         Returns:
-            Platform name ('twitter', 'reddit', 'instagram', 'facebook') or None
+            Platform name ('twitter', 'reddit', 'instagram', 'threads', 'facebook') or None
         """
-        if not url:
-            return None
-            
-        # Normalize URL
-        url = url.strip().lower()
-        
-        # Check each platform
-        for platform, patterns in URLValidator.PATTERNS.items():
-            for pattern in patterns:
-                if re.match(pattern, url):
-                    return platform
-        
+        target = canonicalize(url)
+        return target.platform if target else None
+    
+    @staticmethod
+    def _id(url: str, platform: str, name: str) -> Optional[str]:
+        """One ID field from the canonical descriptor, if the URL is for that platform"""
+        target = canonicalize(url)
+        if target and target.platform == platform:
+            return target.ids.get(name)
         return None
     
     @staticmethod
     def extract_twitter_id(url: str) -> Optional[str]:
         """Extract tweet ID from Twitter/X URL"""
-        for pattern in URLValidator.PATTERNS['twitter']:
-            match = re.match(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        return URLValidator._id(url, 'twitter', 'tweet_id')
     
     @staticmethod
     def extract_reddit_info(url: str) -> Optional[Dict[str, str]]:
         """Extract subreddit and post ID from Reddit URL"""
-        pattern = URLValidator.PATTERNS['reddit'][0]
-        match = re.match(pattern, url)
-        if match:
+        target = canonicalize(url)
+        if target and target.platform == 'reddit':
             return {
-                'subreddit': match.group(1),
-                'post_id': match.group(2),
-                'title': match.group(3)
+                'subreddit': target.ids['subreddit'],
+                'post_id': target.ids['post_id'],
+                'title': target.ids['title']
             }
         return None
     
     @staticmethod
     def extract_instagram_id(url: str) -> Optional[str]:
-        """Extract media ID from Instagram URL"""
-        pattern = URLValidator.PATTERNS['instagram'][0]
-        match = re.match(pattern, url)
-        if match:
-            return match.group(1)
-        return None
+        """Extract media shortcode from Instagram URL"""
+        return URLValidator._id(url, 'instagram', 'shortcode')
     
     @staticmethod
     def extract_facebook_id(url: str) -> Optional[str]:
         """Extract post ID from Facebook URL"""
-        for pattern in URLValidator.PATTERNS['facebook']:
-            match = re.match(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        return URLValidator._id(url, 'facebook', 'post_id')
     
     @staticmethod
     def extract_threads_id(url: str) -> Optional[str]:
         """Extract thread ID from Threads URL"""
-        pattern = URLValidator.PATTERNS['threads'][0]
-        match = re.match(pattern, url)
-        if match:
-            return match.group(1)
-        return None
+        return URLValidator._id(url, 'threads', 'thread_id')
+    
+    @staticmethod
+    def canonical_url(url: str) -> Optional[str]:
+        """
+        Rewrite a post URL to its canonical form (preferred host, tracking
+        parameters and fragment removed)
+        """
+        target = canonicalize(url)
+        return target.url if target else None
+    
+    @staticmethod
+    def canonical_key(url: str) -> Optional[str]:
+        """
+        Identify the post a URL points to, independent of host alias, scheme,
+        case, slug, query string or trailing slash
+        
+        Args:
+            url: Social media URL
+        
+        Returns:
+            '<platform>:<post id>' (e.g. 'twitter:123' for both twitter.com and x.com links) or None
+        """
+        target = canonicalize(url)
+        return target.key if target else None
     
     @staticmethod
     def is_valid_url(url: str) -> bool:
         """Check if URL is a valid social media URL"""
-        return URLValidator.detect_platform(url) is not None
+        return canonicalize(url) is not None